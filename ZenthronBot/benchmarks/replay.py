@@ -0,0 +1,191 @@
+"""
+Replays recorded updates through the fully wired application.
+
+The recording is a gzip JSON Lines file written with RECORD_UPDATES_FILE
+(plain .jsonl files and bare update objects per line work too). Updates go
+through build_application() from main.py exactly as in production, against
+the offline StubRequest bot and the in-memory database. Every Bot API call
+made while handling an update is kept, so two versions of the bot can be
+compared on the same traffic.
+
+    python -m ZenthronBot.benchmarks.replay RECORDING [--speed 0] [--limit N] [--concurrency 1]
+        [--calls-out FILE] [--compare FILE] [--compare-text] [--json]
+
+--speed 0 (the default) replays as fast as the bot can take the updates;
+--speed 1 keeps the recorded pacing, 10 replays ten times faster.
+--concurrency sets CONCURRENT_UPDATES. The default of 1 makes runs
+reproducible: state shared across chats (AFK, warns, gbans) then always
+sees updates in recorded order. Raise it to measure production throughput.
+--calls-out saves the outbound calls; --compare checks them against a file
+saved earlier and exits with status 1 when any update's calls differ.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+
+# Identifying fields of an outbound call; --compare-text adds the message text.
+_CALL_KEY_FIELDS = ("chat_id", "user_id", "sender_chat_id", "from_chat_id")
+
+
+# --- RECORDING ---
+def load_recording(path: str, limit: int | None = None) -> list[tuple[float | None, dict]]:
+    opener = gzip.open if path.endswith(".gz") else open
+    entries = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "update" in entry:
+                entries.append((entry.get("received_at"), entry["update"]))
+            else:
+                entries.append((None, entry))
+            if limit and len(entries) >= limit:
+                break
+    return entries
+
+
+# --- REPLAY ---
+async def replay(entries: list[tuple[float | None, dict]], speed: float) -> dict:
+    from telegram import Update
+    from ZenthronBot import main
+    from ZenthronBot.benchmarks.stubs import StubRequest, StubTelethonClient
+    from ZenthronBot.core.async_database import shutdown_async_db
+    from ZenthronBot.core.connection import close_connections
+    from ZenthronBot.core.metrics import metrics
+    from ZenthronBot.core.tracing import current_update_id
+
+    main.init_db()
+    request = StubRequest(update_id_getter=current_update_id)
+    application = main.build_application(StubTelethonClient(), request=request)
+    # Startup notices and maintenance jobs would add calls that depend on timing, not on the traffic.
+    for job in application.job_queue.jobs():
+        job.schedule_removal()
+
+    await application.initialize()
+    await application.start()
+    metrics.reset()
+
+    first_received_at = next((received_at for received_at, _ in entries if received_at is not None), None)
+    started_at = time.perf_counter()
+    for received_at, data in entries:
+        if speed > 0 and received_at is not None and first_received_at is not None:
+            delay = (received_at - first_received_at) / speed - (time.perf_counter() - started_at)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await application.update_queue.put(Update.de_json(data, application.bot))
+    await application.update_queue.join()
+    elapsed = time.perf_counter() - started_at
+
+    await application.stop()
+    await application.shutdown()
+    shutdown_async_db()
+    close_connections()
+
+    # Calls of one update are in order; updates of different chats may interleave.
+    outbound = sorted(request.outbound, key=lambda call: call["update_id"])
+    return {
+        "updates": len(entries),
+        "elapsed_s": elapsed,
+        "updates_per_s": len(entries) / elapsed if elapsed else 0.0,
+        "latency": metrics.update_summary(),
+        "handlers": metrics.top_handlers(limit=5, order_by="total"),
+        "api_calls": dict(request.calls),
+        "outbound": outbound,
+    }
+
+
+# --- OUTBOUND CALL COMPARISON ---
+def _call_key(call: dict, compare_text: bool) -> tuple:
+    params = call.get("params", {})
+    key = (call["method"], *(params.get(field) for field in _CALL_KEY_FIELDS))
+    return key + (params.get("text") or params.get("caption"),) if compare_text else key
+
+def compare_calls(baseline: list[dict], current: list[dict], compare_text: bool) -> list[str]:
+    def by_update(calls: list[dict]) -> dict[int, list[tuple]]:
+        grouped: dict[int, list[tuple]] = {}
+        for call in calls:
+            grouped.setdefault(call["update_id"], []).append(_call_key(call, compare_text))
+        return grouped
+
+    expected, actual = by_update(baseline), by_update(current)
+    differences = []
+    for update_id in sorted(expected.keys() | actual.keys()):
+        if expected.get(update_id, []) != actual.get(update_id, []):
+            differences.append(
+                f"update {update_id}: expected {expected.get(update_id, [])}, got {actual.get(update_id, [])}"
+            )
+    return differences
+
+def _read_calls(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _write_calls(path: str, calls: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for call in calls:
+            f.write(json.dumps(call, ensure_ascii=False, default=str) + "\n")
+
+
+# --- REPORT ---
+def _print_report(result: dict) -> None:
+    latency = result["latency"]
+    print(f"Replayed {result['updates']} updates in {result['elapsed_s']:.2f} s ({result['updates_per_s']:.1f} updates/s).")
+    print(
+        f"Update latency (ms): p50 {latency['p50_ms']:.1f} · p95 {latency['p95_ms']:.1f} · "
+        f"p99 {latency['p99_ms']:.1f} · max {latency['max_ms']:.1f}"
+    )
+    print("Busiest handlers (total ms):")
+    for item in result["handlers"]:
+        print(f"  [{item['group']}] {item['handler']:<48} {item['total_ms']:9.1f}  ({item['calls']} calls)")
+    print(f"Outbound calls while handling updates: {len(result['outbound'])}")
+    if result["api_calls"]:
+        print("Stubbed Bot API calls: " + ", ".join(f"{name} x{count}" for name, count in sorted(result["api_calls"].items())))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded updates through the bot against an offline Bot API.")
+    parser.add_argument("recording", help="file written by RECORD_UPDATES_FILE (.jsonl or .jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=0, help="0 replays as fast as possible, 1 keeps the recorded pacing")
+    parser.add_argument("--limit", type=int, default=None, help="replay only the first N updates")
+    parser.add_argument("--concurrency", type=int, default=1, help="CONCURRENT_UPDATES for the replay (1 is reproducible)")
+    parser.add_argument("--calls-out", help="write the outbound calls of this run as JSON Lines")
+    parser.add_argument("--compare", help="outbound calls saved by an earlier --calls-out to check against")
+    parser.add_argument("--compare-text", action="store_true", help="also compare message texts and captions")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON instead of a table")
+    args = parser.parse_args()
+
+    from ZenthronBot.benchmarks.stubs import BENCH_ENV
+    # The high slow-update threshold keeps tracing on, which attributes calls to updates, without writing a slow log.
+    os.environ.update({**BENCH_ENV, "SLOW_UPDATE_MS": "3600000", "CONCURRENT_UPDATES": str(args.concurrency)})
+
+    entries = load_recording(args.recording, args.limit)
+    if not entries:
+        raise SystemExit(f"No updates found in {args.recording}.")
+
+    result = asyncio.run(replay(entries, args.speed))
+
+    if args.json:
+        print(json.dumps({key: value for key, value in result.items() if key != "outbound"}, indent=2, sort_keys=True))
+    else:
+        _print_report(result)
+
+    if args.calls_out:
+        _write_calls(args.calls_out, result["outbound"])
+        print(f"Outbound calls written to {args.calls_out}.")
+
+    if args.compare:
+        # Round-trip through JSON so the current calls look exactly like the saved ones.
+        current = [json.loads(json.dumps(call, default=str)) for call in result["outbound"]]
+        differences = compare_calls(_read_calls(args.compare), current, args.compare_text)
+        if differences:
+            print(f"{len(differences)} updates produced different calls than {args.compare}:\n  " + "\n  ".join(differences[:20]), file=sys.stderr)
+            sys.exit(1)
+        print(f"Outbound calls match {args.compare}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Cold-start benchmark for the bot.
+
+Every run starts a fresh interpreter and goes through startup phase by
+phase: importing main, init_db, building the application (module imports
+and handler registration), initializing it and handling the first update.
+Telegram and Telethon are stubbed out and the in-memory database backend
+is used, so nothing touches the network or the real database.
+
+    python -m ZenthronBot.benchmarks.startup [--runs 5] [--budget FILE] [--json]
+
+The medians are compared with the budget file (startup_budget.json next to
+this script by default); the exit status is 1 if any phase goes over budget.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+DEFAULT_BUDGET = os.path.join(BENCH_DIR, "startup_budget.json")
+
+PHASES = ("import_main", "init_db", "build_application", "module_imports", "load_handlers", "initialize", "first_update")
+
+
+# --- CHILD: ONE COLD START ---
+async def _measure_startup() -> dict:
+    timings = {}
+
+    started_at = time.perf_counter()
+    from ZenthronBot import main
+    timings["import_main"] = time.perf_counter() - started_at
+
+    from ZenthronBot.benchmarks.stubs import StubRequest, StubTelethonClient, make_text_update
+    from ZenthronBot.core.async_database import shutdown_async_db
+    from ZenthronBot.core.connection import close_connections
+    from telegram import Update
+
+    started_at = time.perf_counter()
+    main.init_db()
+    timings["init_db"] = time.perf_counter() - started_at
+
+    request = StubRequest()
+    started_at = time.perf_counter()
+    application = main.build_application(StubTelethonClient(), request=request)
+    timings["build_application"] = time.perf_counter() - started_at
+
+    load_times = application.bot_data.get("module_load_times", {})
+    timings["module_imports"] = sum(import_time for import_time, _ in load_times.values())
+    timings["load_handlers"] = sum(load_time for _, load_time in load_times.values())
+
+    started_at = time.perf_counter()
+    await application.initialize()
+    await application.start()
+    timings["initialize"] = time.perf_counter() - started_at
+
+    update = Update.de_json(make_text_update(1, -1001234567890, 4242, "hello everyone"), application.bot)
+    started_at = time.perf_counter()
+    await application.update_queue.put(update)
+    await application.update_queue.join()
+    timings["first_update"] = time.perf_counter() - started_at
+
+    await application.stop()
+    await application.shutdown()
+    shutdown_async_db()
+    close_connections()
+
+    return {
+        "phases": {name: seconds * 1000 for name, seconds in timings.items()},
+        "modules": {name: (import_time + load_time) * 1000 for name, (import_time, load_time) in load_times.items()},
+        "api_calls": dict(request.calls),
+    }
+
+def _run_child() -> None:
+    result = asyncio.run(_measure_startup())
+    print(json.dumps(result))
+
+
+# --- PARENT: RUNS, MEDIANS, BUDGET ---
+def _cold_start() -> dict:
+    from ZenthronBot.benchmarks.stubs import BENCH_ENV
+
+    env = {**os.environ, **BENCH_ENV}
+    started_at = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "ZenthronBot.benchmarks.startup", "--child"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    process_total = (time.perf_counter() - started_at) * 1000
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise SystemExit(f"Benchmark child process failed with exit code {completed.returncode}.")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["phases"]["process_total"] = process_total
+    return result
+
+def _median_of(results: list[dict], key: str) -> dict[str, float]:
+    names = {name for result in results for name in result[key]}
+    return {name: statistics.median(result[key].get(name, 0.0) for result in results) for name in names}
+
+def _check_budget(phases: dict[str, float], budget_path: str) -> list[str]:
+    if not os.path.exists(budget_path):
+        print(f"No budget file at {budget_path}, skipping the regression check.")
+        return []
+    with open(budget_path, "r", encoding="utf-8") as f:
+        budget = json.load(f)
+    failures = []
+    for phase, limit_ms in budget.items():
+        measured = phases.get(phase.removesuffix("_ms"))
+        if measured is not None and measured > limit_ms:
+            failures.append(f"{phase}: {measured:.1f} ms > budget {limit_ms} ms")
+    return failures
+
+def _print_report(phases: dict[str, float], modules: dict[str, float], api_calls: dict, runs: int) -> None:
+    print(f"Cold start, median of {runs} runs (ms):")
+    for name in (*PHASES, "process_total"):
+        print(f"  {name:<18} {phases.get(name, 0.0):9.1f}")
+    print("Slowest modules (import + load_handlers, ms):")
+    for name, ms in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {name:<18} {ms:9.1f}")
+    if api_calls:
+        print("Stubbed Bot API calls: " + ", ".join(f"{name} x{count}" for name, count in sorted(api_calls.items())))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the bot's cold start phase by phase.")
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to take the median of")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, help="JSON file mapping '<phase>_ms' to a limit")
+    parser.add_argument("--json", action="store_true", help="print the medians as JSON instead of a table")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child()
+        return
+
+    results = [_cold_start() for _ in range(max(1, args.runs))]
+    phases = _median_of(results, "phases")
+    modules = _median_of(results, "modules")
+
+    if args.json:
+        print(json.dumps({"runs": len(results), "phases": phases, "modules": modules}, indent=2, sort_keys=True))
+    else:
+        _print_report(phases, modules, results[-1]["api_calls"], len(results))
+
+    failures = _check_budget(phases, args.budget)
+    if failures:
+        print("Startup budget exceeded:\n  " + "\n  ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import json
+import time
+from collections import Counter
+from typing import Callable
+
+from telegram.request import BaseRequest, RequestData
+
+BENCH_BOT_ID = 100000
+BENCH_BOT_USERNAME = "zenthron_bench_bot"
+
+# Environment that lets ZenthronBot.config load without real credentials.
+BENCH_ENV = {
+    "TELEGRAM_BOT_TOKEN": f"{BENCH_BOT_ID}:bench-token",
+    "TELEGRAM_OWNER_ID": "1",
+    "TELEGRAM_API_ID": "1",
+    "TELEGRAM_API_HASH": "bench",
+    "APPEAL_CHAT_USERNAME": "@bench_appeals",
+    "APPEAL_CHAT_ID": "-1000000000001",
+    "DB_BACKEND": "memory",
+    "UPDATE_MODE": "polling",
+    "METRICS_PORT": "0",
+    "RECORD_UPDATES_FILE": "",
+}
+
+
+# --- OFFLINE TELEGRAM STUBS ---
+class StubRequest(BaseRequest):
+    """
+    Answers every Bot API call locally with a minimal successful result, so the
+    application can be initialized and fed updates without any network.
+    Calls are counted per endpoint. With update_id_getter set, every call made
+    while an update is handled is also kept in `outbound` with its parameters.
+    """
+
+    def __init__(self, update_id_getter: Callable[[], int | None] | None = None):
+        self.calls: Counter[str] = Counter()
+        self.outbound: list[dict] = []
+        self._update_id_getter = update_id_getter
+        self._message_id = 0
+
+    @property
+    def read_timeout(self) -> float | None:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url: str, method: str, request_data: RequestData | None = None,
+                         read_timeout=None, write_timeout=None, connect_timeout=None, pool_timeout=None) -> tuple[int, bytes]:
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls[endpoint] += 1
+        parameters = request_data.parameters if request_data else {}
+        if self._update_id_getter is not None:
+            update_id = self._update_id_getter()
+            if update_id is not None:
+                self.outbound.append({"update_id": update_id, "method": endpoint, "params": parameters})
+        return 200, json.dumps({"ok": True, "result": self._result(endpoint, parameters)}).encode()
+
+    def _result(self, endpoint: str, parameters: dict):
+        if endpoint == "getMe":
+            return {
+                "id": BENCH_BOT_ID, "is_bot": True, "first_name": "Zenthron Bench",
+                "username": BENCH_BOT_USERNAME, "can_join_groups": True,
+            }
+        if endpoint == "getUpdates":
+            return []
+        if endpoint.startswith("send") or endpoint.startswith("edit"):
+            self._message_id += 1
+            chat_id = parameters.get("chat_id", 0)
+            return {
+                "message_id": self._message_id, "date": int(time.time()),
+                "chat": {"id": chat_id if isinstance(chat_id, int) else 0, "type": "private"},
+            }
+        if endpoint == "getChatMember":
+            return {
+                "status": "member",
+                "user": {"id": parameters.get("user_id", 0), "is_bot": False, "first_name": "Member"},
+            }
+        return True
+
+class StubTelethonClient:
+    """Stands in for the Telethon user client; every lookup fails as if the entity was not found."""
+
+    async def get_entity(self, *args, **kwargs):
+        raise ValueError("Telethon is stubbed out in benchmarks.")
+
+    async def run_until_disconnected(self) -> None:
+        pass
+
+
+def make_text_update(update_id: int, chat_id: int, user_id: int, text: str) -> dict:
+    """Raw update payload for a text message, as Telegram would send it."""
+    chat = {"id": chat_id, "type": "supergroup", "title": f"Bench chat {chat_id}"} if chat_id < 0 else \
+        {"id": chat_id, "type": "private", "first_name": "Bench"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": chat,
+            "from": {"id": user_id, "is_bot": False, "first_name": "Bench", "username": f"bench_user_{user_id}"},
+            "text": text,
+        },
+    }
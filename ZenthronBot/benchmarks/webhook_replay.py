@@ -0,0 +1,116 @@
+"""
+Posts recorded updates to a running bot's webhook endpoint.
+
+Where benchmarks/replay.py runs the bot in-process against stubs, this
+drives a real bot started with UPDATE_MODE=webhook: every update of the
+recording is sent as its own POST with the X-Telegram-Bot-Api-Secret-Token
+header, exactly as Telegram would deliver it. That exercises the HTTP
+server, secret checking and the bounded intake queue.
+
+    python -m ZenthronBot.benchmarks.webhook_replay RECORDING [--url URL] [--secret SECRET]
+        [--speed 0] [--limit N] [--concurrency 1] [--json]
+
+--url defaults to http://127.0.0.1:WEBHOOK_PORT/WEBHOOK_PATH and --secret
+to WEBHOOK_SECRET, both read from the environment or .env. --concurrency
+is the number of requests in flight; 1 delivers updates in recorded order.
+The exit status is 1 when any request is not answered with 200.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from ZenthronBot.benchmarks.replay import load_recording
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+# --- POSTING ---
+async def post_updates(entries: list[tuple[float | None, dict]], url: str, secret: str | None,
+                       speed: float, concurrency: int) -> dict:
+    import httpx
+
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        headers[SECRET_HEADER] = secret
+
+    statuses: dict[str, int] = {}
+    latencies: list[float] = []
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def post(client: httpx.AsyncClient, data: dict) -> None:
+        started_at = time.perf_counter()
+        try:
+            response = await client.post(url, content=json.dumps(data, ensure_ascii=False).encode("utf-8"), headers=headers)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finally:
+            slots.release()
+        latencies.append(time.perf_counter() - started_at)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    first_received_at = next((received_at for received_at, _ in entries if received_at is not None), None)
+    tasks = []
+    started_at = time.perf_counter()
+    async with httpx.AsyncClient(timeout=30) as client:
+        for received_at, data in entries:
+            if speed > 0 and received_at is not None and first_received_at is not None:
+                delay = (received_at - first_received_at) / speed - (time.perf_counter() - started_at)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await slots.acquire()
+            tasks.append(asyncio.create_task(post(client, data)))
+        await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "updates": len(entries),
+        "elapsed_s": elapsed,
+        "updates_per_s": len(entries) / elapsed if elapsed else 0.0,
+        "statuses": statuses,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000 if latencies else 0.0,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+# --- REPORT ---
+def main() -> None:
+    parser = argparse.ArgumentParser(description="POST recorded updates to a running bot's webhook.")
+    parser.add_argument("recording", help="file written by RECORD_UPDATES_FILE (.jsonl or .jsonl.gz)")
+    parser.add_argument("--url", help="webhook URL (default: http://127.0.0.1:WEBHOOK_PORT/WEBHOOK_PATH)")
+    parser.add_argument("--secret", help="secret token (default: WEBHOOK_SECRET)")
+    parser.add_argument("--speed", type=float, default=0, help="0 posts as fast as possible, 1 keeps the recorded pacing")
+    parser.add_argument("--limit", type=int, default=None, help="post only the first N updates")
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight (1 keeps the recorded order)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    url = args.url or f"http://127.0.0.1:{os.getenv('WEBHOOK_PORT', '8443')}/{os.getenv('WEBHOOK_PATH', 'telegram').strip('/')}"
+    secret = args.secret if args.secret is not None else os.getenv("WEBHOOK_SECRET")
+
+    entries = load_recording(args.recording, args.limit)
+    if not entries:
+        raise SystemExit(f"No updates found in {args.recording}.")
+
+    result = asyncio.run(post_updates(entries, url, secret, args.speed, args.concurrency))
+
+    if args.json:
+        print(json.dumps(result, indent=2, sort_keys=True))
+    else:
+        print(f"Posted {result['updates']} updates to {url} in {result['elapsed_s']:.2f} s ({result['updates_per_s']:.1f} updates/s).")
+        print(f"Response time (ms): p50 {result['p50_ms']:.1f} · p95 {result['p95_ms']:.1f} · max {result['max_ms']:.1f}")
+        print("Responses: " + ", ".join(f"{status} x{count}" for status, count in sorted(result["statuses"].items())))
+
+    if set(result["statuses"]) - {"200"}:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
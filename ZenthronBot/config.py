@@ -80,8 +80,63 @@ else:
     
 LOG_CHAT_USERNAME = os.getenv("LOG_CHAT_USERNAME")
 
+UPDATE_MODE = os.getenv("UPDATE_MODE", "polling").lower()
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+if UPDATE_MODE == "webhook":
+    if not WEBHOOK_URL or not WEBHOOK_SECRET:
+        logger.critical("CRITICAL: UPDATE_MODE is 'webhook' but WEBHOOK_URL or WEBHOOK_SECRET is not set!")
+        exit(1)
+    logger.info("Receiving updates via webhook.")
+elif UPDATE_MODE != "polling":
+    logger.warning(f"Unknown UPDATE_MODE '{UPDATE_MODE}', falling back to polling.")
+    UPDATE_MODE = "polling"
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_NAME = os.path.join(BASE_DIR, "zenthron_data.db")
+DB_BACKEND = os.getenv("DB_BACKEND", "sqlite").lower()
+GBAN_INDEX_PATH = os.path.join(BASE_DIR, "zenthron_gban.idx")
+GBAN_BLOOM_ENABLED = os.getenv("GBAN_BLOOM_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+DB_MMAP_SIZE_MB = int(os.getenv("DB_MMAP_SIZE_MB", "128"))
+DB_READER_THREADS = int(os.getenv("DB_READER_THREADS", "4"))
+USER_BUFFER_MAX_SIZE = int(os.getenv("USER_BUFFER_MAX_SIZE", "500"))
+USER_BUFFER_FLUSH_INTERVAL = int(os.getenv("USER_BUFFER_FLUSH_INTERVAL", "10"))
+USER_LAST_SEEN_REFRESH = int(os.getenv("USER_LAST_SEEN_REFRESH", "3600"))
+CHAT_SETTINGS_CACHE_SIZE = int(os.getenv("CHAT_SETTINGS_CACHE_SIZE", "2048"))
+DISABLED_COMMANDS_CACHE_SIZE = int(os.getenv("DISABLED_COMMANDS_CACHE_SIZE", "2048"))
+DB_QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+BACKUP_DIR = os.getenv("BACKUP_DIR", os.path.join(BASE_DIR, "backups"))
+BACKUP_INTERVAL_HOURS = float(os.getenv("BACKUP_INTERVAL_HOURS", "24"))
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP_MS = int(os.getenv("BACKUP_STEP_SLEEP_MS", "5"))
+BACKUP_COMPRESSION = os.getenv("BACKUP_COMPRESSION", "gzip").lower()
+MAINTENANCE_INTERVAL_HOURS = float(os.getenv("MAINTENANCE_INTERVAL_HOURS", "24"))
+USER_RETENTION_DAYS = int(os.getenv("USER_RETENTION_DAYS", "180"))
+AFK_RETENTION_DAYS = int(os.getenv("AFK_RETENTION_DAYS", "30"))
+WARN_RETENTION_DAYS = int(os.getenv("WARN_RETENTION_DAYS", "0"))
+MAINTENANCE_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "500"))
+VACUUM_PAGES_PER_STEP = int(os.getenv("VACUUM_PAGES_PER_STEP", "256"))
+STATS_RECONCILE_INTERVAL_HOURS = float(os.getenv("STATS_RECONCILE_INTERVAL_HOURS", "24"))
+CONCURRENT_UPDATES = int(os.getenv("CONCURRENT_UPDATES", "16"))
+UPDATE_QUEUE_SIZE = int(os.getenv("UPDATE_QUEUE_SIZE", "1000"))
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "telegram").strip("/")
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+SLOW_UPDATE_MS = float(os.getenv("SLOW_UPDATE_MS", "2000"))
+SLOW_UPDATE_LOG = os.getenv("SLOW_UPDATE_LOG", os.path.join(BASE_DIR, "logs", "slow_updates.jsonl"))
+SLOW_UPDATE_LOG_MAX_MB = float(os.getenv("SLOW_UPDATE_LOG_MAX_MB", "10"))
+SLOW_UPDATE_LOG_BACKUPS = int(os.getenv("SLOW_UPDATE_LOG_BACKUPS", "5"))
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "1000"))
+RECORD_UPDATES_FILE = os.getenv("RECORD_UPDATES_FILE", "").strip()
+RECORD_UPDATES_FLUSH_EVERY = int(os.getenv("RECORD_UPDATES_FLUSH_EVERY", "100"))
+RECORD_UPDATES_MAX_MB = float(os.getenv("RECORD_UPDATES_MAX_MB", "500"))
 SESSION_NAME = "zenthron_user_session"
 
 BOT_START_TIME = datetime.now()
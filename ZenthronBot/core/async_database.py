@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from ..config import DB_READER_THREADS
+from .metrics import charge_db_time
+from .tracing import add_span, bind_trace
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _callable_name(func: Callable) -> str:
+    return getattr(func, "__qualname__", None) or getattr(func, "__name__", None) or type(func).__name__
+
+
+# --- LATENCY COUNTERS ---
+class _LatencyCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            if failed:
+                self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg = self.total / self.count if self.count else 0.0
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "avg_ms": avg * 1000,
+                "max_ms": self.max * 1000,
+            }
+
+
+# --- ASYNC DATABASE ---
+class AsyncDatabase:
+    """
+    Runs the blocking helpers from core/database.py off the event loop.
+    Reads go to a small thread pool, writes are queued and executed one
+    by one on a dedicated writer thread.
+    """
+
+    def __init__(self, reader_threads: int):
+        self._reader_threads = reader_threads
+        self._read_executor: ThreadPoolExecutor | None = None
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer_thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._reads_in_flight = 0
+        self.read_latency = _LatencyCounter()
+        self.write_latency = _LatencyCounter()
+        self.write_wait = _LatencyCounter()
+
+    def _ensure_started(self) -> None:
+        if self._read_executor is not None and self._writer_thread is not None:
+            return
+        with self._start_lock:
+            if self._read_executor is None:
+                self._read_executor = ThreadPoolExecutor(
+                    max_workers=self._reader_threads, thread_name_prefix="db-reader"
+                )
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+                self._writer_thread.start()
+                logger.info(f"Async database started with 1 writer and {self._reader_threads} reader threads.")
+
+    def _writer_loop(self) -> None:
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                self._write_queue.task_done()
+                break
+
+            future, func, enqueued_at = item
+            if future.set_running_or_notify_cancel():
+                started_at = time.perf_counter()
+                self.write_wait.record(started_at - enqueued_at)
+                try:
+                    result = func()
+                except BaseException as e:
+                    self.write_latency.record(time.perf_counter() - started_at, failed=True)
+                    future.set_exception(e)
+                else:
+                    self.write_latency.record(time.perf_counter() - started_at)
+                    future.set_result(result)
+            self._write_queue.task_done()
+
+    async def read(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        self._reads_in_flight += 1
+        try:
+            result = await loop.run_in_executor(self._read_executor, bind_trace(partial(func, *args, **kwargs)))
+        except BaseException:
+            self.read_latency.record(time.perf_counter() - started_at, failed=True)
+            raise
+        finally:
+            self._reads_in_flight -= 1
+            charge_db_time(time.perf_counter() - started_at)
+            add_span("db_call", f"read {_callable_name(func)}", time.perf_counter() - started_at)
+        self.read_latency.record(time.perf_counter() - started_at)
+        return result
+
+    async def write(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        self._ensure_started()
+        future: Future = Future()
+        enqueued_at = time.perf_counter()
+        self._write_queue.put((future, bind_trace(partial(func, *args, **kwargs)), enqueued_at))
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            charge_db_time(time.perf_counter() - enqueued_at)
+            # Includes the time spent queued behind other writes.
+            add_span("db_call", f"write {_callable_name(func)}", time.perf_counter() - enqueued_at)
+
+    def stats(self) -> dict:
+        return {
+            "write_queue_depth": self._write_queue.qsize(),
+            "reads_in_flight": self._reads_in_flight,
+            "reads": self.read_latency.snapshot(),
+            "writes": self.write_latency.snapshot(),
+            "write_wait": self.write_wait.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        if self._writer_thread is not None:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+        if self._read_executor is not None:
+            self._read_executor.shutdown(wait=True)
+            self._read_executor = None
+        logger.info("Async database stopped.")
+
+
+_db = AsyncDatabase(DB_READER_THREADS)
+
+async def run_read(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await _db.read(func, *args, **kwargs)
+
+async def run_write(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await _db.write(func, *args, **kwargs)
+
+def get_async_db_stats() -> dict:
+    return _db.stats()
+
+def shutdown_async_db() -> None:
+    _db.shutdown()
@@ -0,0 +1,162 @@
+import glob
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from telegram.ext import ContextTypes
+
+from ..config import (
+    BACKUP_DIR, BACKUP_KEEP, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP_MS, BACKUP_COMPRESSION
+)
+from .connection import read_connection, get_backend
+from .async_database import run_read
+from .utils import send_critical_log, safe_escape
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+_BACKUP_PREFIX = "zenthron_backup_"
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class BackupResult(NamedTuple):
+    path: str
+    raw_size: int
+    compressed_size: int
+    pages: int
+    duration: float
+
+
+# --- BACKUP ---
+def _copy_database(dest_path: str) -> int:
+    """
+    Copies the live database into dest_path with the SQLite online backup API,
+    a few pages per step. The source read transaction is held for the whole
+    copy, so the snapshot is consistent while writers keep going (WAL).
+    """
+    pages_copied = 0
+
+    def progress(status, remaining, total):
+        nonlocal pages_copied
+        pages_copied = total - remaining
+
+    single_connection = get_backend().single_connection
+    dest = sqlite3.connect(dest_path)
+    try:
+        with read_connection() as source:
+            if not single_connection:
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            try:
+                source.backup(
+                    dest,
+                    # The in-memory backend shares its only connection with writers, so copy it in one go.
+                    pages=-1 if single_connection else BACKUP_PAGES_PER_STEP,
+                    progress=progress,
+                    sleep=BACKUP_STEP_SLEEP_MS / 1000,
+                )
+            finally:
+                if not single_connection:
+                    source.rollback()
+        dest.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        dest.close()
+    return pages_copied
+
+def _verify_database(path: str) -> None:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        conn.close()
+    if result != "ok":
+        raise sqlite3.DatabaseError(f"Backup failed integrity check: {result}")
+
+def _compression() -> str:
+    if BACKUP_COMPRESSION == "zstd":
+        if zstandard is not None:
+            return "zstd"
+        logger.warning("BACKUP_COMPRESSION is 'zstd' but the zstandard package is not installed, using gzip.")
+    return "gzip"
+
+def _compress(raw_path: str, dest_path: str, method: str) -> None:
+    with open(raw_path, "rb") as src, open(dest_path, "wb") as dst:
+        if method == "zstd":
+            with zstandard.ZstdCompressor(level=10).stream_writer(dst, closefd=False) as writer:
+                shutil.copyfileobj(src, writer, _COPY_CHUNK_SIZE)
+        else:
+            with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=6) as writer:
+                shutil.copyfileobj(src, writer, _COPY_CHUNK_SIZE)
+
+def _rotate_backups() -> None:
+    # Only finished backups count; a .partial file belongs to a backup still being written.
+    backups = sorted(
+        (path for path in glob.glob(os.path.join(BACKUP_DIR, f"{_BACKUP_PREFIX}*")) if not path.endswith(".partial")),
+        reverse=True
+    )
+    for old_backup in backups[BACKUP_KEEP:]:
+        try:
+            os.remove(old_backup)
+            logger.info(f"Removed old backup {old_backup}.")
+        except OSError as e:
+            logger.warning(f"Could not remove old backup {old_backup}: {e}")
+
+def _unused_path(path: str) -> str:
+    base, extension = path.rsplit(".db.", 1)
+    suffix = 1
+    while os.path.exists(path):
+        path = f"{base}-{suffix}.db.{extension}"
+        suffix += 1
+    return path
+
+def create_backup() -> BackupResult:
+    """Makes a verified, compressed snapshot of the database in BACKUP_DIR and rotates old ones."""
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    started_at = time.perf_counter()
+    method = _compression()
+    # Microseconds keep a /backupdb and the scheduled job from sharing a name; the names still sort by time.
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+    extension = "zst" if method == "zstd" else "gz"
+    final_path = os.path.join(BACKUP_DIR, f"{_BACKUP_PREFIX}{stamp}.db.{extension}")
+
+    fd, raw_path = tempfile.mkstemp(suffix=".db", dir=BACKUP_DIR)
+    os.close(fd)
+    partial_path = f"{final_path}.partial"
+    try:
+        pages = _copy_database(raw_path)
+        _verify_database(raw_path)
+        _compress(raw_path, partial_path, method)
+        raw_size = os.path.getsize(raw_path)
+        final_path = _unused_path(final_path)
+        os.replace(partial_path, final_path)
+    finally:
+        for leftover in (raw_path, partial_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    _rotate_backups()
+    result = BackupResult(final_path, raw_size, os.path.getsize(final_path), pages, time.perf_counter() - started_at)
+    logger.info(
+        f"Database backup written to {final_path} ({pages} pages, {raw_size} -> {result.compressed_size} bytes, "
+        f"{result.duration:.2f}s)."
+    )
+    return result
+
+
+# --- SCHEDULED BACKUP JOB ---
+async def backup_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    try:
+        await run_read(create_backup)
+    except Exception as e:
+        logger.error(f"Scheduled database backup failed: {e}", exc_info=True)
+        await send_critical_log(context, f"<b>#BACKUP_FAILED</b>\n\n<code>{safe_escape(str(e))}</code>")
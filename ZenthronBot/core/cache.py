@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# --- LRU CACHE ---
+class LRUCache(Generic[K, V]):
+    """
+    Small thread-safe LRU cache used for per-chat data read on hot paths.
+    Readers that load a value from the database take generation() before the
+    query and store the result with set_if_unchanged(), so a row read before a
+    write committed cannot overwrite the invalidation that write made.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; one entry per key that was ever invalidated.
+        self._generations: dict[K, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def generation(self, key: K) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def set_if_unchanged(self, key: K, value: V, generation: tuple[int, int]) -> bool:
+        """Stores value only if the key was not invalidated since generation() was taken."""
+        with self._lock:
+            if (self._epoch, self._generations.get(key, 0)) != generation:
+                return False
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            return True
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._epoch += 1
+
+    def __contains__(self, key: K) -> bool:
+        # Plain membership test: does not refresh the entry or touch the hit counters.
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
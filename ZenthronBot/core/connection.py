@@ -0,0 +1,107 @@
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from ..config import DB_BACKEND
+from .storage import StorageBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+
+# --- CONNECTION MANAGER ---
+class ConnectionManager:
+    """
+    Keeps long-lived SQLite connections instead of opening one per query.
+    There is a single shared write connection guarded by a lock and one
+    read-only connection per thread, opened through the storage backend.
+    """
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self._local = threading.local()
+        self._write_conn: sqlite3.Connection | None = None
+        self._write_lock = threading.RLock()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _get_writer(self) -> sqlite3.Connection:
+        if self._write_conn is None:
+            conn = self.backend.connect(read_only=False)
+            # Lets INSERT OR REPLACE fire delete triggers, which keep stats_counters exact.
+            conn.execute("PRAGMA recursive_triggers = ON")
+            self.backend.prepare_writer(conn)
+            self._write_conn = conn
+            logger.info(f"Opened write connection to {self.backend.describe()}.")
+        return self._write_conn
+
+    def _get_reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            self._get_writer()
+            conn = self.backend.connect(read_only=True)
+            self._local.reader = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        if self.backend.single_connection:
+            with self._write_lock:
+                yield self._get_writer()
+            return
+        yield self._get_reader()
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            conn = self._get_writer()
+            depth = getattr(self._local, "write_depth", 0)
+            self._local.write_depth = depth + 1
+            try:
+                yield conn
+                if depth == 0:
+                    conn.commit()
+            except BaseException:
+                if depth == 0:
+                    conn.rollback()
+                raise
+            finally:
+                self._local.write_depth = depth
+
+    def close_all(self) -> None:
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing read connection: {e}")
+        self._local = threading.local()
+
+        with self._write_lock:
+            if self._write_conn is not None:
+                try:
+                    self._write_conn.execute("PRAGMA optimize")
+                    self._write_conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Error closing write connection: {e}")
+                self._write_conn = None
+        logger.info("All database connections closed.")
+
+
+_manager = ConnectionManager(create_backend(DB_BACKEND))
+
+def get_backend() -> StorageBackend:
+    return _manager.backend
+
+def read_connection():
+    return _manager.read()
+
+def write_connection():
+    return _manager.write()
+
+def close_connections() -> None:
+    _manager.close_all()
@@ -269,6 +269,10 @@ OWNER_COMMANDS_TEXT = """
 /enablemodule &lt;module name&gt; - Enable Bot module.
 /disablemodule &lt;module name&gt; - Disable Bot module.
 /backupdb - Backup Bot database.
+/enableautovacuum - One-time full VACUUM that lets maintenance return free space to the OS.
+/dbstats &lt;Optional total/calls/avg/p95/reset&gt; - Show the slowest database queries.
+/queues - Show running and queued updates per chat.
+/metrics &lt;Optional p95/p99/total/calls/errors/reset&gt; - Show handler latency and Bot API timings.
 /shell &lt;command&gt; - Execute the command in the terminal.
 /execute &lt;file patch&gt; [args...] - Run script.
 """
@@ -1,186 +1,205 @@
 import sqlite3
 import logging
 import json
+import time
 from datetime import datetime, timezone
-from typing import List, Tuple
+from typing import Iterable, List, NamedTuple, Tuple
 from telegram import User
 
-from ..config import DB_NAME, MAX_WARNS
+from ..config import MAX_WARNS, CHAT_SETTINGS_CACHE_SIZE, DISABLED_COMMANDS_CACHE_SIZE
+from .connection import read_connection, write_connection, get_backend
+from .registry import privilege_registry
+from .gban_index import gban_index
+from .cache import LRUCache
+from .migrations import run_migrations, COUNTED_TABLES
 
 logger = logging.getLogger(__name__)
 
+# Keeps IN (...) lists well below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds.
+_IN_CHUNK_SIZE = 500
+
+
+# Timestamps are stored as integer epoch seconds (UTC) and converted here.
+def _now() -> int:
+    return int(time.time())
+
+def _to_datetime(epoch: int | None) -> datetime | None:
+    return datetime.fromtimestamp(epoch, timezone.utc) if epoch is not None else None
+
 def init_db():
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                username TEXT,
-                first_name TEXT,
-                last_name TEXT,
-                language_code TEXT,
-                is_bot INTEGER,
-                last_seen TEXT 
-            )
-        """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_username ON users (username)")
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS blacklist (
-                user_id INTEGER PRIMARY KEY,
-                reason TEXT,
-                banned_by_id INTEGER,
-                timestamp TEXT 
-            )
-        """)
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS whitelist_users (
-                user_id INTEGER PRIMARY KEY,
-                added_by_id INTEGER NOT NULL,
-                timestamp TEXT NOT NULL
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id INTEGER PRIMARY KEY,
+                    username TEXT,
+                    first_name TEXT,
+                    last_name TEXT,
+                    language_code TEXT,
+                    is_bot INTEGER,
+                    last_seen INTEGER 
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS blacklist (
+                    user_id INTEGER PRIMARY KEY,
+                    reason TEXT,
+                    banned_by_id INTEGER,
+                    timestamp INTEGER 
+                )
+            """)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS support_users (
-                user_id INTEGER PRIMARY KEY,
-                added_by_id INTEGER NOT NULL,
-                timestamp TEXT NOT NULL
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS whitelist_users (
+                    user_id INTEGER PRIMARY KEY,
+                    added_by_id INTEGER NOT NULL,
+                    timestamp INTEGER NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS support_users (
+                    user_id INTEGER PRIMARY KEY,
+                    added_by_id INTEGER NOT NULL,
+                    timestamp INTEGER NOT NULL
+                )
+            """)
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sudo_users (
-                user_id INTEGER PRIMARY KEY,
-                added_by_id INTEGER NOT NULL,
-                timestamp TEXT NOT NULL
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sudo_users (
+                    user_id INTEGER PRIMARY KEY,
+                    added_by_id INTEGER NOT NULL,
+                    timestamp INTEGER NOT NULL
+                )
+            """)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS dev_users (
-                user_id INTEGER PRIMARY KEY,
-                added_by_id INTEGER NOT NULL,
-                timestamp TEXT NOT NULL
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS global_bans (
-                user_id INTEGER PRIMARY KEY,
-                reason TEXT,
-                banned_by_id INTEGER NOT NULL,
-                timestamp TEXT NOT NULL
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS bot_chats (
-                chat_id INTEGER PRIMARY KEY,
-                chat_title TEXT,
-                added_at TEXT NOT NULL,
-                enforce_gban INTEGER DEFAULT 1 NOT NULL,
-                welcome_enabled INTEGER DEFAULT 1 NOT NULL,
-                custom_welcome TEXT,
-                goodbye_enabled INTEGER DEFAULT 1 NOT NULL,
-                custom_goodbye TEXT,
-                clean_service_messages INTEGER DEFAULT 0 NOT NULL,
-                warn_limit INTEGER,
-                rules_text TEXT
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS notes (
-                chat_id INTEGER NOT NULL,
-                note_name TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_by_id INTEGER,
-                created_at TEXT,
-                PRIMARY KEY (chat_id, note_name)
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS warnings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                chat_id INTEGER NOT NULL,
-                reason TEXT,
-                warned_by_id INTEGER,
-                warned_at TEXT
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS dev_users (
+                    user_id INTEGER PRIMARY KEY,
+                    added_by_id INTEGER NOT NULL,
+                    timestamp INTEGER NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS global_bans (
+                    user_id INTEGER PRIMARY KEY,
+                    reason TEXT,
+                    banned_by_id INTEGER NOT NULL,
+                    timestamp INTEGER NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bot_chats (
+                    chat_id INTEGER PRIMARY KEY,
+                    chat_title TEXT,
+                    added_at INTEGER NOT NULL,
+                    enforce_gban INTEGER DEFAULT 1 NOT NULL,
+                    welcome_enabled INTEGER DEFAULT 1 NOT NULL,
+                    custom_welcome TEXT,
+                    goodbye_enabled INTEGER DEFAULT 1 NOT NULL,
+                    custom_goodbye TEXT,
+                    clean_service_messages INTEGER DEFAULT 0 NOT NULL,
+                    warn_limit INTEGER,
+                    rules_text TEXT
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS notes (
+                    chat_id INTEGER NOT NULL,
+                    note_name TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_by_id INTEGER,
+                    created_at INTEGER,
+                    PRIMARY KEY (chat_id, note_name)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS warnings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    chat_id INTEGER NOT NULL,
+                    reason TEXT,
+                    warned_by_id INTEGER,
+                    warned_at INTEGER
+                )
+            """)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS afk_users (
-                user_id INTEGER PRIMARY KEY,
-                reason TEXT,
-                afk_since TEXT NOT NULL
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS afk_users (
+                    user_id INTEGER PRIMARY KEY,
+                    reason TEXT,
+                    afk_since INTEGER NOT NULL
+                )
+            """)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS disabled_modules (
-                module_name TEXT PRIMARY KEY
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS disabled_modules (
+                    module_name TEXT PRIMARY KEY
+                )
+            """)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS disabled_commands_per_chat (
-                chat_id INTEGER,
-                command_name TEXT,
-                PRIMARY KEY (chat_id, command_name)
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS disabled_commands_per_chat (
+                    chat_id INTEGER,
+                    command_name TEXT,
+                    PRIMARY KEY (chat_id, command_name)
+                )
+            """)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chat_join_settings (
-                chat_id INTEGER PRIMARY KEY,
-                filters TEXT,
-                action TEXT NOT NULL DEFAULT 'kick'
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chat_filters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chat_id INTEGER NOT NULL,
-                keyword TEXT NOT NULL,
-                reply_text TEXT,
-                reply_type TEXT NOT NULL DEFAULT 'text', -- 'text', 'photo', 'sticker', 'audio', 'document', 'animation', 'video', 'voice'
-                file_id TEXT,
-                filter_type TEXT NOT NULL DEFAULT 'keyword', -- 'keyword', 'wildcard', 'regex'
-                buttons TEXT,
-                UNIQUE (chat_id, keyword)
-            )
-        """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS chat_join_settings (
+                    chat_id INTEGER PRIMARY KEY,
+                    filters TEXT,
+                    action TEXT NOT NULL DEFAULT 'kick'
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS chat_filters (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    chat_id INTEGER NOT NULL,
+                    keyword TEXT NOT NULL,
+                    reply_text TEXT,
+                    reply_type TEXT NOT NULL DEFAULT 'text', -- 'text', 'photo', 'sticker', 'audio', 'document', 'animation', 'video', 'voice'
+                    file_id TEXT,
+                    filter_type TEXT NOT NULL DEFAULT 'keyword', -- 'keyword', 'wildcard', 'regex'
+                    buttons TEXT,
+                    UNIQUE (chat_id, keyword)
+                )
+            """)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chat_blacklist (
-                chat_id INTEGER PRIMARY KEY,
-                chat_name TEXT,
-                timestamp TEXT
-            )
-        """)
-        
-        conn.commit()
-        logger.info(f"Database '{DB_NAME}' initialized successfully.")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS chat_blacklist (
+                    chat_id INTEGER PRIMARY KEY,
+                    chat_name TEXT,
+                    timestamp INTEGER
+                )
+            """)
+
+            schema_version = run_migrations(conn)
+
+        logger.info(f"Database {get_backend().describe()} initialized successfully (schema version {schema_version}).")
     except sqlite3.Error as e:
         logger.error(f"SQLite error during DB initialization: {e}", exc_info=True)
-    finally:
-        if conn:
-            conn.close()
+        return
+
+    if get_auto_vacuum_mode() != 2:
+        logger.info("Database does not use incremental auto_vacuum; the owner can switch it with /enableautovacuum.")
+    privilege_registry.load()
+    gban_index.load()
 
 # --- DATABASE HELPER FUNCTIONS ---
 # --- MODULES ---
 def is_module_disabled(module_name: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT module_name FROM disabled_modules WHERE module_name = ?", (module_name,))
             return cursor.fetchone() is not None
@@ -190,25 +209,25 @@ def is_module_disabled(module_name: str) -> bool:
 
 def disable_module(module_name: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.execute("INSERT OR IGNORE INTO disabled_modules (module_name) VALUES (?)", (module_name,))
-            return conn.total_changes > 0
+        with write_connection() as conn:
+            cursor = conn.execute("INSERT OR IGNORE INTO disabled_modules (module_name) VALUES (?)", (module_name,))
+            return cursor.rowcount > 0
     except sqlite3.Error as e:
         logger.error(f"Błąd SQLite przy wyłączaniu modułu {module_name}: {e}")
         return False
 
 def enable_module(module_name: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.execute("DELETE FROM disabled_modules WHERE module_name = ?", (module_name,))
-            return conn.total_changes > 0
+        with write_connection() as conn:
+            cursor = conn.execute("DELETE FROM disabled_modules WHERE module_name = ?", (module_name,))
+            return cursor.rowcount > 0
     except sqlite3.Error as e:
         logger.error(f"Błąd SQLite przy włączaniu modułu {module_name}: {e}")
         return False
 
 def get_disabled_modules() -> list:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT module_name FROM disabled_modules")
             return [row[0] for row in cursor.fetchall()]
@@ -217,216 +236,196 @@ def get_disabled_modules() -> list:
         return []
 
 # --- DISABLERS ---
+_disabled_commands_cache: LRUCache[int, frozenset[str]] = LRUCache(DISABLED_COMMANDS_CACHE_SIZE)
+
 def is_command_disabled_in_chat(chat_id: int, command_name: str) -> bool:
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT 1 FROM disabled_commands_per_chat WHERE chat_id = ? AND command_name = ?",
-                (chat_id, command_name.lower())
-            )
-            return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        logger.error(f"SQLite error checking disabled command '{command_name}' in chat {chat_id}: {e}")
-        return False
+    return command_name.lower() in get_disabled_commands_in_chat(chat_id)
 
 def disable_command_in_chat(chat_id: int, command_name: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.execute(
+        with write_connection() as conn:
+            cursor = conn.execute(
                 "INSERT OR IGNORE INTO disabled_commands_per_chat (chat_id, command_name) VALUES (?, ?)",
                 (chat_id, command_name.lower())
             )
-            return conn.total_changes > 0
+            disabled = cursor.rowcount > 0
+        _disabled_commands_cache.invalidate(chat_id)
+        return disabled
     except sqlite3.Error as e:
         logger.error(f"SQLite error disabling command '{command_name}' in chat {chat_id}: {e}")
         return False
 
 def enable_command_in_chat(chat_id: int, command_name: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.execute(
+        with write_connection() as conn:
+            cursor = conn.execute(
                 "DELETE FROM disabled_commands_per_chat WHERE chat_id = ? AND command_name = ?",
                 (chat_id, command_name.lower())
             )
-            return conn.total_changes > 0
+            enabled = cursor.rowcount > 0
+        _disabled_commands_cache.invalidate(chat_id)
+        return enabled
     except sqlite3.Error as e:
         logger.error(f"SQLite error enabling command '{command_name}' in chat {chat_id}: {e}")
         return False
 
-def get_disabled_commands_in_chat(chat_id: int) -> list[str]:
+def get_disabled_commands_in_chat(chat_id: int) -> frozenset[str]:
+    """Returns the chat's disabled commands, loaded once per chat and kept in an LRU cache."""
+    cached = _disabled_commands_cache.get(chat_id)
+    if cached is not None:
+        return cached
+    generation = _disabled_commands_cache.generation(chat_id)
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT command_name FROM disabled_commands_per_chat WHERE chat_id = ?",
                 (chat_id,)
             )
-            return [row[0] for row in cursor.fetchall()]
+            disabled = frozenset(row[0] for row in cursor.fetchall())
     except sqlite3.Error as e:
         logger.error(f"SQLite error getting disabled commands for chat {chat_id}: {e}")
-        return []
+        return frozenset()
+    _disabled_commands_cache.set_if_unchanged(chat_id, disabled, generation)
+    return disabled
+
+def is_chat_state_cached(chat_id: int) -> bool:
+    """True when both the chat settings and disabled commands of a chat can be served without a query."""
+    return chat_id in _chat_settings_cache and chat_id in _disabled_commands_cache
 
 # --- BLACKLIST ---
+# The rank and sanction helpers below update privilege_registry only once their
+# transaction has committed, so a rolled-back write never grants or revokes anything.
 def add_to_blacklist(user_id: int, banned_by_id: int, reason: str | None = "No reason provided.") -> bool:
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        current_timestamp_iso = datetime.now(timezone.utc).isoformat()
-        cursor.execute(
-            "INSERT OR IGNORE INTO blacklist (user_id, reason, banned_by_id, timestamp) VALUES (?, ?, ?, ?)",
-            (user_id, reason, banned_by_id, current_timestamp_iso)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            current_timestamp = _now()
+            cursor.execute(
+                "INSERT OR IGNORE INTO blacklist (user_id, reason, banned_by_id, timestamp) VALUES (?, ?, ?, ?)",
+                (user_id, reason, banned_by_id, current_timestamp)
+            )
+            changed = cursor.rowcount > 0
+        privilege_registry.add("blacklist", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error adding user {user_id} to blacklist: {e}", exc_info=True)
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def remove_from_blacklist(user_id: int) -> bool:
-    conn = None
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM blacklist WHERE user_id = ?", (user_id,))
-        conn.commit()
-        return cursor.rowcount > 0
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM blacklist WHERE user_id = ?", (user_id,))
+            changed = cursor.rowcount > 0
+        privilege_registry.remove("blacklist", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error removing user {user_id} from blacklist: {e}", exc_info=True)
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def get_blacklist_reason(user_id: int) -> str | None:
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT reason FROM blacklist WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-        if row:
-            return row[0]
-        return None
+    try:
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT reason FROM blacklist WHERE user_id = ?", (user_id,))
+            row = cursor.fetchone()
+            if row:
+                return row[0]
+            return None
     except sqlite3.Error as e:
         logger.error(f"SQLite error checking blacklist reason for user {user_id}: {e}", exc_info=True)
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def is_user_blacklisted(user_id: int) -> bool:
-    return get_blacklist_reason(user_id) is not None
+    return privilege_registry.contains("blacklist", user_id)
 
 # --- WHITELIST ---
 def add_to_whitelist(user_id: int, added_by_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            timestamp = datetime.now(timezone.utc).isoformat()
-            conn.execute(
+        with write_connection() as conn:
+            timestamp = _now()
+            cursor = conn.execute(
                 "INSERT OR IGNORE INTO whitelist_users (user_id, added_by_id, timestamp) VALUES (?, ?, ?)",
                 (user_id, added_by_id, timestamp)
             )
-            return conn.total_changes > 0
+            changed = cursor.rowcount > 0
+        privilege_registry.add("whitelist", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error adding user {user_id} to whitelist: {e}")
         return False
 
 def remove_from_whitelist(user_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM whitelist_users WHERE user_id = ?", (user_id,))
-            return cursor.rowcount > 0
+            changed = cursor.rowcount > 0
+        privilege_registry.remove("whitelist", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error removing user {user_id} from whitelist: {e}")
         return False
 
 def is_whitelisted(user_id: int) -> bool:
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            res = conn.cursor().execute("SELECT 1 FROM whitelist_users WHERE user_id = ?", (user_id,)).fetchone()
-            return res is not None
-    except sqlite3.Error:
-        return False
+    return privilege_registry.contains("whitelist", user_id)
 
-def get_all_whitelist_users_from_db() -> List[Tuple[int, str]]:
-    conn = None
+def get_all_whitelist_users_from_db() -> List[Tuple[int, datetime]]:
     whitelist_list = []
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id, timestamp FROM whitelist_users ORDER BY timestamp DESC")
-        rows = cursor.fetchall()
-        for row in rows:
-            whitelist_list.append((row[0], row[1]))
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT user_id, timestamp FROM whitelist_users ORDER BY timestamp DESC")
+            rows = cursor.fetchall()
+            for row in rows:
+                whitelist_list.append((row[0], _to_datetime(row[1])))
     except sqlite3.Error as e:
         logger.error(f"SQLite error fetching all whitelist users: {e}", exc_info=True)
-    finally:
-        if conn:
-            conn.close()
     return whitelist_list
 
 # --- SUPPORT ---
 def add_support_user(user_id: int, added_by_id: int) -> bool:
     """Adds a user to the Support list."""
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        current_timestamp_iso = datetime.now(timezone.utc).isoformat()
-        cursor.execute(
-            "INSERT OR IGNORE INTO support_users (user_id, added_by_id, timestamp) VALUES (?, ?, ?)",
-            (user_id, added_by_id, current_timestamp_iso)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            current_timestamp = _now()
+            cursor.execute(
+                "INSERT OR IGNORE INTO support_users (user_id, added_by_id, timestamp) VALUES (?, ?, ?)",
+                (user_id, added_by_id, current_timestamp)
+            )
+            changed = cursor.rowcount > 0
+        privilege_registry.add("support", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error adding support user {user_id}: {e}", exc_info=True)
         return False
-    finally:
-        if conn: conn.close()
 
 def remove_support_user(user_id: int) -> bool:
     """Removes a user from the Support list."""
-    conn = None
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM support_users WHERE user_id = ?", (user_id,))
-        conn.commit()
-        return cursor.rowcount > 0
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM support_users WHERE user_id = ?", (user_id,))
+            changed = cursor.rowcount > 0
+        privilege_registry.remove("support", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error removing support user {user_id}: {e}", exc_info=True)
         return False
-    finally:
-        if conn: conn.close()
 
 def is_support_user(user_id: int) -> bool:
     """Checks if a user is on the Support list."""
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM support_users WHERE user_id = ?", (user_id,))
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        logger.error(f"SQLite error checking support for user {user_id}: {e}", exc_info=True)
-        return False
-    finally:
-        if conn: conn.close()
+    return privilege_registry.contains("support", user_id)
 
-def get_all_support_users_from_db() -> List[Tuple[int, str]]:
+def get_all_support_users_from_db() -> List[Tuple[int, datetime]]:
     """Fetches all Support users from the database."""
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT user_id, timestamp FROM support_users ORDER BY timestamp DESC")
-            return cursor.fetchall()
+            return [(user_id, _to_datetime(ts)) for user_id, ts in cursor.fetchall()]
     except sqlite3.Error as e:
         logger.error(f"SQLite error fetching all support users: {e}", exc_info=True)
         return []
@@ -434,161 +433,167 @@ def get_all_support_users_from_db() -> List[Tuple[int, str]]:
 # --- SUDO ---
 def add_sudo_user(user_id: int, added_by_id: int) -> bool:
     """Adds a user to the sudo list."""
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        current_timestamp_iso = datetime.now(timezone.utc).isoformat()
-        cursor.execute(
-            "INSERT OR IGNORE INTO sudo_users (user_id, added_by_id, timestamp) VALUES (?, ?, ?)",
-            (user_id, added_by_id, current_timestamp_iso)
-        )
-        conn.commit()
-        return cursor.rowcount > 0 
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            current_timestamp = _now()
+            cursor.execute(
+                "INSERT OR IGNORE INTO sudo_users (user_id, added_by_id, timestamp) VALUES (?, ?, ?)",
+                (user_id, added_by_id, current_timestamp)
+            )
+            changed = cursor.rowcount > 0
+        privilege_registry.add("sudo", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error adding sudo user {user_id}: {e}", exc_info=True)
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def remove_sudo_user(user_id: int) -> bool:
     """Removes a user from the sudo list."""
-    conn = None
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM sudo_users WHERE user_id = ?", (user_id,))
-        conn.commit()
-        return cursor.rowcount > 0
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM sudo_users WHERE user_id = ?", (user_id,))
+            changed = cursor.rowcount > 0
+        privilege_registry.remove("sudo", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error removing sudo user {user_id}: {e}", exc_info=True)
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def is_sudo_user(user_id: int) -> bool:
-    """Checks if a user is on the sudo list (database check only)."""
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM sudo_users WHERE user_id = ?", (user_id,))
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        logger.error(f"SQLite error checking sudo for user {user_id}: {e}", exc_info=True)
-        return False 
-    finally:
-        if conn:
-            conn.close()
-
-def get_all_sudo_users_from_db() -> List[Tuple[int, str]]:
-    conn = None
+    """Checks if a user is on the sudo list (in-memory registry lookup)."""
+    return privilege_registry.contains("sudo", user_id)
+
+def get_all_sudo_users_from_db() -> List[Tuple[int, datetime]]:
     sudo_list = []
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id, timestamp FROM sudo_users ORDER BY timestamp DESC")
-        rows = cursor.fetchall()
-        for row in rows:
-            sudo_list.append((row[0], row[1]))
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT user_id, timestamp FROM sudo_users ORDER BY timestamp DESC")
+            rows = cursor.fetchall()
+            for row in rows:
+                sudo_list.append((row[0], _to_datetime(row[1])))
     except sqlite3.Error as e:
         logger.error(f"SQLite error fetching all sudo users: {e}", exc_info=True)
-    finally:
-        if conn:
-            conn.close()
     return sudo_list
 
 # --- DEVELOPER ---
 def add_dev_user(user_id: int, added_by_id: int) -> bool:
     """Adds a user to the Developer list."""
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        current_timestamp_iso = datetime.now(timezone.utc).isoformat()
-        cursor.execute(
-            "INSERT OR IGNORE INTO dev_users (user_id, added_by_id, timestamp) VALUES (?, ?, ?)",
-            (user_id, added_by_id, current_timestamp_iso)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            current_timestamp = _now()
+            cursor.execute(
+                "INSERT OR IGNORE INTO dev_users (user_id, added_by_id, timestamp) VALUES (?, ?, ?)",
+                (user_id, added_by_id, current_timestamp)
+            )
+            changed = cursor.rowcount > 0
+        privilege_registry.add("dev", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error adding dev user {user_id}: {e}", exc_info=True)
         return False
-    finally:
-        if conn: conn.close()
 
 def remove_dev_user(user_id: int) -> bool:
     """Removes a user from the Developer list."""
-    conn = None
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM dev_users WHERE user_id = ?", (user_id,))
-        conn.commit()
-        return cursor.rowcount > 0
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM dev_users WHERE user_id = ?", (user_id,))
+            changed = cursor.rowcount > 0
+        privilege_registry.remove("dev", user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error removing dev user {user_id}: {e}", exc_info=True)
         return False
-    finally:
-        if conn: conn.close()
 
 def is_dev_user(user_id: int) -> bool:
     """Checks if a user is on the Developer list."""
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM dev_users WHERE user_id = ?", (user_id,))
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        logger.error(f"SQLite error checking dev for user {user_id}: {e}", exc_info=True)
-        return False
-    finally:
-        if conn: conn.close()
-        
-def get_all_dev_users_from_db() -> List[Tuple[int, str]]:
+    return privilege_registry.contains("dev", user_id)
+
+def get_all_dev_users_from_db() -> List[Tuple[int, datetime]]:
     """Fetches all developers from the database."""
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT user_id, timestamp FROM dev_users ORDER BY timestamp DESC")
-            return cursor.fetchall()
+            return [(user_id, _to_datetime(ts)) for user_id, ts in cursor.fetchall()]
     except sqlite3.Error as e:
         logger.error(f"SQLite error fetching all dev users: {e}", exc_info=True)
         return []
 
+def get_ranks(user_ids: Iterable[int]) -> dict[int, str]:
+    """Returns {user_id: rank} for the users among user_ids that hold one (owner, dev, sudo, support, whitelist)."""
+    ranks: dict[int, str] = {}
+    for user_id in user_ids:
+        if privilege_registry.is_owner(user_id):
+            ranks[user_id] = "owner"
+            continue
+        for rank in ("dev", "sudo", "support", "whitelist"):
+            if privilege_registry.contains(rank, user_id):
+                ranks[user_id] = rank
+                break
+    return ranks
+
 # --- GLOBAL BANS ---
 def add_to_gban(user_id: int, banned_by_id: int, reason: str | None) -> bool:
     reason = reason or "No reason provided."
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            timestamp = datetime.now(timezone.utc).isoformat()
+            timestamp = _now()
             cursor.execute(
                 "INSERT OR REPLACE INTO global_bans (user_id, reason, banned_by_id, timestamp) VALUES (?, ?, ?, ?)",
                 (user_id, reason, banned_by_id, timestamp)
             )
-            return cursor.rowcount > 0
+            changed = cursor.rowcount > 0
+        # The index is only touched once the transaction has committed.
+        gban_index.add(user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error adding user {user_id} to gban list: {e}")
         return False
 
 def remove_from_gban(user_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM global_bans WHERE user_id = ?", (user_id,))
-            return cursor.rowcount > 0
+            changed = cursor.rowcount > 0
+        gban_index.remove(user_id)
+        return changed
     except sqlite3.Error as e:
         logger.error(f"SQLite error removing user {user_id} from gban list: {e}")
         return False
 
+def add_to_gban_many(rows: Iterable[Tuple[int, int, str | None]]) -> int:
+    """Gbans many (user_id, banned_by_id, reason) rows in one transaction. Returns the number written."""
+    timestamp = _now()
+    params = [(user_id, reason or "No reason provided.", banned_by_id, timestamp) for user_id, banned_by_id, reason in rows]
+    if not params:
+        return 0
+    try:
+        with write_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO global_bans (user_id, reason, banned_by_id, timestamp) VALUES (?, ?, ?, ?)",
+                params
+            )
+        gban_index.add_many(row[0] for row in params)
+        return len(params)
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error adding {len(params)} users to gban list: {e}")
+        return 0
+
+def is_gbanned(user_id: int) -> bool:
+    return user_id in gban_index
+
 def get_gban_reason(user_id: int) -> str | None:
+    if user_id not in gban_index:
+        return None
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT reason FROM global_bans WHERE user_id = ?", (user_id,))
             row = cursor.fetchone()
@@ -597,54 +602,104 @@ def get_gban_reason(user_id: int) -> str | None:
         logger.error(f"SQLite error checking gban status for user {user_id}: {e}")
         return None
 
+def get_gban_reasons(user_ids: Iterable[int]) -> dict[int, str]:
+    """Returns {user_id: reason} for the gbanned users among user_ids."""
+    candidates = list({user_id for user_id in user_ids if user_id in gban_index})
+    reasons: dict[int, str] = {}
+    if not candidates:
+        return reasons
+    try:
+        with read_connection() as conn:
+            for i in range(0, len(candidates), _IN_CHUNK_SIZE):
+                chunk = candidates[i:i + _IN_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                for user_id, reason in conn.execute(
+                    f"SELECT user_id, reason FROM global_bans WHERE user_id IN ({placeholders})", chunk
+                ):
+                    reasons[user_id] = reason
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error fetching gban reasons for {len(candidates)} users: {e}")
+    return reasons
+
 def is_gban_enforced(chat_id: int) -> bool:
     """Checks if gban enforcement is enabled for a specific chat."""
+    return get_chat_settings(chat_id).enforce_gban
+
+def set_gban_enforcement(chat_id: int, enabled: bool, chat_title: str | None = None) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            res = cursor.execute(
-                "SELECT enforce_gban FROM bot_chats WHERE chat_id = ?", (chat_id,)
-            ).fetchone()
-            if res is None:
-                return True 
-            return bool(res[0])
-    except sqlite3.Error as e:
-        logger.error(f"Could not check gban enforcement status for chat {chat_id}: {e}")
+            cursor.execute(
+                "INSERT OR IGNORE INTO bot_chats (chat_id, chat_title, added_at) VALUES (?, ?, ?)",
+                (chat_id, chat_title or f"Chat {chat_id}", _now())
+            )
+            cursor.execute("UPDATE bot_chats SET enforce_gban = ? WHERE chat_id = ?", (1 if enabled else 0, chat_id))
+        _invalidate_chat_settings(chat_id)
         return True
+    except sqlite3.Error as e:
+        logger.error(f"Failed to update gban enforcement for chat {chat_id}: {e}")
+        return False
 
 # --- USERS ---
 def update_user_in_db(user: User | None):
     if not user:
         return
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        current_timestamp_iso = datetime.now(timezone.utc).isoformat()
-        cursor.execute("""
-            INSERT INTO users (user_id, username, first_name, last_name, language_code, is_bot, last_seen)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET
-                username = excluded.username,
-                first_name = excluded.first_name,
-                last_name = excluded.last_name,
-                language_code = excluded.language_code,
-                is_bot = excluded.is_bot,
-                last_seen = excluded.last_seen 
-        """, (
-            user.id, user.username, user.first_name, user.last_name,
-            user.language_code, 1 if user.is_bot else 0, current_timestamp_iso
-        ))
-        conn.commit()
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            current_timestamp = _now()
+            cursor.execute("""
+                INSERT INTO users (user_id, username, first_name, last_name, language_code, is_bot, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    username = excluded.username,
+                    first_name = excluded.first_name,
+                    last_name = excluded.last_name,
+                    language_code = excluded.language_code,
+                    is_bot = excluded.is_bot,
+                    last_seen = excluded.last_seen
+            """, (
+                user.id, user.username, user.first_name, user.last_name,
+                user.language_code, 1 if user.is_bot else 0, current_timestamp
+            ))
     except sqlite3.Error as e:
         logger.error(f"SQLite error updating user {user.id} in users table: {e}", exc_info=True)
-    finally:
-        if conn:
-            conn.close()
+
+def upsert_users(users: Iterable[User | None]) -> bool:
+    """Upserts many users in one transaction."""
+    timestamp = _now()
+    rows = {
+        user.id: (user.id, user.username, user.first_name, user.last_name,
+                  user.language_code, 1 if user.is_bot else 0, timestamp)
+        for user in users if user
+    }
+    return upsert_user_rows(list(rows.values()))
+
+def upsert_user_rows(rows: list[tuple]) -> bool:
+    """Writes many (user_id, username, first_name, last_name, language_code, is_bot, last_seen) rows in one transaction."""
+    if not rows:
+        return True
+    try:
+        with write_connection() as conn:
+            conn.executemany("""
+                INSERT INTO users (user_id, username, first_name, last_name, language_code, is_bot, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    username = excluded.username,
+                    first_name = excluded.first_name,
+                    last_name = excluded.last_name,
+                    language_code = excluded.language_code,
+                    is_bot = excluded.is_bot,
+                    last_seen = excluded.last_seen
+            """, rows)
+        return True
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error upserting {len(rows)} users: {e}", exc_info=True)
+        return False
 
 def delete_user_from_db(user_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
             return cursor.rowcount > 0
@@ -655,35 +710,31 @@ def delete_user_from_db(user_id: int) -> bool:
 def get_user_from_db_by_username(username_query: str) -> User | None:
     if not username_query:
         return None
-    conn = None
     user_obj: User | None = None
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        normalized_username = username_query.lstrip('@').lower()
-        cursor.execute(
-            "SELECT user_id, username, first_name, last_name, language_code, is_bot FROM users WHERE LOWER(username) = ?",
-            (normalized_username,)
-        )
-        row = cursor.fetchone()
-        if row:
-            user_obj = User(
-                id=row[0], username=row[1], first_name=row[2] or "",
-                last_name=row[3], language_code=row[4], is_bot=bool(row[5])
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            normalized_username = username_query.lstrip('@')
+            cursor.execute(
+                "SELECT user_id, username, first_name, last_name, language_code, is_bot FROM users WHERE username = ? COLLATE NOCASE",
+                (normalized_username,)
             )
-            logger.info(f"User {username_query} found in DB with ID {row[0]}.")
+            row = cursor.fetchone()
+            if row:
+                user_obj = User(
+                    id=row[0], username=row[1], first_name=row[2] or "",
+                    last_name=row[3], language_code=row[4], is_bot=bool(row[5])
+                )
+                logger.info(f"User {username_query} found in DB with ID {row[0]}.")
     except sqlite3.Error as e:
         logger.error(f"SQLite error fetching user by username '{username_query}': {e}", exc_info=True)
-    finally:
-        if conn:
-            conn.close()
     return user_obj
 
 def get_user_from_db_by_id(user_id: int) -> User | None:
     if not user_id:
         return None
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT user_id, username, first_name, last_name, language_code, is_bot FROM users WHERE user_id = ?",
@@ -704,173 +755,238 @@ def get_user_from_db_by_id(user_id: int) -> User | None:
 # --- CHATS ---
 def add_chat_to_db(chat_id: int, chat_title: str):
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            timestamp = datetime.now(timezone.utc).isoformat()
+            timestamp = _now()
+            # Upsert instead of INSERT OR REPLACE: replacing the row would reset the chat's settings.
             cursor.execute(
-                "INSERT OR REPLACE INTO bot_chats (chat_id, chat_title, added_at) VALUES (?, ?, ?)",
+                "INSERT INTO bot_chats (chat_id, chat_title, added_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(chat_id) DO UPDATE SET chat_title = excluded.chat_title",
                 (chat_id, chat_title, timestamp)
             )
+        _invalidate_chat_settings(chat_id)
     except sqlite3.Error as e:
         logger.error(f"Failed to add chat {chat_id} to DB: {e}")
 
 def remove_chat_from_db(chat_id: int):
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM bot_chats WHERE chat_id = ?", (chat_id,))
+        _invalidate_chat_settings(chat_id)
     except sqlite3.Error as e:
         logger.error(f"Failed to remove chat {chat_id} from DB: {e}")
 
-def get_all_bot_chats_from_db() -> List[Tuple[int, str, str]]:
+def get_all_bot_chats_from_db() -> List[Tuple[int, str, datetime]]:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT chat_id, chat_title, added_at FROM bot_chats ORDER BY added_at DESC")
-            return cursor.fetchall()
+            return [(chat_id, title, _to_datetime(added_at)) for chat_id, title, added_at in cursor.fetchall()]
     except sqlite3.Error as e:
         logger.error(f"SQLite error fetching all bot chats: {e}", exc_info=True)
         return []
 
+def get_all_chat_ids() -> List[int]:
+    """Raises sqlite3.Error, so callers can tell a failed lookup from having no chats."""
+    with read_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT chat_id FROM bot_chats")]
+
+def get_table_counts() -> dict[str, int]:
+    """Row counts of the tables shown by /stats, from the trigger-maintained stats_counters. Empty on error."""
+    try:
+        with read_connection() as conn:
+            return dict(conn.execute("SELECT name, value FROM stats_counters").fetchall())
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error fetching table counts: {e}", exc_info=True)
+        return {}
+
+def reconcile_stats_counters() -> dict[str, int]:
+    """Recounts every counted table and fixes stats_counters. Returns {table: drift} for corrected counters."""
+    drift: dict[str, int] = {}
+    try:
+        with write_connection() as conn:
+            stored = dict(conn.execute("SELECT name, value FROM stats_counters").fetchall())
+            for table in COUNTED_TABLES:
+                actual = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                if stored.get(table) != actual:
+                    drift[table] = actual - stored.get(table, 0)
+                    conn.execute("INSERT OR REPLACE INTO stats_counters (name, value) VALUES (?, ?)", (table, actual))
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error reconciling stats counters: {e}", exc_info=True)
+    return drift
+
 def remove_chat_from_db_by_id(chat_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM bot_chats WHERE chat_id = ?", (chat_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            removed = cursor.rowcount > 0
+        _invalidate_chat_settings(chat_id)
+        return removed
     except sqlite3.Error as e:
         logger.error(f"SQLite error removing chat {chat_id} from DB: {e}", exc_info=True)
         return False
 
 # --- CHAT SETTINGS ---
+class ChatSettings(NamedTuple):
+    enforce_gban: bool = True
+    welcome_enabled: bool = True
+    custom_welcome: str | None = None
+    goodbye_enabled: bool = True
+    custom_goodbye: str | None = None
+    clean_service: bool = False
+    warn_limit: int = MAX_WARNS
+    rules_text: str | None = None
+    is_blacklisted: bool = False
+
+_chat_settings_cache: LRUCache[int, ChatSettings] = LRUCache(CHAT_SETTINGS_CACHE_SIZE)
+
+def _invalidate_chat_settings(chat_id: int) -> None:
+    _chat_settings_cache.invalidate(chat_id)
+
+def get_chat_settings(chat_id: int) -> ChatSettings:
+    """Returns the whole bot_chats row plus the chat blacklist status, cached per chat."""
+    cached = _chat_settings_cache.get(chat_id)
+    if cached is not None:
+        return cached
+
+    generation = _chat_settings_cache.generation(chat_id)
+    try:
+        with read_connection() as conn:
+            row = conn.execute("""
+                SELECT c.enforce_gban, c.welcome_enabled, c.custom_welcome, c.goodbye_enabled, c.custom_goodbye,
+                       c.clean_service_messages, c.warn_limit, c.rules_text,
+                       EXISTS (SELECT 1 FROM chat_blacklist WHERE chat_id = q.chat_id)
+                FROM (SELECT ? AS chat_id) AS q
+                LEFT JOIN bot_chats AS c ON c.chat_id = q.chat_id
+            """, (chat_id,)).fetchone()
+    except sqlite3.Error as e:
+        logger.error(f"Error loading settings for chat {chat_id}: {e}")
+        return ChatSettings()
+
+    (enforce_gban, welcome_enabled, custom_welcome, goodbye_enabled, custom_goodbye,
+     clean_service, warn_limit, rules_text, is_blacklisted) = row
+    if enforce_gban is None:
+        settings = ChatSettings(is_blacklisted=bool(is_blacklisted))
+    else:
+        settings = ChatSettings(
+            enforce_gban=bool(enforce_gban),
+            welcome_enabled=bool(welcome_enabled),
+            custom_welcome=custom_welcome,
+            goodbye_enabled=bool(goodbye_enabled),
+            custom_goodbye=custom_goodbye,
+            clean_service=bool(clean_service),
+            warn_limit=warn_limit if warn_limit is not None and warn_limit > 0 else MAX_WARNS,
+            rules_text=rules_text,
+            is_blacklisted=bool(is_blacklisted),
+        )
+    _chat_settings_cache.set_if_unchanged(chat_id, settings, generation)
+    return settings
+
 def set_welcome_setting(chat_id: int, enabled: bool, text: str | None = None) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)", 
-                           (chat_id, datetime.now(timezone.utc).isoformat()))
-            
+            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)",
+                           (chat_id, _now()))
+
             cursor.execute(
                 "UPDATE bot_chats SET welcome_enabled = ?, custom_welcome = ? WHERE chat_id = ?",
                 (1 if enabled else 0, text, chat_id)
             )
+        _invalidate_chat_settings(chat_id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error setting welcome for chat {chat_id}: {e}")
         return False
 
+def set_welcome_enabled(chat_id: int, enabled: bool) -> bool:
+    try:
+        with write_connection() as conn:
+            conn.execute("UPDATE bot_chats SET welcome_enabled = ? WHERE chat_id = ?", (1 if enabled else 0, chat_id))
+        _invalidate_chat_settings(chat_id)
+        return True
+    except sqlite3.Error as e:
+        logger.error(f"Error toggling welcome for chat {chat_id}: {e}")
+        return False
+
 def set_goodbye_setting(chat_id: int, enabled: bool, text: str | None = None) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)", 
-                           (chat_id, datetime.now(timezone.utc).isoformat()))
-            
+            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)",
+                           (chat_id, _now()))
+
             cursor.execute(
                 "UPDATE bot_chats SET goodbye_enabled = ?, custom_goodbye = ? WHERE chat_id = ?",
                 (1 if enabled else 0, text, chat_id)
             )
+        _invalidate_chat_settings(chat_id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error setting goodbye for chat {chat_id}: {e}")
         return False
 
 def get_welcome_settings(chat_id: int) -> Tuple[bool, str | None]:
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            res = conn.cursor().execute(
-                "SELECT welcome_enabled, custom_welcome FROM bot_chats WHERE chat_id = ?", (chat_id,)
-            ).fetchone()
-            if res:
-                return bool(res[0]), res[1]
-            return True, None
-    except sqlite3.Error:
-        logger.error(f"Error getting welcome settings for chat {chat_id}")
-        return True, None
+    settings = get_chat_settings(chat_id)
+    return settings.welcome_enabled, settings.custom_welcome
 
 def get_goodbye_settings(chat_id: int) -> Tuple[bool, str | None]:
     """Pobiera ustawienia pożegnań (czy włączone, jaki tekst)."""
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            res = conn.cursor().execute(
-                "SELECT goodbye_enabled, custom_goodbye FROM bot_chats WHERE chat_id = ?", (chat_id,)
-            ).fetchone()
-            if res:
-                return bool(res[0]), res[1]
-            return True, None
-    except sqlite3.Error:
-        logger.error(f"Error getting goodbye settings for chat {chat_id}")
-        return True, None
+    settings = get_chat_settings(chat_id)
+    return settings.goodbye_enabled, settings.custom_goodbye
 
 def set_clean_service(chat_id: int, enabled: bool) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)", 
-                           (chat_id, datetime.now(timezone.utc).isoformat()))
-            
+            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)",
+                           (chat_id, _now()))
+
             cursor.execute(
                 "UPDATE bot_chats SET clean_service_messages = ? WHERE chat_id = ?",
                 (1 if enabled else 0, chat_id)
             )
+        _invalidate_chat_settings(chat_id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error setting clean service for chat {chat_id}: {e}")
         return False
 
 def should_clean_service(chat_id: int) -> bool:
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            res = conn.cursor().execute(
-                "SELECT clean_service_messages FROM bot_chats WHERE chat_id = ?", (chat_id,)
-            ).fetchone()
-            return bool(res[0]) if res else False
-    except sqlite3.Error:
-        logger.error(f"Error checking clean service for chat {chat_id}")
-        return False
+    return get_chat_settings(chat_id).clean_service
 
 def set_warn_limit(chat_id: int, limit: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)", 
-                           (chat_id, datetime.now(timezone.utc).isoformat()))
+            cursor.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)",
+                           (chat_id, _now()))
             cursor.execute("UPDATE bot_chats SET warn_limit = ? WHERE chat_id = ?", (limit, chat_id))
+        _invalidate_chat_settings(chat_id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error setting warn limit for chat {chat_id}: {e}")
         return False
 
 def get_warn_limit(chat_id: int) -> int:
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            res = conn.cursor().execute("SELECT warn_limit FROM bot_chats WHERE chat_id = ?", (chat_id,)).fetchone()
-            if res and res[0] is not None and res[0] > 0:
-                return res[0]
-            return MAX_WARNS
-    except sqlite3.Error:
-        logger.error(f"Error getting warn limit for chat {chat_id}")
-        return MAX_WARNS
+    return get_chat_settings(chat_id).warn_limit
 
 def set_rules(chat_id: int, rules: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             conn.execute("INSERT OR IGNORE INTO bot_chats (chat_id, added_at) VALUES (?, ?)",
-                         (chat_id, datetime.now(timezone.utc).isoformat()))
+                         (chat_id, _now()))
             conn.execute("UPDATE bot_chats SET rules_text = ? WHERE chat_id = ?", (rules, chat_id))
+        _invalidate_chat_settings(chat_id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error setting rules for chat {chat_id}: {e}")
         return False
 
 def get_rules(chat_id: int) -> str | None:
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            res = conn.cursor().execute("SELECT rules_text FROM bot_chats WHERE chat_id = ?", (chat_id,)).fetchone()
-            return res[0] if res else None
-    except sqlite3.Error:
-        return None
+    return get_chat_settings(chat_id).rules_text
 
 def clear_rules(chat_id: int) -> bool:
     return set_rules(chat_id, None)
@@ -878,8 +994,8 @@ def clear_rules(chat_id: int) -> bool:
 # --- NOTES ---
 def add_note(chat_id: int, note_name: str, content: str, user_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            timestamp = datetime.now(timezone.utc).isoformat()
+        with write_connection() as conn:
+            timestamp = _now()
             conn.execute(
                 "INSERT OR REPLACE INTO notes (chat_id, note_name, content, created_by_id, created_at) VALUES (?, ?, ?, ?, ?)",
                 (chat_id, note_name.lower(), content, user_id, timestamp)
@@ -891,7 +1007,7 @@ def add_note(chat_id: int, note_name: str, content: str, user_id: int) -> bool:
 
 def remove_note(chat_id: int, note_name: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM notes WHERE chat_id = ? AND note_name = ?", (chat_id, note_name.lower()))
             return cursor.rowcount > 0
@@ -901,7 +1017,7 @@ def remove_note(chat_id: int, note_name: str) -> bool:
 
 def get_note(chat_id: int, note_name: str) -> str | None:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             res = conn.cursor().execute("SELECT content FROM notes WHERE chat_id = ? AND note_name = ?", (chat_id, note_name.lower())).fetchone()
             return res[0] if res else None
     except sqlite3.Error:
@@ -909,7 +1025,7 @@ def get_note(chat_id: int, note_name: str) -> str | None:
 
 def get_all_notes(chat_id: int) -> List[str]:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             notes = conn.cursor().execute("SELECT note_name FROM notes WHERE chat_id = ? ORDER BY note_name", (chat_id,)).fetchall()
             return [row[0] for row in notes]
     except sqlite3.Error:
@@ -918,20 +1034,20 @@ def get_all_notes(chat_id: int) -> List[str]:
 # --- WARNINGS ---
 def add_warning(chat_id: int, user_id: int, reason: str, admin_id: int) -> Tuple[int, int]:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            timestamp = datetime.now(timezone.utc).isoformat()
+            timestamp = _now()
             cursor.execute(
                 "INSERT INTO warnings (chat_id, user_id, reason, warned_by_id, warned_at) VALUES (?, ?, ?, ?, ?)",
                 (chat_id, user_id, reason, admin_id, timestamp)
             )
             new_warn_id = cursor.lastrowid
-            
+
             count = cursor.execute(
                 "SELECT COUNT(*) FROM warnings WHERE chat_id = ? AND user_id = ?",
                 (chat_id, user_id)
             ).fetchone()[0]
-            
+
             return new_warn_id, count
     except sqlite3.Error as e:
         logger.error(f"Error adding warning for user {user_id} in chat {chat_id}: {e}")
@@ -939,7 +1055,7 @@ def add_warning(chat_id: int, user_id: int, reason: str, admin_id: int) -> Tuple
 
 def remove_warning_by_id(warn_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM warnings WHERE id = ?", (warn_id,))
             return cursor.rowcount > 0
@@ -949,7 +1065,7 @@ def remove_warning_by_id(warn_id: int) -> bool:
 
 def get_warnings(chat_id: int, user_id: int) -> List[Tuple[str, int]]:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             warnings = conn.cursor().execute(
                 "SELECT reason, warned_by_id FROM warnings WHERE chat_id = ? AND user_id = ?",
                 (chat_id, user_id)
@@ -961,7 +1077,7 @@ def get_warnings(chat_id: int, user_id: int) -> List[Tuple[str, int]]:
 
 def reset_warnings(chat_id: int, user_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM warnings WHERE chat_id = ? AND user_id = ?", (chat_id, user_id))
             return cursor.rowcount > 0
@@ -972,33 +1088,40 @@ def reset_warnings(chat_id: int, user_id: int) -> bool:
 # --- AFK ---
 def set_afk(user_id: int, reason: str | None) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            timestamp = datetime.now(timezone.utc).isoformat()
+        with write_connection() as conn:
+            timestamp = _now()
             conn.execute(
                 "INSERT OR REPLACE INTO afk_users (user_id, reason, afk_since) VALUES (?, ?, ?)",
                 (user_id, reason, timestamp)
             )
+        privilege_registry.add("afk", user_id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error setting AFK status for user {user_id}: {e}")
         return False
 
-def get_afk_status(user_id: int) -> Tuple[str, str] | None:
+def is_afk(user_id: int) -> bool:
+    """Checks if a user is AFK (in-memory registry lookup)."""
+    return privilege_registry.contains("afk", user_id)
+
+def get_afk_status(user_id: int) -> Tuple[str, datetime] | None:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             res = conn.cursor().execute(
                 "SELECT reason, afk_since FROM afk_users WHERE user_id = ?", (user_id,)
             ).fetchone()
-            return res if res else None
+            return (res[0], _to_datetime(res[1])) if res else None
     except sqlite3.Error:
         return None
 
 def clear_afk(user_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM afk_users WHERE user_id = ?", (user_id,))
-            return cursor.rowcount > 0
+            cleared = cursor.rowcount > 0
+        privilege_registry.remove("afk", user_id)
+        return cleared
     except sqlite3.Error as e:
         logger.error(f"Error clearing AFK status for user {user_id}: {e}")
         return False
@@ -1006,7 +1129,7 @@ def clear_afk(user_id: int) -> bool:
 # --- JOINFILTERS ---
 def get_chat_join_settings(chat_id: int) -> tuple[list[str], str]:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT filters, action FROM chat_join_settings WHERE chat_id = ?", (chat_id,))
             row = cursor.fetchone()
@@ -1022,9 +1145,9 @@ def get_chat_join_settings(chat_id: int) -> tuple[list[str], str]:
 
 def update_chat_join_settings(chat_id: int, filters: list[str] | None = None, action: str | None = None) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
-            
+
             current_filters, current_action = get_chat_join_settings(chat_id)
 
             new_filters = filters if filters is not None else current_filters
@@ -1044,11 +1167,11 @@ def update_chat_join_settings(chat_id: int, filters: list[str] | None = None, ac
 # --- FILTERS ---
 def add_or_update_filter(chat_id: int, keyword: str, data: dict) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             conn.execute(
                 """
-                INSERT OR REPLACE INTO chat_filters 
-                (chat_id, keyword, reply_text, reply_type, file_id, filter_type, buttons) 
+                INSERT OR REPLACE INTO chat_filters
+                (chat_id, keyword, reply_text, reply_type, file_id, filter_type, buttons)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
@@ -1068,17 +1191,17 @@ def add_or_update_filter(chat_id: int, keyword: str, data: dict) -> bool:
 
 def remove_filter(chat_id: int, keyword: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM chat_filters WHERE chat_id = ? AND keyword = ?", (chat_id, keyword.lower()))
             return cursor.rowcount > 0
     except sqlite3.Error: return False
-    
+
 def get_all_filters_for_chat(chat_id: int) -> list[dict]:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.row_factory = sqlite3.Row
+        with read_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute("SELECT * FROM chat_filters WHERE chat_id = ?", (chat_id,))
             return [dict(row) for row in cursor.fetchall()]
     except sqlite3.Error: return []
@@ -1086,34 +1209,136 @@ def get_all_filters_for_chat(chat_id: int) -> list[dict]:
 # --- BLACKLIST CHAT ---
 def blacklist_chat(chat_id: int, chat_name: str) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            current_timestamp = datetime.now(timezone.utc).isoformat()
-            conn.execute(
+        with write_connection() as conn:
+            current_timestamp = _now()
+            cursor = conn.execute(
                 "INSERT OR IGNORE INTO chat_blacklist (chat_id, chat_name, timestamp) VALUES (?, ?, ?)",
                 (chat_id, chat_name, current_timestamp)
             )
-            return conn.total_changes > 0
+            added = cursor.rowcount > 0
+        _invalidate_chat_settings(chat_id)
+        return added
     except sqlite3.Error: return False
 
 def unblacklist_chat(chat_id: int) -> bool:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.execute("DELETE FROM chat_blacklist WHERE chat_id = ?", (chat_id,))
-            return conn.total_changes > 0
+        with write_connection() as conn:
+            cursor = conn.execute("DELETE FROM chat_blacklist WHERE chat_id = ?", (chat_id,))
+            removed = cursor.rowcount > 0
+        _invalidate_chat_settings(chat_id)
+        return removed
     except sqlite3.Error: return False
 
 def is_chat_blacklisted(chat_id: int) -> bool:
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM chat_blacklist WHERE chat_id = ?", (chat_id,))
-            return cursor.fetchone() is not None
-    except sqlite3.Error: return False
+    return get_chat_settings(chat_id).is_blacklisted
 
-def get_blacklisted_chats() -> list[tuple[int, str, str]]:
+def get_blacklisted_chats() -> list[tuple[int, str, datetime]]:
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT chat_id, chat_name, timestamp FROM chat_blacklist ORDER BY timestamp DESC")
-            return cursor.fetchall()
+            return [(chat_id, name, _to_datetime(ts)) for chat_id, name, ts in cursor.fetchall()]
     except sqlite3.Error: return []
+
+# --- MAINTENANCE ---
+def prune_inactive_users(seen_before: int, protected_ids: Iterable[int] = (), limit: int = 500) -> int:
+    """Deletes up to `limit` users not seen since `seen_before` who hold no rank or sanction."""
+    protected = list(protected_ids)
+    placeholders = ", ".join("?" * len(protected)) or "NULL"
+    try:
+        with write_connection() as conn:
+            cursor = conn.execute(f"""
+                DELETE FROM users WHERE user_id IN (
+                    SELECT u.user_id FROM users AS u
+                    WHERE u.last_seen < ?
+                      AND u.user_id NOT IN ({placeholders})
+                      AND NOT EXISTS (SELECT 1 FROM dev_users WHERE user_id = u.user_id)
+                      AND NOT EXISTS (SELECT 1 FROM sudo_users WHERE user_id = u.user_id)
+                      AND NOT EXISTS (SELECT 1 FROM support_users WHERE user_id = u.user_id)
+                      AND NOT EXISTS (SELECT 1 FROM whitelist_users WHERE user_id = u.user_id)
+                      AND NOT EXISTS (SELECT 1 FROM blacklist WHERE user_id = u.user_id)
+                      AND NOT EXISTS (SELECT 1 FROM global_bans WHERE user_id = u.user_id)
+                    LIMIT ?
+                )
+            """, (seen_before, *protected, limit))
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error pruning inactive users: {e}", exc_info=True)
+        return 0
+
+def prune_afk_before(cutoff: int, limit: int = 500) -> int:
+    try:
+        with write_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM afk_users WHERE user_id IN (SELECT user_id FROM afk_users WHERE afk_since < ? LIMIT ?)",
+                (cutoff, limit)
+            )
+            pruned = cursor.rowcount
+        if pruned:
+            privilege_registry.load()
+        return pruned
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error expiring AFK entries: {e}", exc_info=True)
+        return 0
+
+def prune_warnings_before(cutoff: int, limit: int = 500) -> int:
+    try:
+        with write_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM warnings WHERE id IN (SELECT id FROM warnings WHERE warned_at < ? LIMIT ?)",
+                (cutoff, limit)
+            )
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error expiring old warnings: {e}", exc_info=True)
+        return 0
+
+def get_freelist_count() -> int:
+    try:
+        with read_connection() as conn:
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+def incremental_vacuum(pages: int) -> int:
+    """Returns up to `pages` free pages to the OS. Returns the number of free pages left."""
+    try:
+        with write_connection() as conn:
+            conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error during incremental vacuum: {e}", exc_info=True)
+        return 0
+
+def optimize_database() -> None:
+    try:
+        with write_connection() as conn:
+            conn.execute("PRAGMA analysis_limit = 1000")
+            conn.execute("PRAGMA optimize")
+            if get_backend().persistent:
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"SQLite error optimizing database: {e}", exc_info=True)
+
+def get_auto_vacuum_mode() -> int | None:
+    """0 = none, 1 = full, 2 = incremental; None on error."""
+    try:
+        with read_connection() as conn:
+            return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    except sqlite3.Error:
+        return None
+
+def enable_incremental_auto_vacuum() -> bool:
+    """
+    Switches an existing database to incremental auto_vacuum, which takes a
+    full VACUUM holding an exclusive lock for as long as it runs. Returns False
+    when it is already on. Raises sqlite3.Error.
+    """
+    with write_connection() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        logger.info("Switching database to incremental auto_vacuum (full VACUUM)...")
+        conn.commit()
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    return True
@@ -2,24 +2,18 @@ from functools import wraps
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from .database import is_command_disabled_in_chat, is_module_disabled
-from ..config import OWNER_ID
 from .utils import _can_user_perform_action
+from .update_context import get_update_context
 
 def check_module_enabled(module_name: str):
+    """
+    Tags a handler with the module it belongs to. Disabled modules have their
+    handlers removed from the application (see core/module_toggle.py), so
+    nothing is checked when the handler runs.
+    """
     def decorator(func):
-        @wraps(func)
-        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-            user = update.effective_user
-            
-            if user and user.id == OWNER_ID:
-                return await func(update, context, *args, **kwargs)
-
-            if is_module_disabled(module_name):
-                return
-
-            return await func(update, context, *args, **kwargs)
-        return wrapper
+        setattr(func, '_module_name', module_name)
+        return func
     return decorator
 
 def command_control(command_name: str):
@@ -29,12 +23,12 @@ def command_control(command_name: str):
         
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-            chat = update.effective_chat
+            update_ctx = await get_update_context(update, context)
 
-            if not chat or chat.type not in ["group", "supergroup"]:
+            if not update_ctx.is_group:
                 return await func(update, context, *args, **kwargs)
 
-            if is_command_disabled_in_chat(chat.id, command_name):
+            if update_ctx.is_command_disabled(command_name):
                 
                 is_admin = await _can_user_perform_action(
                     update, 
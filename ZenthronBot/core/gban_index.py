@@ -0,0 +1,211 @@
+import bisect
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+from array import array
+
+from ..config import DB_BACKEND, GBAN_INDEX_PATH, GBAN_BLOOM_ENABLED
+from .connection import read_connection
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"ZGBANIX1"
+_HEADER = struct.Struct("=8sqqq")
+_COMPACT_THRESHOLD = 1024
+_BLOOM_BITS_PER_ITEM = 10
+_BLOOM_HASHES = 7
+_MASK64 = (1 << 64) - 1
+
+
+# --- BLOOM FILTER ---
+def _mix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+class BloomFilter:
+    def __init__(self, expected_items: int):
+        self.size = max(64, expected_items * _BLOOM_BITS_PER_ITEM)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: int):
+        h = _mix64(value)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for i in range(_BLOOM_HASHES):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, value: int) -> None:
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, value: int) -> bool:
+        bits = self.bits
+        for pos in self._positions(value):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+# --- GLOBAL BAN INDEX ---
+class _IndexState:
+    __slots__ = ("ids", "added", "removed", "bloom")
+
+    def __init__(self, ids, added: set[int], removed: set[int], bloom: BloomFilter | None):
+        self.ids = ids
+        self.added = added
+        self.removed = removed
+        self.bloom = bloom
+
+class GbanIndex:
+    """
+    Membership index for global bans. The bulk of the IDs lives in a sorted
+    int64 file that is memory-mapped and binary searched; bans added or lifted
+    since the last compaction are kept in two small in-memory sets. Without a
+    path the sorted IDs are only kept in memory.
+    """
+
+    def __init__(self, path: str | None, use_bloom: bool):
+        self.path = path
+        self.use_bloom = use_bloom
+        self._lock = threading.Lock()
+        self._state = _IndexState(memoryview(array("q")), set(), set(), None)
+        self._loaded = False
+
+    def _db_summary(self) -> tuple[int, int, int]:
+        with read_connection() as conn:
+            count, min_id, max_id = conn.execute(
+                "SELECT COUNT(*), MIN(user_id), MAX(user_id) FROM global_bans"
+            ).fetchone()
+        return count, min_id or 0, max_id or 0
+
+    def _open_file(self) -> memoryview | None:
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < _HEADER.size:
+                    return None
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+
+        magic, count, _, _ = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or size != _HEADER.size + count * 8:
+            mm.close()
+            return None
+        return memoryview(mm)[_HEADER.size:].cast("q")
+
+    def _write_file(self, ids: array) -> memoryview:
+        if self.path is None:
+            return memoryview(ids)
+        tmp_path = f"{self.path}.tmp"
+        header = _HEADER.pack(_MAGIC, len(ids), ids[0] if ids else 0, ids[-1] if ids else 0)
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(ids.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        mapped = self._open_file()
+        return mapped if mapped is not None else memoryview(ids)
+
+    def _build_bloom(self, ids, added: set[int]) -> BloomFilter | None:
+        if not self.use_bloom:
+            return None
+        bloom = BloomFilter(len(ids) + len(added) + _COMPACT_THRESHOLD)
+        for user_id in ids:
+            bloom.add(user_id)
+        for user_id in added:
+            bloom.add(user_id)
+        return bloom
+
+    def load(self) -> None:
+        try:
+            count, min_id, max_id = self._db_summary()
+        except sqlite3.Error as e:
+            logger.error(f"Could not read global bans for the gban index: {e}", exc_info=True)
+            return
+
+        ids = self._open_file()
+        if ids is not None and len(ids) == count and (count == 0 or (ids[0] == min_id and ids[-1] == max_id)):
+            with self._lock:
+                self._state = _IndexState(ids, set(), set(), self._build_bloom(ids, set()))
+                self._loaded = True
+            logger.info(f"Gban index loaded from '{self.path}' with {count} entries.")
+            return
+
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        try:
+            with read_connection() as conn:
+                ids = array("q", (row[0] for row in conn.execute("SELECT user_id FROM global_bans ORDER BY user_id")))
+        except sqlite3.Error as e:
+            logger.error(f"Could not rebuild gban index: {e}", exc_info=True)
+            return
+
+        with self._lock:
+            mapped = self._write_file(ids)
+            self._state = _IndexState(mapped, set(), set(), self._build_bloom(mapped, set()))
+            self._loaded = True
+        logger.info(f"Gban index rebuilt with {len(ids)} entries.")
+
+    def _compact(self) -> None:
+        state = self._state
+        merged = (set(state.ids) - state.removed) | state.added
+        ids = array("q", sorted(merged))
+        mapped = self._write_file(ids)
+        self._state = _IndexState(mapped, set(), set(), self._build_bloom(mapped, set()))
+        logger.info(f"Gban index compacted to {len(ids)} entries.")
+
+    def _in_base(self, ids, user_id: int) -> bool:
+        pos = bisect.bisect_left(ids, user_id)
+        return pos < len(ids) and ids[pos] == user_id
+
+    def __contains__(self, user_id: int) -> bool:
+        if not self._loaded:
+            self.load()
+        state = self._state
+        if state.bloom is not None and not state.bloom.might_contain(user_id):
+            return False
+        if user_id in state.removed:
+            return False
+        if user_id in state.added:
+            return True
+        return self._in_base(state.ids, user_id)
+
+    def add(self, user_id: int) -> None:
+        self.add_many((user_id,))
+
+    def add_many(self, user_ids) -> None:
+        with self._lock:
+            state = self._state
+            for user_id in user_ids:
+                state.removed.discard(user_id)
+                if not self._in_base(state.ids, user_id):
+                    state.added.add(user_id)
+                if state.bloom is not None:
+                    state.bloom.add(user_id)
+            if len(state.added) + len(state.removed) >= _COMPACT_THRESHOLD:
+                self._compact()
+
+    def remove(self, user_id: int) -> None:
+        with self._lock:
+            state = self._state
+            state.added.discard(user_id)
+            if self._in_base(state.ids, user_id):
+                state.removed.add(user_id)
+            if len(state.added) + len(state.removed) >= _COMPACT_THRESHOLD:
+                self._compact()
+
+    def __len__(self) -> int:
+        state = self._state
+        return len(state.ids) - len(state.removed) + len(state.added)
+
+
+gban_index = GbanIndex(None if DB_BACKEND == "memory" else GBAN_INDEX_PATH, GBAN_BLOOM_ENABLED)
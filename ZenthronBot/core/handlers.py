@@ -1,8 +1,11 @@
 from telegram import Update
 from telegram.ext import MessageHandler, ContextTypes, filters
 
+# Every command of every module, keyed by lowercase name and alias. command_router
+# serves '/', '!' and '?' commands from this one dict.
 CUSTOM_COMMANDS = {}
-PREFIXES = ['!', '?'] 
+PREFIXES = ['/', '!', '?']
+_PREFIX_CHARS = frozenset(PREFIXES)
 
 def custom_handler(name: str | list[str]):
     def decorator(func):
@@ -14,28 +17,36 @@ def custom_handler(name: str | list[str]):
         return func
     return decorator
 
+def parse_command(text: str, bot_username: str | None) -> tuple[str, list[str]] | None:
+    """
+    Splits '/cmd@botname arg1 arg2' (or '!cmd', '?cmd') into the lowercase
+    command name and its arguments. Returns None for plain text and for
+    commands addressed to a different bot. The command must follow the prefix
+    directly, so '/ ban' or '! kick' in normal text is not a command.
+    """
+    if len(text) < 2 or text[0] not in _PREFIX_CHARS or text[1].isspace():
+        return None
+
+    command_parts = text[1:].split()
+    command, _, target = command_parts[0].partition('@')
+    if not command:
+        return None
+    if target and (not bot_username or target.lower() != bot_username.lower()):
+        return None
+    return command.lower(), command_parts[1:]
+
 async def command_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
     message = update.effective_message
     if not message or not message.text: return
 
-    text = message.text
-    
-    used_prefix = None
-    for p in PREFIXES:
-        if text.startswith(p):
-            used_prefix = p
-            break
-    
-    if not used_prefix: return
-
-    command_parts = text[len(used_prefix):].split()
-    if not command_parts: return
-
-    command = command_parts[0].lower()
-    
-    if command in CUSTOM_COMMANDS:
-        context.args = command_parts[1:]
-        await CUSTOM_COMMANDS[command](update, context)
-        
+    parsed = parse_command(message.text, context.bot.username)
+    if not parsed: return
+
+    command, args = parsed
+    callback = CUSTOM_COMMANDS.get(command)
+    if callback is not None:
+        context.args = args
+        await callback(update, context)
+
 def get_custom_command_handler():
-    return MessageHandler(filters.TEXT & (~filters.COMMAND), command_router)
+    return MessageHandler(filters.TEXT & filters.UpdateType.MESSAGES, command_router)
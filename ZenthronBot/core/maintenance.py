@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+
+from telegram.ext import ContextTypes
+
+from ..config import (
+    OWNER_ID, USER_RETENTION_DAYS, AFK_RETENTION_DAYS, WARN_RETENTION_DAYS,
+    MAINTENANCE_BATCH_SIZE, VACUUM_PAGES_PER_STEP
+)
+from .database import (
+    prune_inactive_users, prune_afk_before, prune_warnings_before,
+    get_freelist_count, incremental_vacuum, optimize_database, reconcile_stats_counters
+)
+from .async_database import run_read, run_write
+from .user_buffer import user_write_buffer
+
+logger = logging.getLogger(__name__)
+
+# Pause between batches so queued handler writes get the writer thread in between.
+_STEP_PAUSE = 0.05
+_DAY = 86400
+
+
+# --- RETENTION AND COMPACTION ---
+async def _prune_in_batches(prune, *args) -> int:
+    total = 0
+    while True:
+        deleted = await run_write(prune, *args, limit=MAINTENANCE_BATCH_SIZE)
+        total += deleted
+        if deleted < MAINTENANCE_BATCH_SIZE:
+            return total
+        await asyncio.sleep(_STEP_PAUSE)
+
+async def _vacuum_in_steps() -> tuple[int, int]:
+    free_pages = await run_read(get_freelist_count)
+    released = 0
+    while free_pages > 0:
+        remaining = await run_write(incremental_vacuum, VACUUM_PAGES_PER_STEP)
+        if remaining >= free_pages:
+            break
+        released += free_pages - remaining
+        free_pages = remaining
+        await asyncio.sleep(_STEP_PAUSE)
+    return released, free_pages
+
+async def run_maintenance() -> dict:
+    """Prunes stale rows, then refreshes planner statistics and returns free pages to the OS."""
+    started_at = time.perf_counter()
+    now = int(time.time())
+    summary = {"users": 0, "afk": 0, "warnings": 0}
+
+    if USER_RETENTION_DAYS > 0:
+        summary["users"] = await _prune_in_batches(
+            prune_inactive_users, now - USER_RETENTION_DAYS * _DAY, (OWNER_ID,) if OWNER_ID else ()
+        )
+        if summary["users"]:
+            # Pruned users are not known here one by one; let every profile be written again.
+            user_write_buffer.forget_all()
+    if AFK_RETENTION_DAYS > 0:
+        summary["afk"] = await _prune_in_batches(prune_afk_before, now - AFK_RETENTION_DAYS * _DAY)
+    if WARN_RETENTION_DAYS > 0:
+        summary["warnings"] = await _prune_in_batches(prune_warnings_before, now - WARN_RETENTION_DAYS * _DAY)
+
+    await run_write(optimize_database)
+    summary["vacuumed_pages"], summary["free_pages"] = await _vacuum_in_steps()
+    summary["duration"] = time.perf_counter() - started_at
+
+    logger.info(
+        f"Database maintenance done in {summary['duration']:.2f}s: removed {summary['users']} users, "
+        f"{summary['afk']} AFK entries, {summary['warnings']} warnings; released {summary['vacuumed_pages']} pages."
+    )
+    return summary
+
+async def maintenance_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    try:
+        await run_maintenance()
+    except Exception as e:
+        logger.error(f"Database maintenance failed: {e}", exc_info=True)
+
+
+# --- STATS COUNTER RECONCILIATION ---
+async def reconcile_stats_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    drift = await run_write(reconcile_stats_counters)
+    if drift:
+        logger.warning(f"Corrected drifted stats counters: {drift}")
+    else:
+        logger.info("Stats counters are consistent.")
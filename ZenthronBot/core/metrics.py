@@ -0,0 +1,338 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable
+
+from telegram.ext import ApplicationHandlerStop
+from telegram.request import BaseRequest, RequestData
+
+from .tracing import add_span
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency buckets, in seconds (Prometheus' defaults plus a 1 ms bucket).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# --- HISTOGRAMS ---
+class Histogram:
+    """Fixed-bucket latency histogram; percentiles are interpolated within a bucket."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.max
+
+class _Series:
+    __slots__ = ("histogram", "errors", "api_seconds", "db_seconds")
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.errors = 0
+        self.api_seconds = 0.0
+        self.db_seconds = 0.0
+
+    def summary(self) -> dict:
+        calls = self.histogram.count
+        return {
+            "calls": calls,
+            "errors": self.errors,
+            "avg_ms": self.histogram.sum / calls * 1000 if calls else 0.0,
+            "p50_ms": self.histogram.percentile(0.50) * 1000,
+            "p95_ms": self.histogram.percentile(0.95) * 1000,
+            "p99_ms": self.histogram.percentile(0.99) * 1000,
+            "max_ms": self.histogram.max * 1000,
+            "api_ms": self.api_seconds * 1000,
+            "db_ms": self.db_seconds * 1000,
+        }
+
+
+# --- TIME ATTRIBUTION ---
+class _Charges:
+    """
+    Telegram API and database time spent while one handler is running, and
+    the time of the handlers it dispatched itself (commands in command_router).
+    """
+
+    __slots__ = ("api", "db", "nested")
+
+    def __init__(self):
+        self.api = 0.0
+        self.db = 0.0
+        self.nested = 0.0
+
+_current_charges: contextvars.ContextVar[_Charges | None] = contextvars.ContextVar("handler_charges", default=None)
+
+def charge_api_time(seconds: float) -> None:
+    charges = _current_charges.get()
+    if charges is not None:
+        charges.api += seconds
+
+def charge_db_time(seconds: float) -> None:
+    charges = _current_charges.get()
+    if charges is not None:
+        charges.db += seconds
+
+
+# --- REGISTRY ---
+class Metrics:
+    """
+    Latency, call and error counts for the whole dispatch of an update, for
+    every handler (labelled with its group) and for every Bot API method.
+    Handler series also carry the API and database time spent inside them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.updates = _Series()
+        self.handlers: dict[tuple[int, str], _Series] = {}
+        self.api: dict[str, _Series] = {}
+        self.started_at = time.time()
+
+    def record_update(self, seconds: float) -> None:
+        with self._lock:
+            self.updates.histogram.observe(seconds)
+
+    def record_handler(self, group: int, name: str, seconds: float, charges: _Charges, failed: bool) -> None:
+        with self._lock:
+            series = self.handlers.get((group, name))
+            if series is None:
+                series = self.handlers[(group, name)] = _Series()
+            series.histogram.observe(seconds)
+            series.api_seconds += charges.api
+            series.db_seconds += charges.db
+            if failed:
+                series.errors += 1
+
+    def record_api(self, method: str, seconds: float, failed: bool) -> None:
+        with self._lock:
+            series = self.api.get(method)
+            if series is None:
+                series = self.api[method] = _Series()
+            series.histogram.observe(seconds)
+            if failed:
+                series.errors += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.updates = _Series()
+            self.handlers.clear()
+            self.api.clear()
+            self.started_at = time.time()
+
+    def top_handlers(self, limit: int = 10, order_by: str = "p95") -> list[dict]:
+        """Per-handler summaries sorted by 'p95', 'p99', 'total', 'calls' or 'errors' (descending)."""
+        with self._lock:
+            summaries = [{"group": group, "handler": name, **series.summary()} for (group, name), series in self.handlers.items()]
+        for item in summaries:
+            item["total_ms"] = item["avg_ms"] * item["calls"]
+        sort_key = {"p95": "p95_ms", "p99": "p99_ms", "total": "total_ms", "calls": "calls", "errors": "errors"}.get(order_by, "p95_ms")
+        summaries.sort(key=lambda item: item[sort_key], reverse=True)
+        return summaries[:limit]
+
+    def top_api_methods(self, limit: int = 10) -> list[dict]:
+        with self._lock:
+            summaries = [{"method": method, **series.summary()} for method, series in self.api.items()]
+        summaries.sort(key=lambda item: item["avg_ms"] * item["calls"], reverse=True)
+        return summaries[:limit]
+
+    def update_summary(self) -> dict:
+        with self._lock:
+            return self.updates.summary()
+
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            _render_histogram(lines, "zenthron_update_duration_seconds", "Time to run every handler group for one update.", [({}, self.updates)])
+
+            handler_series = [({"group": str(group), "handler": name}, series) for (group, name), series in sorted(self.handlers.items())]
+            _render_histogram(lines, "zenthron_handler_duration_seconds", "Handler callback latency.", handler_series)
+            _render_counter(lines, "zenthron_handler_errors_total", "Handler callbacks that raised.", [(labels, s.errors) for labels, s in handler_series])
+            _render_counter(lines, "zenthron_handler_api_seconds_total", "Telegram API time spent inside handlers.", [(labels, s.api_seconds) for labels, s in handler_series])
+            _render_counter(lines, "zenthron_handler_db_seconds_total", "Database time spent inside handlers.", [(labels, s.db_seconds) for labels, s in handler_series])
+
+            api_series = [({"method": method}, series) for method, series in sorted(self.api.items())]
+            _render_histogram(lines, "zenthron_api_request_duration_seconds", "Telegram Bot API request latency.", api_series)
+            _render_counter(lines, "zenthron_api_request_errors_total", "Telegram Bot API requests that failed.", [(labels, s.errors) for labels, s in api_series])
+        return "\n".join(lines) + "\n"
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+def _render_histogram(lines: list[str], name: str, help_text: str, series: list[tuple[dict, _Series]]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, item in series:
+        cumulative = 0
+        for bound, bucket_count in zip((*LATENCY_BUCKETS, "+Inf"), item.histogram.counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': str(bound)})} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {item.histogram.sum:.6f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {item.histogram.count}")
+
+def _render_counter(lines: list[str], name: str, help_text: str, values: list[tuple[dict, float]]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    for labels, value in values:
+        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+
+metrics = Metrics()
+
+
+# --- INSTRUMENTATION ---
+def _handler_name(callback) -> str:
+    module = getattr(callback, "__module__", "") or ""
+    return f"{module.removeprefix('ZenthronBot.').removeprefix('modules.')}.{getattr(callback, '__qualname__', repr(callback))}"
+
+def _timed_callback(group: int, callback):
+    name = _handler_name(callback)
+
+    @functools.wraps(callback)
+    async def wrapper(update, context):
+        charges = _Charges()
+        token = _current_charges.set(charges)
+        failed = False
+        started_at = time.perf_counter()
+        try:
+            return await callback(update, context)
+        except ApplicationHandlerStop:
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            seconds = time.perf_counter() - started_at
+            # command_router is charged only for its own dispatch overhead; the
+            # commands it runs are recorded under their own names.
+            metrics.record_handler(group, name, seconds - charges.nested, charges, failed)
+            add_span("handler", f"[{group}] {name}", seconds, failed)
+            _current_charges.reset(token)
+            parent = _current_charges.get()
+            if parent is not None:
+                parent.nested += seconds
+
+    wrapper._metrics_wrapped = True
+    return wrapper
+
+def instrument_handlers(application) -> int:
+    """Wraps the callback of every registered handler with a timer. Returns the number of handlers wrapped."""
+    wrapped = 0
+    for group, handlers in application.handlers.items():
+        for handler in handlers:
+            callback = getattr(handler, "callback", None)
+            if callback is None or getattr(callback, "_metrics_wrapped", False) or not asyncio.iscoroutinefunction(callback):
+                continue
+            handler.callback = _timed_callback(group, callback)
+            wrapped += 1
+    return wrapped
+
+def instrument_commands(commands: dict, group: int) -> None:
+    """Wraps the command callbacks dispatched by command_router; aliases share one timer."""
+    wrappers = {}
+    for command, callback in commands.items():
+        if getattr(callback, "_metrics_wrapped", False):
+            continue
+        if id(callback) not in wrappers:
+            wrappers[id(callback)] = _timed_callback(group, callback)
+        commands[command] = wrappers[id(callback)]
+
+async def observe_update(coroutine: Awaitable[Any]) -> None:
+    started_at = time.perf_counter()
+    try:
+        await coroutine
+    finally:
+        metrics.record_update(time.perf_counter() - started_at)
+
+class InstrumentedRequest(BaseRequest):
+    """Wraps the bot's request object to time every Bot API call per method."""
+
+    def __init__(self, inner: BaseRequest):
+        self.inner = inner
+
+    @property
+    def read_timeout(self) -> float | None:
+        return self.inner.read_timeout
+
+    async def initialize(self) -> None:
+        await self.inner.initialize()
+
+    async def shutdown(self) -> None:
+        await self.inner.shutdown()
+
+    async def do_request(self, url: str, method: str, request_data: RequestData | None = None,
+                         read_timeout=BaseRequest.DEFAULT_NONE, write_timeout=BaseRequest.DEFAULT_NONE,
+                         connect_timeout=BaseRequest.DEFAULT_NONE, pool_timeout=BaseRequest.DEFAULT_NONE) -> tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        failed = True
+        started_at = time.perf_counter()
+        try:
+            status, payload = await self.inner.do_request(
+                url, method, request_data=request_data, read_timeout=read_timeout,
+                write_timeout=write_timeout, connect_timeout=connect_timeout, pool_timeout=pool_timeout
+            )
+            failed = status >= 400
+            return status, payload
+        finally:
+            seconds = time.perf_counter() - started_at
+            metrics.record_api(api_method, seconds, failed)
+            charge_api_time(seconds)
+            add_span("api", api_method, seconds, failed)
+
+
+# --- PROMETHEUS ENDPOINT ---
+async def _serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body = "200 OK", metrics.render_prometheus().encode()
+        else:
+            status, body = "404 Not Found", b"Not found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError) as e:
+        logger.debug(f"Metrics request aborted: {e}")
+    finally:
+        writer.close()
+
+async def start_metrics_server(host: str, port: int) -> asyncio.AbstractServer:
+    server = await asyncio.start_server(_serve_metrics, host, port)
+    logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics.")
+    return server
@@ -0,0 +1,202 @@
+import logging
+import re
+import sqlite3
+from typing import Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+# --- SCHEMA HELPERS ---
+def table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+def add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> bool:
+    """Adds a column unless the table already has it. Returns True if it was added."""
+    if column in table_columns(conn, table):
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    logger.info(f"Added column {table}.{column}.")
+    return True
+
+def column_type(conn: sqlite3.Connection, table: str, column: str) -> str | None:
+    for row in conn.execute(f"PRAGMA table_info({table})"):
+        if row[1] == column:
+            return row[2].upper()
+    return None
+
+def convert_columns_to_epoch(conn: sqlite3.Connection, table: str, columns: list[str]) -> bool:
+    """
+    Rebuilds a table so the given ISO-8601 TEXT columns become INTEGER epoch
+    seconds. SQLite cannot change a column's type in place, so the table is
+    copied into a new one and renamed back; its indexes and triggers are recreated.
+    """
+    columns = [c for c in columns if column_type(conn, table, c) not in (None, "INTEGER")]
+    if not columns:
+        return False
+
+    table_sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()[0]
+    dependent_sqls = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL", (table,)
+    )]
+
+    new_sql = re.sub(rf"^(\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?){table}\b", rf"\g<1>{table}_new", table_sql, flags=re.I)
+    for column in columns:
+        new_sql = re.sub(rf"\b{column}\s+TEXT\b", f"{column} INTEGER", new_sql, flags=re.I)
+
+    all_columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    select_exprs = []
+    for column in all_columns:
+        if column in columns:
+            select_exprs.append(
+                f"CASE WHEN typeof({column}) = 'integer' THEN {column} "
+                f"ELSE COALESCE(CAST(strftime('%s', {column}) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER)) END"
+            )
+        else:
+            select_exprs.append(column)
+
+    conn.execute(new_sql)
+    conn.execute(f"INSERT INTO {table}_new ({', '.join(all_columns)}) SELECT {', '.join(select_exprs)} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    for dependent_sql in dependent_sqls:
+        conn.execute(dependent_sql)
+    logger.info(f"Converted {table}.{', '.join(columns)} to epoch seconds.")
+    return True
+
+
+# --- MIGRATION STEPS ---
+def _backfill_chat_columns(conn: sqlite3.Connection) -> None:
+    # Databases created by older releases predate some of these columns.
+    add_column(conn, "bot_chats", "enforce_gban", "INTEGER DEFAULT 1 NOT NULL")
+    add_column(conn, "bot_chats", "welcome_enabled", "INTEGER DEFAULT 1 NOT NULL")
+    add_column(conn, "bot_chats", "custom_welcome", "TEXT")
+    add_column(conn, "bot_chats", "goodbye_enabled", "INTEGER DEFAULT 1 NOT NULL")
+    add_column(conn, "bot_chats", "custom_goodbye", "TEXT")
+    add_column(conn, "bot_chats", "clean_service_messages", "INTEGER DEFAULT 0 NOT NULL")
+    add_column(conn, "bot_chats", "warn_limit", "INTEGER")
+    add_column(conn, "bot_chats", "rules_text", "TEXT")
+    add_column(conn, "chat_filters", "filter_type", "TEXT NOT NULL DEFAULT 'keyword'")
+    add_column(conn, "chat_filters", "buttons", "TEXT")
+
+def _index_warnings_by_chat_user(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_warnings_chat_user ON warnings (chat_id, user_id)")
+
+def _index_username_nocase(conn: sqlite3.Connection) -> None:
+    conn.execute("DROP INDEX IF EXISTS idx_username")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_username_nocase ON users (username COLLATE NOCASE)")
+
+EPOCH_COLUMNS = {
+    "users": ["last_seen"],
+    "blacklist": ["timestamp"],
+    "whitelist_users": ["timestamp"],
+    "support_users": ["timestamp"],
+    "sudo_users": ["timestamp"],
+    "dev_users": ["timestamp"],
+    "global_bans": ["timestamp"],
+    "bot_chats": ["added_at"],
+    "notes": ["created_at"],
+    "warnings": ["warned_at"],
+    "afk_users": ["afk_since"],
+    "chat_blacklist": ["timestamp"],
+}
+
+def _epoch_timestamps(conn: sqlite3.Connection) -> None:
+    for table, columns in EPOCH_COLUMNS.items():
+        convert_columns_to_epoch(conn, table, columns)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_last_seen ON users (last_seen)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_warnings_warned_at ON warnings (warned_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_afk_users_afk_since ON afk_users (afk_since)")
+
+# Tables whose row counts are kept in stats_counters by triggers.
+COUNTED_TABLES = (
+    "users", "blacklist", "dev_users", "sudo_users", "support_users",
+    "whitelist_users", "chat_blacklist", "global_bans", "bot_chats",
+)
+
+def _stats_counters(conn: sqlite3.Connection) -> None:
+    # REPLACE only fires the delete triggers with recursive_triggers on, which the write connection enables.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    for table in COUNTED_TABLES:
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_insert AFTER INSERT ON {table}
+            BEGIN
+                UPDATE stats_counters SET value = value + 1 WHERE name = '{table}';
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE stats_counters SET value = value - 1 WHERE name = '{table}';
+            END
+        """)
+        conn.execute(
+            f"INSERT OR REPLACE INTO stats_counters (name, value) SELECT '{table}', COUNT(*) FROM {table}"
+        )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "backfill bot_chats and chat_filters columns", _backfill_chat_columns),
+    Migration(2, "index warnings by chat and user", _index_warnings_by_chat_user),
+    Migration(3, "case-insensitive username index", _index_username_nocase),
+    Migration(4, "integer epoch timestamps", _epoch_timestamps),
+    Migration(5, "trigger-maintained table counters", _stats_counters),
+]
+
+
+# --- RUNNER ---
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at INTEGER NOT NULL
+        )
+    """)
+    # Older databases stored applied_at as ISO text; convert it before any migration adds a row.
+    convert_columns_to_epoch(conn, "schema_version", ["applied_at"])
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Applies every migration newer than the stored schema version, in order.
+    Each step runs in its own savepoint together with its schema_version row,
+    so a failing step leaves the database at the previous version.
+    """
+    from .database import _now  # database.py imports this module, so not at the top
+
+    current = get_schema_version(conn)
+    pending = [m for m in MIGRATIONS if m.version > current]
+    if not pending:
+        return current
+
+    for migration in pending:
+        conn.execute("SAVEPOINT migration")
+        try:
+            migration.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.name, _now())
+            )
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO migration")
+            conn.execute("RELEASE migration")
+            logger.error(f"Schema migration {migration.version} ({migration.name}) failed.")
+            raise
+        conn.execute("RELEASE migration")
+        current = migration.version
+        logger.info(f"Applied schema migration {migration.version}: {migration.name}.")
+
+    return current
@@ -0,0 +1,88 @@
+import logging
+import math
+
+from telegram.ext import Application, BaseHandler
+
+from .handlers import CUSTOM_COMMANDS
+
+logger = logging.getLogger(__name__)
+
+
+def owning_module(callback) -> str | None:
+    """
+    Module a callback was gated to with check_module_enabled, or None. Untagged
+    callbacks (menu buttons, logging, core) stay registered whatever is disabled.
+    """
+    return getattr(callback, "_module_name", None) or None
+
+
+# --- MODULE SWITCHING ---
+class ModuleToggle:
+    """
+    Disables a module by taking its handlers and prefix commands out of the
+    application, and puts them back on enable. Nothing is checked per update,
+    so enabled modules pay nothing for this feature.
+    """
+
+    def __init__(self):
+        self._order: dict[BaseHandler, int] = {}
+        self._parked_handlers: dict[str, list[tuple[BaseHandler, int]]] = {}
+        self._parked_commands: dict[str, dict[str, object]] = {}
+
+    def is_disabled(self, module_name: str) -> bool:
+        return module_name in self._parked_handlers
+
+    def disabled_modules(self) -> list[str]:
+        return sorted(self._parked_handlers)
+
+    def snapshot_order(self, application: Application) -> None:
+        """Remembers where every handler sits so re-enabled ones go back to the same place."""
+        position = 0
+        for group in sorted(application.handlers):
+            for handler in application.handlers[group]:
+                self._order[handler] = position
+                position += 1
+
+    def disable(self, application: Application, module_name: str) -> bool:
+        if self.is_disabled(module_name):
+            return False
+
+        parked_handlers = []
+        for group, handlers in list(application.handlers.items()):
+            for handler in list(handlers):
+                if owning_module(handler.callback) == module_name:
+                    application.remove_handler(handler, group)
+                    parked_handlers.append((handler, group))
+
+        parked_commands = {
+            name: func for name, func in CUSTOM_COMMANDS.items() if owning_module(func) == module_name
+        }
+        for name in parked_commands:
+            del CUSTOM_COMMANDS[name]
+
+        self._parked_handlers[module_name] = parked_handlers
+        self._parked_commands[module_name] = parked_commands
+        logger.info(
+            f"Module '{module_name}' disabled: removed {len(parked_handlers)} handlers "
+            f"and {len(parked_commands)} prefix commands."
+        )
+        return True
+
+    def enable(self, application: Application, module_name: str) -> bool:
+        if not self.is_disabled(module_name):
+            return False
+
+        touched_groups = set()
+        for handler, group in self._parked_handlers.pop(module_name):
+            application.add_handler(handler, group)
+            touched_groups.add(group)
+        for group in touched_groups:
+            # Within a group the first matching handler wins, so restore the original order.
+            application.handlers[group].sort(key=lambda h: self._order.get(h, math.inf))
+
+        CUSTOM_COMMANDS.update(self._parked_commands.pop(module_name))
+        logger.info(f"Module '{module_name}' enabled.")
+        return True
+
+
+module_toggle = ModuleToggle()
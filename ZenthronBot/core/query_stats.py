@@ -0,0 +1,227 @@
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from ..config import DB_SLOW_QUERY_MS
+from .metrics import charge_db_time
+from .tracing import add_span
+
+logger = logging.getLogger(__name__)
+
+_SAMPLES_PER_STATEMENT = 512
+_SPAN_SQL_LENGTH = 200
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Collapses whitespace and variable-length '(?, ?, ...)' lists so equivalent statements share one entry."""
+    return _IN_LIST.sub("(?+)", " ".join(sql.split()))
+
+
+# --- PER-STATEMENT STATISTICS ---
+class _StatementStats:
+    __slots__ = ("calls", "errors", "rows", "affected", "total", "max", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.affected = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: deque[float] = deque(maxlen=_SAMPLES_PER_STATEMENT)
+
+class QueryStats:
+    """
+    Aggregates timings of every statement executed through an
+    InstrumentedConnection. Execute time is recorded per call, with the rows
+    an INSERT/UPDATE/DELETE affected; time spent fetching rows is added to the
+    statement's total and to the rows it returned.
+    """
+
+    def __init__(self, slow_query_ms: float):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self._lock = threading.Lock()
+        self._stats: dict[str, _StatementStats] = {}
+        self.started_at = time.time()
+
+    def _get(self, key: str) -> _StatementStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats.setdefault(key, _StatementStats())
+        return stats
+
+    def record_execute(self, sql: str, seconds: float, affected: int = 0, failed: bool = False) -> None:
+        charge_db_time(seconds)
+        key = normalize_sql(sql)
+        add_span("db", key[:_SPAN_SQL_LENGTH], seconds, failed)
+        with self._lock:
+            stats = self._get(key)
+            stats.calls += 1
+            stats.affected += affected
+            stats.total += seconds
+            stats.samples.append(seconds)
+            if seconds > stats.max:
+                stats.max = seconds
+            if failed:
+                stats.errors += 1
+        if seconds >= self.slow_query_seconds:
+            logger.warning(f"Slow query ({seconds * 1000:.1f} ms): {key}")
+
+    def record_fetch(self, sql: str, seconds: float, rows: int) -> None:
+        charge_db_time(seconds)
+        key = normalize_sql(sql)
+        add_span("db", f"fetch {key[:_SPAN_SQL_LENGTH]}", seconds)
+        with self._lock:
+            stats = self._get(key)
+            stats.rows += rows
+            stats.total += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+    def top(self, limit: int = 10, order_by: str = "total") -> list[dict]:
+        """Returns per-statement summaries sorted by 'total', 'calls', 'avg' or 'p95' (descending)."""
+        with self._lock:
+            items = [(sql, s.calls, s.errors, s.rows, s.affected, s.total, s.max, sorted(s.samples)) for sql, s in self._stats.items()]
+
+        summaries = []
+        for sql, calls, errors, rows, affected, total, max_seconds, samples in items:
+            summaries.append({
+                "sql": sql,
+                "calls": calls,
+                "errors": errors,
+                "rows": rows,
+                "affected": affected,
+                "total_ms": total * 1000,
+                "avg_ms": total / calls * 1000 if calls else 0.0,
+                "p50_ms": _percentile(samples, 0.50) * 1000,
+                "p95_ms": _percentile(samples, 0.95) * 1000,
+                "p99_ms": _percentile(samples, 0.99) * 1000,
+                "max_ms": max_seconds * 1000,
+            })
+        sort_key = {"total": "total_ms", "calls": "calls", "avg": "avg_ms", "p95": "p95_ms"}.get(order_by, "total_ms")
+        summaries.sort(key=lambda item: item[sort_key], reverse=True)
+        return summaries[:limit]
+
+def _percentile(sorted_samples: list[float], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+query_stats = QueryStats(DB_SLOW_QUERY_MS)
+
+
+# --- INSTRUMENTED CONNECTION ---
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Rows read by iterating the cursor are summed up locally and recorded once
+    the iteration ends or the cursor is reused, not on every row.
+    """
+
+    _last_sql = ""
+    _iter_rows = 0
+    _iter_seconds = 0.0
+
+    def _flush_iteration(self) -> None:
+        if self._iter_rows or self._iter_seconds:
+            query_stats.record_fetch(self._last_sql, self._iter_seconds, self._iter_rows)
+            self._iter_rows = 0
+            self._iter_seconds = 0.0
+
+    def execute(self, sql, parameters=()):
+        self._flush_iteration()
+        self._last_sql = sql
+        started_at = time.perf_counter()
+        try:
+            result = super().execute(sql, parameters)
+        except sqlite3.Error:
+            query_stats.record_execute(sql, time.perf_counter() - started_at, failed=True)
+            raise
+        query_stats.record_execute(sql, time.perf_counter() - started_at, max(self.rowcount, 0))
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        self._flush_iteration()
+        self._last_sql = sql
+        started_at = time.perf_counter()
+        try:
+            result = super().executemany(sql, seq_of_parameters)
+        except sqlite3.Error:
+            query_stats.record_execute(sql, time.perf_counter() - started_at, failed=True)
+            raise
+        query_stats.record_execute(sql, time.perf_counter() - started_at, max(self.rowcount, 0))
+        return result
+
+    def executescript(self, sql_script):
+        self._flush_iteration()
+        self._last_sql = sql_script
+        started_at = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            query_stats.record_execute(sql_script, time.perf_counter() - started_at)
+
+    def fetchone(self):
+        started_at = time.perf_counter()
+        row = super().fetchone()
+        query_stats.record_fetch(self._last_sql, time.perf_counter() - started_at, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        started_at = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        query_stats.record_fetch(self._last_sql, time.perf_counter() - started_at, len(rows))
+        return rows
+
+    def fetchall(self):
+        started_at = time.perf_counter()
+        rows = super().fetchall()
+        query_stats.record_fetch(self._last_sql, time.perf_counter() - started_at, len(rows))
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started_at = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._iter_seconds += time.perf_counter() - started_at
+            self._flush_iteration()
+            raise
+        self._iter_seconds += time.perf_counter() - started_at
+        self._iter_rows += 1
+        return row
+
+    def close(self):
+        self._flush_iteration()
+        super().close()
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    Connection whose cursors report into query_stats. The execute shortcuts are
+    routed through cursor() because the C implementation bypasses overrides.
+    """
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
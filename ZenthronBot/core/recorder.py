@@ -0,0 +1,80 @@
+import gzip
+import json
+import logging
+import os
+import time
+
+from telegram import Update
+
+from ..config import RECORD_UPDATES_FILE, RECORD_UPDATES_FLUSH_EVERY, RECORD_UPDATES_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+
+# --- UPDATE RECORDER ---
+class UpdateRecorder:
+    """
+    Appends every incoming update to a gzip-compressed JSON Lines file as
+    {"received_at": <unix time>, "update": <update JSON>}, for replaying with
+    benchmarks/replay.py. Each run of the bot adds a new gzip member, which
+    gzip readers treat as one continuous stream. Updates are recorded as they
+    reach the update queue (see IntakeQueue), so the order and timestamps are
+    the arrival ones whatever CONCURRENT_UPDATES is.
+    """
+
+    def __init__(self, path: str, flush_every: int, max_mb: float):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.recorded = 0
+        self._file: gzip.GzipFile | None = None
+        self._unflushed = 0
+        self._stopped = False
+
+    def _open(self) -> gzip.GzipFile | None:
+        if self._file is None and not self._stopped:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = gzip.open(self.path, "ab")
+            logger.info(f"Recording incoming updates to {self.path}.")
+        return self._file
+
+    def record(self, update: object) -> None:
+        if not isinstance(update, Update):
+            return
+        try:
+            recording = self._open()
+            if recording is None:
+                return
+            line = json.dumps({"received_at": time.time(), "update": update.to_dict()}, ensure_ascii=False)
+            recording.write(line.encode("utf-8") + b"\n")
+            self.recorded += 1
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self.flush()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Stopped recording updates to {self.path}: {e}")
+            self.close()
+            self._stopped = True
+
+    def flush(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        self._unflushed = 0
+        if self.max_bytes and os.path.getsize(self.path) >= self.max_bytes:
+            logger.warning(f"Update recording {self.path} reached RECORD_UPDATES_MAX_MB, recording stopped.")
+            self.close()
+            self._stopped = True
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Closed update recording {self.path} ({self.recorded} updates this run).")
+
+
+update_recorder = UpdateRecorder(RECORD_UPDATES_FILE, RECORD_UPDATES_FLUSH_EVERY, RECORD_UPDATES_MAX_MB) if RECORD_UPDATES_FILE else None
+
+def close_update_recorder() -> None:
+    if update_recorder is not None:
+        update_recorder.close()
@@ -0,0 +1,85 @@
+import logging
+import sqlite3
+import threading
+import time
+
+from ..config import OWNER_ID
+from .connection import read_connection
+
+logger = logging.getLogger(__name__)
+
+RANK_TABLES = {
+    "dev": "dev_users",
+    "sudo": "sudo_users",
+    "support": "support_users",
+    "whitelist": "whitelist_users",
+    "blacklist": "blacklist",
+    # Not a rank, but kept here so the per-update AFK check needs no query.
+    "afk": "afk_users",
+}
+# After a failed load, lookups use the empty sets and retry at most this often.
+_LOAD_RETRY_SECONDS = 30.0
+
+
+# --- PRIVILEGE AND SANCTION REGISTRY ---
+class PrivilegeRegistry:
+    """
+    In-memory copy of the rank and sanction tables and of the AFK user IDs. Sets are replaced as a
+    whole on every change, so lookups never need a lock and never touch the DB.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sets: dict[str, frozenset[int]] = {name: frozenset() for name in RANK_TABLES}
+        self._loaded = False
+        self._retry_at = 0.0
+
+    def load(self) -> None:
+        loaded: dict[str, frozenset[int]] = {}
+        try:
+            with read_connection() as conn:
+                for name, table in RANK_TABLES.items():
+                    loaded[name] = frozenset(row[0] for row in conn.execute(f"SELECT user_id FROM {table}"))
+        except sqlite3.Error as e:
+            self._retry_at = time.monotonic() + _LOAD_RETRY_SECONDS
+            logger.error(f"Could not load privilege registry from DB, retrying in {_LOAD_RETRY_SECONDS:.0f} s: {e}", exc_info=True)
+            return
+
+        with self._lock:
+            self._sets = loaded
+            self._loaded = True
+        sizes = ", ".join(f"{name}={len(ids)}" for name, ids in loaded.items())
+        logger.info(f"Privilege registry loaded: {sizes}.")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded and time.monotonic() >= self._retry_at:
+            self.load()
+
+    def contains(self, name: str, user_id: int) -> bool:
+        self._ensure_loaded()
+        return user_id in self._sets[name]
+
+    def members(self, name: str) -> frozenset[int]:
+        self._ensure_loaded()
+        return self._sets[name]
+
+    def add(self, name: str, user_id: int) -> None:
+        with self._lock:
+            self._sets[name] = self._sets[name] | {user_id}
+
+    def remove(self, name: str, user_id: int) -> None:
+        with self._lock:
+            self._sets[name] = self._sets[name] - {user_id}
+
+    def is_owner(self, user_id: int) -> bool:
+        return user_id == OWNER_ID
+
+    def is_privileged(self, user_id: int) -> bool:
+        if user_id == OWNER_ID:
+            return True
+        self._ensure_loaded()
+        sets = self._sets
+        return user_id in sets["dev"] or user_id in sets["sudo"] or user_id in sets["support"]
+
+
+privilege_registry = PrivilegeRegistry()
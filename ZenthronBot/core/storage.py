@@ -0,0 +1,97 @@
+import logging
+import sqlite3
+
+from ..config import DB_NAME, DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB, DB_MMAP_SIZE_MB, DB_QUERY_STATS_ENABLED
+from .query_stats import InstrumentedConnection
+
+logger = logging.getLogger(__name__)
+
+_CONNECTION_FACTORY = InstrumentedConnection if DB_QUERY_STATS_ENABLED else sqlite3.Connection
+
+
+# --- STORAGE BACKENDS ---
+class StorageBackend:
+    """
+    Decides where the database lives and how connections to it are opened.
+    Everything above ConnectionManager (the helpers in core/database.py and
+    the modules calling them) stays the same whichever backend is selected.
+    """
+
+    name = "base"
+    # When True, reads share the single write connection instead of opening their own.
+    single_connection = False
+    persistent = True
+
+    def connect(self, read_only: bool) -> sqlite3.Connection:
+        raise NotImplementedError
+
+    def prepare_writer(self, conn: sqlite3.Connection) -> None:
+        pass
+
+    def describe(self) -> str:
+        return self.name
+
+class SQLiteFileBackend(StorageBackend):
+    """On-disk SQLite database in WAL mode, with one writer and per-thread readers."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            factory=_CONNECTION_FACTORY
+        )
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE_MB * 1024 * 1024}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def prepare_writer(self, conn: sqlite3.Connection) -> None:
+        # Only takes effect on a new, empty database; existing ones need /enableautovacuum.
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if str(mode).lower() != "wal":
+            logger.warning(f"Could not switch database to WAL mode, running in '{mode}' mode.")
+
+    def describe(self) -> str:
+        return f"sqlite ({self.path})"
+
+class MemoryBackend(StorageBackend):
+    """
+    Pure in-memory database with no disk I/O, meant for benchmarks and load
+    tests. Everything is lost when the bot stops.
+    """
+
+    name = "memory"
+    single_connection = True
+    persistent = False
+
+    def connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:", check_same_thread=False, factory=_CONNECTION_FACTORY)
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def describe(self) -> str:
+        return "memory (not persisted)"
+
+
+BACKENDS: dict[str, type[StorageBackend]] = {
+    SQLiteFileBackend.name: SQLiteFileBackend,
+    MemoryBackend.name: MemoryBackend,
+}
+
+def create_backend(name: str) -> StorageBackend:
+    if name == MemoryBackend.name:
+        return MemoryBackend()
+    if name != SQLiteFileBackend.name:
+        logger.warning(f"Unknown DB_BACKEND '{name}', falling back to '{SQLiteFileBackend.name}'.")
+    return SQLiteFileBackend(DB_NAME)
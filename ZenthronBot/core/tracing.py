@@ -0,0 +1,189 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, Iterator, TypeVar
+
+from telegram import Update
+
+from ..config import SLOW_UPDATE_MS, SLOW_UPDATE_LOG, SLOW_UPDATE_LOG_MAX_MB, SLOW_UPDATE_LOG_BACKUPS, TRACE_MAX_SPANS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# --- TRACES AND SPANS ---
+class Trace:
+    """
+    Timed spans of one update: handlers, Bot API calls, database statements
+    and Telethon lookups. Spans are appended from the event loop and from the
+    database threads, which list.append tolerates without a lock.
+    """
+
+    __slots__ = ("trace_id", "update_id", "chat_id", "user_id", "started_at", "_started_perf", "spans", "dropped")
+
+    def __init__(self, update: object):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.update_id = getattr(update, "update_id", None)
+        self.chat_id = update.effective_chat.id if isinstance(update, Update) and update.effective_chat else None
+        self.user_id = update.effective_user.id if isinstance(update, Update) and update.effective_user else None
+        self.started_at = time.time()
+        self._started_perf = time.perf_counter()
+        self.spans: list[dict] = []
+        self.dropped = 0
+
+    def add(self, kind: str, name: str, seconds: float, failed: bool = False) -> None:
+        if len(self.spans) >= TRACE_MAX_SPANS:
+            self.dropped += 1
+            return
+        span = {
+            "kind": kind,
+            "name": name,
+            "start_ms": round((time.perf_counter() - seconds - self._started_perf) * 1000, 3),
+            "duration_ms": round(seconds * 1000, 3),
+        }
+        if failed:
+            span["error"] = True
+        self.spans.append(span)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started_perf
+
+    def to_dict(self, duration: float) -> dict:
+        totals: dict[str, float] = {}
+        for span in self.spans:
+            if span["kind"] != "handler":
+                totals[span["kind"]] = totals.get(span["kind"], 0.0) + span["duration_ms"]
+        return {
+            "trace_id": self.trace_id,
+            "update_id": self.update_id,
+            "chat_id": self.chat_id,
+            "user_id": self.user_id,
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "totals_ms": {kind: round(total, 3) for kind, total in totals.items()},
+            "spans": sorted(self.spans, key=lambda span: span["start_ms"]),
+            "dropped_spans": self.dropped,
+        }
+
+_current_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("update_trace", default=None)
+
+def current_trace_id() -> str | None:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+def current_update_id() -> int | None:
+    trace = _current_trace.get()
+    return trace.update_id if trace else None
+
+def add_span(kind: str, name: str, seconds: float, failed: bool = False) -> None:
+    """Records a span that has just ended and took `seconds`, if an update is being traced."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(kind, name, seconds, failed)
+
+@contextmanager
+def span(kind: str, name: str) -> Iterator[None]:
+    failed = False
+    started_at = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        add_span(kind, name, time.perf_counter() - started_at, failed)
+
+def bind_trace(func: Callable[[], T]) -> Callable[[], T]:
+    """
+    Makes func report into the current trace when it runs on another thread.
+    Only the trace is handed over, not a copy of the whole context, so the
+    handler's metric charges (see core/metrics.py) are not counted twice.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return func
+
+    def run() -> T:
+        token = _current_trace.set(trace)
+        try:
+            return func()
+        finally:
+            _current_trace.reset(token)
+    return run
+
+
+# --- SLOW UPDATE LOG ---
+_slow_log: logging.Logger | None = None
+_slow_log_listener: QueueListener | None = None
+
+def _get_slow_log() -> logging.Logger:
+    """
+    The file is written and rotated by a QueueListener thread; the event loop
+    only puts records on a queue, so tracing adds no disk I/O to slow updates.
+    """
+    global _slow_log, _slow_log_listener
+    if _slow_log is None:
+        os.makedirs(os.path.dirname(SLOW_UPDATE_LOG) or ".", exist_ok=True)
+        file_handler = RotatingFileHandler(
+            SLOW_UPDATE_LOG, maxBytes=int(SLOW_UPDATE_LOG_MAX_MB * 1024 * 1024),
+            backupCount=SLOW_UPDATE_LOG_BACKUPS, encoding="utf-8", delay=True
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _slow_log_listener = QueueListener(records, file_handler)
+        _slow_log_listener.start()
+        slow_log = logging.getLogger(f"{__name__}.slow_updates")
+        slow_log.addHandler(QueueHandler(records))
+        slow_log.setLevel(logging.INFO)
+        slow_log.propagate = False
+        _slow_log = slow_log
+    return _slow_log
+
+def close_slow_log() -> None:
+    """Writes out the queued slow traces; called on shutdown."""
+    global _slow_log, _slow_log_listener
+    if _slow_log_listener is not None:
+        _slow_log_listener.stop()
+        for handler in _slow_log_listener.handlers:
+            handler.close()
+        _slow_log_listener = None
+    if _slow_log is not None:
+        for handler in list(_slow_log.handlers):
+            _slow_log.removeHandler(handler)
+        _slow_log = None
+
+@contextmanager
+def traced_update(update: object) -> Iterator[Trace | None]:
+    """
+    Traces one update while it is dispatched. Updates slower than
+    SLOW_UPDATE_MS are appended to the slow update log with every span.
+    """
+    if SLOW_UPDATE_MS <= 0:
+        yield None
+        return
+
+    trace = Trace(update)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        duration = trace.elapsed()
+        if duration * 1000 >= SLOW_UPDATE_MS:
+            record = trace.to_dict(duration)
+            logger.warning(
+                f"Slow update {trace.update_id} in chat {trace.chat_id}: {record['duration_ms']:.0f} ms "
+                f"(trace {trace.trace_id}, {len(trace.spans)} spans, totals {record['totals_ms']})."
+            )
+            try:
+                _get_slow_log().info(json.dumps(record, ensure_ascii=False))
+            except OSError as e:
+                logger.error(f"Could not write to the slow update log {SLOW_UPDATE_LOG}: {e}")
@@ -0,0 +1,79 @@
+import logging
+
+from telegram import Update
+from telegram.constants import ChatType
+from telegram.ext import ContextTypes
+
+from .database import ChatSettings, get_chat_settings, get_disabled_commands_in_chat, is_chat_state_cached
+from .async_database import run_read
+from .registry import privilege_registry
+from .gban_index import gban_index
+
+logger = logging.getLogger(__name__)
+
+_GROUP_TYPES = (ChatType.GROUP, ChatType.SUPERGROUP)
+
+
+# --- UPDATE-SCOPED CONTEXT ---
+class UpdateContext:
+    """
+    What the handlers need to know about the sender and the chat of one update,
+    resolved once before dispatch and shared by every handler group.
+    """
+
+    __slots__ = (
+        "update", "user_id", "chat_id", "is_group", "is_owner", "is_sudo", "is_privileged",
+        "is_blacklisted", "is_gbanned", "is_afk", "disabled_commands", "chat_settings",
+    )
+
+    def __init__(self, update: Update, disabled_commands: frozenset[str], chat_settings: ChatSettings | None):
+        user = update.effective_user
+        chat = update.effective_chat
+        self.update = update
+        self.user_id = user.id if user else None
+        self.chat_id = chat.id if chat else None
+        self.is_group = chat is not None and chat.type in _GROUP_TYPES
+        self.is_owner = user is not None and privilege_registry.is_owner(user.id)
+        # Owner, dev or sudo: may override chat admin checks.
+        self.is_sudo = user is not None and (
+            self.is_owner or privilege_registry.contains("dev", user.id) or privilege_registry.contains("sudo", user.id)
+        )
+        self.is_privileged = user is not None and privilege_registry.is_privileged(user.id)
+        self.is_blacklisted = user is not None and privilege_registry.contains("blacklist", user.id)
+        self.is_gbanned = user is not None and user.id in gban_index
+        self.is_afk = user is not None and privilege_registry.contains("afk", user.id)
+        self.disabled_commands = disabled_commands
+        # Only group chats have a bot_chats row; None everywhere else.
+        self.chat_settings = chat_settings
+
+    def is_command_disabled(self, command_name: str) -> bool:
+        return command_name.lower() in self.disabled_commands
+
+def _load_chat_state(chat_id: int) -> tuple[frozenset[str], ChatSettings]:
+    return get_disabled_commands_in_chat(chat_id), get_chat_settings(chat_id)
+
+async def build_update_context(update: Update) -> UpdateContext:
+    chat = update.effective_chat
+    if chat is None or chat.type not in _GROUP_TYPES:
+        return UpdateContext(update, frozenset(), None)
+    if is_chat_state_cached(chat.id):
+        # Warm chats are served from memory without the hop to the read pool.
+        disabled_commands, chat_settings = _load_chat_state(chat.id)
+    else:
+        disabled_commands, chat_settings = await run_read(_load_chat_state, chat.id)
+    return UpdateContext(update, disabled_commands, chat_settings)
+
+async def get_update_context(update: Update, context: ContextTypes.DEFAULT_TYPE) -> UpdateContext:
+    """
+    Returns the context prepared for this update, building it on the spot when
+    the pre-dispatch handler did not run (e.g. a handler invoked directly).
+    """
+    update_ctx = getattr(context, "update_ctx", None)
+    if update_ctx is None or update_ctx.update is not update:
+        update_ctx = await build_update_context(update)
+        context.update_ctx = update_ctx
+    return update_ctx
+
+async def prepare_update_context(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Pre-dispatch handler registered in the topmost group, see main.py."""
+    context.update_ctx = await build_update_context(update)
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor, SimpleUpdateProcessor
+
+from .metrics import observe_update
+from .tracing import traced_update
+
+logger = logging.getLogger(__name__)
+
+# PTB's own semaphore only admits updates; the real limit is applied once an
+# update has its chat's turn, so a busy chat never holds slots other chats need.
+_ADMISSION_LIMIT = 1_000_000
+
+
+async def _dispatch(update: object, coroutine: Awaitable[Any]) -> None:
+    with traced_update(update):
+        await observe_update(coroutine)
+
+
+def _ordering_key(update: object) -> int | None:
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat:
+        return update.effective_chat.id
+    if update.effective_user:
+        return update.effective_user.id
+    return None
+
+
+class _ChatSlot:
+    __slots__ = ("lock", "queued", "running")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.queued = 0
+        self.running = False
+
+
+# --- BOUNDED UPDATE INTAKE ---
+class IntakeQueue(asyncio.Queue):
+    """
+    Update queue whose bound covers every update that was put but not yet
+    finished. With concurrent processing PTB takes updates off the queue at
+    once and only calls task_done() after handling them, so a plain maxsize
+    would never fill up. put() waits here instead, which pauses polling or
+    holds webhook responses until the bot catches up. on_accept sees every
+    item in arrival order, before it waits for room.
+    """
+
+    def __init__(self, limit: int, on_accept: Callable[[object], None] | None = None):
+        super().__init__()
+        self.limit = limit
+        self.pending = 0
+        self.on_accept = on_accept
+        self._room = asyncio.Semaphore(limit)
+
+    async def put(self, item) -> None:
+        if self.on_accept is not None:
+            self.on_accept(item)
+        await self._room.acquire()
+        self.pending += 1
+        super().put_nowait(item)
+
+    def task_done(self) -> None:
+        super().task_done()
+        self.pending -= 1
+        self._room.release()
+
+
+# --- SEQUENTIAL UPDATE PROCESSOR ---
+class TimedUpdateProcessor(SimpleUpdateProcessor):
+    """PTB's default one-at-a-time processing, with each update's dispatch time recorded."""
+
+    __slots__ = ()
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        await _dispatch(update, coroutine)
+
+
+# --- PER-CHAT ORDERED UPDATE PROCESSOR ---
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Runs updates from different chats in parallel, at most max_workers at a
+    time, while updates of the same chat are handled strictly one after the
+    other in arrival order. Updates without a chat are ordered per user.
+    """
+
+    __slots__ = ("max_workers", "_workers", "_chats", "_running")
+
+    def __init__(self, max_workers: int):
+        super().__init__(_ADMISSION_LIMIT)
+        self.max_workers = max_workers
+        self._workers = asyncio.Semaphore(max_workers)
+        self._chats: dict[int, _ChatSlot] = {}
+        self._running = 0
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = _ordering_key(update)
+        if key is None:
+            await self._run(update, coroutine)
+            return
+
+        slot = self._chats.get(key)
+        if slot is None:
+            slot = self._chats[key] = _ChatSlot()
+        slot.queued += 1
+        try:
+            # asyncio.Lock wakes waiters in FIFO order, which keeps the chat's updates in sequence.
+            async with slot.lock:
+                slot.queued -= 1
+                slot.running = True
+                try:
+                    await self._run(update, coroutine)
+                finally:
+                    slot.running = False
+        finally:
+            if slot.queued == 0 and not slot.lock.locked():
+                self._chats.pop(key, None)
+
+    async def _run(self, update: object, coroutine: Awaitable[Any]) -> None:
+        async with self._workers:
+            self._running += 1
+            try:
+                await _dispatch(update, coroutine)
+            finally:
+                self._running -= 1
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def snapshot(self, limit: int = 10) -> dict:
+        """
+        Current load: handlers running overall, updates queued behind an earlier
+        update of the same chat, and the chats with the deepest queues.
+        """
+        chats = [(key, slot.queued, int(slot.running)) for key, slot in self._chats.items()]
+        chats.sort(key=lambda item: (item[1], item[2]), reverse=True)
+        return {
+            "max_workers": self.max_workers,
+            "running": self._running,
+            "queued": sum(queued for _, queued, _ in chats),
+            "active_chats": len(chats),
+            "chats": [{"chat_id": key, "queued": queued, "in_flight": in_flight} for key, queued, in_flight in chats[:limit]],
+        }
@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from telegram import User
+
+from ..config import USER_BUFFER_MAX_SIZE, USER_LAST_SEEN_REFRESH
+from .database import upsert_user_rows
+
+logger = logging.getLogger(__name__)
+
+_WRITTEN_CACHE_SIZE = 50_000
+
+
+# --- WRITE-BEHIND USER BUFFER ---
+class UserWriteBuffer:
+    """
+    Coalesces user upserts in memory by user_id and writes them in one
+    executemany transaction. Users whose profile did not change since the
+    last write are skipped until their last_seen needs refreshing.
+    """
+
+    def __init__(self, max_size: int, last_seen_refresh: int):
+        self.max_size = max_size
+        self.last_seen_refresh = last_seen_refresh
+        self._lock = threading.Lock()
+        self._pending: dict[int, tuple] = {}
+        self._written: OrderedDict[int, tuple[tuple, float]] = OrderedDict()
+
+    def add(self, user: User | None) -> bool:
+        """Queues a user and returns True when the buffer should be flushed."""
+        if not user:
+            return False
+
+        profile = (user.username, user.first_name, user.last_name, user.language_code, 1 if user.is_bot else 0)
+        now = time.monotonic()
+
+        with self._lock:
+            written = self._written.get(user.id)
+            if user.id not in self._pending and written:
+                written_profile, written_at = written
+                if written_profile == profile and now - written_at < self.last_seen_refresh:
+                    return False
+
+            self._pending[user.id] = (user.id, *profile, int(time.time()))
+            return len(self._pending) >= self.max_size
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def forget(self, user_id: int) -> None:
+        """Call after deleting a user's row, so their next update writes it again."""
+        with self._lock:
+            self._written.pop(user_id, None)
+
+    def forget_all(self) -> None:
+        with self._lock:
+            self._written.clear()
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+
+        rows = list(pending.values())
+        if not upsert_user_rows(rows):
+            with self._lock:
+                for user_id, row in pending.items():
+                    self._pending.setdefault(user_id, row)
+            return 0
+
+        now = time.monotonic()
+        with self._lock:
+            for row in rows:
+                self._written[row[0]] = (row[1:6], now)
+                self._written.move_to_end(row[0])
+            while len(self._written) > _WRITTEN_CACHE_SIZE:
+                self._written.popitem(last=False)
+
+        logger.debug(f"Flushed {len(rows)} buffered users to the database.")
+        return len(rows)
+
+
+user_write_buffer = UserWriteBuffer(USER_BUFFER_MAX_SIZE, USER_LAST_SEEN_REFRESH)
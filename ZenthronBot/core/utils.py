@@ -8,26 +8,31 @@ import re
 import sqlite3
 import subprocess
 from datetime import timedelta, datetime, timezone
-from typing import List, Tuple
+from typing import List, Tuple, TYPE_CHECKING
 
-import google.generativeai as genai
-import requests
-import speedtest
 import telegram
 from telegram import Update, User, Chat, constants, ChatPermissions
 from telegram.constants import ParseMode, ChatMemberStatus
 from telegram.error import TelegramError, BadRequest
 from telegram.ext import ContextTypes
-from telethon import TelegramClient
-from telethon.tl.types import User as TelethonUser
-
-from ..config import OWNER_ID, TENOR_API_KEY, GEMINI_API_KEY, LOG_CHAT_ID, ADMIN_LOG_CHAT_ID, DB_NAME
+from ..config import OWNER_ID, TENOR_API_KEY, GEMINI_API_KEY, LOG_CHAT_ID, ADMIN_LOG_CHAT_ID
 from .database import (
-    is_dev_user, is_sudo_user, is_support_user,
+    is_dev_user,
     get_user_from_db_by_id, get_user_from_db_by_username,
-    update_user_in_db
+    update_user_in_db, get_all_chat_ids
 )
 from .async_utils import aioify
+from .async_database import run_read, run_write
+from .registry import privilege_registry
+from .tracing import span
+from .update_context import get_update_context
+
+if TYPE_CHECKING:
+    from telethon import TelegramClient
+
+# google.generativeai, speedtest, requests and the Telethon types are imported
+# inside the functions that use them: every module imports this file, and the
+# Gemini SDK alone takes most of the bot's import time.
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +63,7 @@ async def check_username_protection(target_mention: str, context: ContextTypes.D
 async def get_themed_gif(context: ContextTypes.DEFAULT_TYPE, search_terms: list[str]) -> str | None:
     if not TENOR_API_KEY: return None
     if not search_terms: logger.warning("No search terms for get_themed_gif."); return None
+    import requests
     
     search_term = random.choice(search_terms)
     logger.info(f"Searching Tenor for BEST results: '{search_term}'")
@@ -149,6 +155,8 @@ def markdown_to_html(text: str) -> str:
 
 # --- UTILITY ---
 def telethon_entity_to_ptb_user(entity) -> User | Chat | None:
+    from telethon.tl.types import User as TelethonUser
+
     if isinstance(entity, TelethonUser):
         return User(
             id=entity.id,
@@ -177,7 +185,7 @@ async def resolve_user_with_telethon(context: ContextTypes.DEFAULT_TYPE, target_
                 if target_input.lstrip('@').lower() == mentioned_text.lstrip('@').lower():
                     if entity.user:
                         logger.info(f"Resolved '{target_input}' via Text Mention entity.")
-                        update_user_in_db(entity.user)
+                        await run_write(update_user_in_db, entity.user)
                         return entity.user
 
     identifier: str | int = target_input
@@ -188,9 +196,9 @@ async def resolve_user_with_telethon(context: ContextTypes.DEFAULT_TYPE, target_
 
     if isinstance(identifier, int):
         logger.info(f"Resolving '{target_input}' using DB...")
-        entity_from_db = get_user_from_db_by_id(identifier)
+        entity_from_db = await run_read(get_user_from_db_by_id, identifier)
     else:
-        entity_from_db = get_user_from_db_by_username(identifier)
+        entity_from_db = await run_read(get_user_from_db_by_username, identifier)
     
     if entity_from_db:
         return entity_from_db
@@ -202,7 +210,7 @@ async def resolve_user_with_telethon(context: ContextTypes.DEFAULT_TYPE, target_
         ptb_entity = await context.bot.get_chat(target_input)
         if ptb_entity:
             if isinstance(ptb_entity, User):
-                update_user_in_db(ptb_entity)
+                await run_write(update_user_in_db, ptb_entity)
             return ptb_entity
     except Exception as e:
         logger.warning(f"PTB failed for '{target_input}': {e}.")
@@ -214,15 +222,18 @@ async def resolve_user_with_telethon(context: ContextTypes.DEFAULT_TYPE, target_
     if 'telethon_client' not in context.bot_data:
         return None
     
+    from telethon.tl.types import User as TelethonUser
+
     telethon_client: 'TelegramClient' = context.bot_data['telethon_client']
     try:
         logger.info(f"Resolving '{target_input}' using Telethon...")
-        entity_from_telethon = await telethon_client.get_entity(target_input)
+        with span("telethon", "get_entity"):
+            entity_from_telethon = await telethon_client.get_entity(target_input)
         
         if isinstance(entity_from_telethon, TelethonUser):
             ptb_user = telethon_entity_to_ptb_user(entity_from_telethon)
             if ptb_user:
-                update_user_in_db(ptb_user)
+                await run_write(update_user_in_db, ptb_user)
                 return ptb_user
         
     except Exception as e:
@@ -339,7 +350,7 @@ async def _can_user_perform_action(
     user = update.effective_user
     chat = update.effective_chat
 
-    if allow_bot_privileged_override and (is_owner_or_dev(user.id) or is_sudo_user(user.id)):
+    if allow_bot_privileged_override and (await get_update_context(update, context)).is_sudo:
         return True
 
     try:
@@ -418,15 +429,7 @@ def is_owner_or_dev(user_id: int) -> bool:
     return is_dev_user(user_id)
 
 def is_privileged_user(user_id: int) -> bool:
-    if user_id == OWNER_ID:
-        return True
-    if is_dev_user(user_id):
-        return True
-    if is_sudo_user(user_id):
-        return True
-    if is_support_user(user_id):
-        return True
-    return False
+    return privilege_registry.is_privileged(user_id)
 
 # --- TEXT FORMATING ---
 async def format_message_text(text: str, user: User, chat: Chat, context: ContextTypes.DEFAULT_TYPE) -> str:
@@ -465,6 +468,8 @@ async def get_gemini_response(prompt: str) -> str:
     if not GEMINI_API_KEY:
         return "AI features are not configured by the bot owner."
     try:
+        import google.generativeai as genai
+
         genai.configure(api_key=GEMINI_API_KEY)
         model = genai.GenerativeModel('gemini-2.5-flash-preview-05-20')
         response = await model.generate_content_async(prompt)
@@ -475,6 +480,8 @@ async def get_gemini_response(prompt: str) -> str:
 
 # --- SPEEDTEST ---
 def run_speed_test_blocking():
+    import speedtest
+
     try:
         logger.info("Starting blocking speed test...")
         s = speedtest.Speedtest()
@@ -508,11 +515,8 @@ async def propagate_unban(context: ContextTypes.DEFAULT_TYPE) -> None:
     user_display = job_data['user_display']
     command_message_id = job_data['command_message_id']
 
-    chats_to_scan = []
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
-            chats_to_scan = [row[0] for row in cursor.execute("SELECT chat_id FROM bot_chats")]
+        chats_to_scan = await run_read(get_all_chat_ids)
     except sqlite3.Error as e:
         logger.error(f"Failed to get chat list for unban propagation: {e}")
         await context.bot.send_message(chat_id=command_chat_id, text="Error fetching chat list from database.")
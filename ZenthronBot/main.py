@@ -3,32 +3,37 @@ import logging
 import os
 import io
 import importlib
+import time
 import traceback
 import json
 import html
+import sqlite3
 from datetime import datetime, timezone, timedelta
 from telegram import Update, constants
 from telegram.constants import ParseMode, UpdateType
-from telegram.ext import Application, ApplicationBuilder, JobQueue, ContextTypes, MessageHandler, filters, ApplicationHandlerStop, ChatMemberHandler, CommandHandler
-from telegram.request import HTTPXRequest
+from telegram.ext import Application, ApplicationBuilder, JobQueue, ContextTypes, MessageHandler, filters, ApplicationHandlerStop, ChatMemberHandler, TypeHandler
+from telegram.request import BaseRequest, HTTPXRequest
 from telethon import TelegramClient
 
-from .config import SESSION_NAME, API_ID, API_HASH, LOG_CHAT_ID, OWNER_ID, BOT_TOKEN, ADMIN_LOG_CHAT_ID, DB_NAME
-from .core.database import init_db, disable_module, enable_module, get_disabled_modules
+from .config import (
+    SESSION_NAME, API_ID, API_HASH, LOG_CHAT_ID, OWNER_ID, BOT_TOKEN, ADMIN_LOG_CHAT_ID, BACKUP_INTERVAL_HOURS, MAINTENANCE_INTERVAL_HOURS, STATS_RECONCILE_INTERVAL_HOURS, CONCURRENT_UPDATES,
+    UPDATE_QUEUE_SIZE, UPDATE_MODE, WEBHOOK_URL, WEBHOOK_SECRET, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_MAX_CONNECTIONS,
+    METRICS_HOST, METRICS_PORT
+)
+from .core.database import init_db, disable_module, enable_module, get_disabled_modules, enable_incremental_auto_vacuum
+from .core.connection import close_connections
+from .core.async_database import run_read, run_write, shutdown_async_db
+from .core.user_buffer import user_write_buffer
+from .core.backup import create_backup, backup_job
+from .core.maintenance import maintenance_job, reconcile_stats_job
 from .core.utils import is_owner_or_dev, safe_escape, send_critical_log
-from .core.handlers import get_custom_command_handler, custom_handler
-
-from .modules.chatblacklists import check_blacklisted_chat_on_join
-from .modules.mutes import handle_bot_permission_changes
-from .modules.bans import handle_bot_banned
-from .modules.blacklists import check_blacklist_handler
-from .modules.userlogger import log_user_from_interaction
-from .modules.globalbans import check_gban_on_message, check_gban_on_entry
-from .modules.afk import check_afk_return, afk_reply_handler, afk_brb_handler
-from .modules.notes import handle_note_trigger
-from .modules.welcomes import handle_new_group_members, handle_left_group_member
-from .modules.joinfilters import check_new_member
-from .modules.filters import check_message_for_filters
+from .core.handlers import CUSTOM_COMMANDS, get_custom_command_handler, custom_handler
+from .core.update_context import prepare_update_context
+from .core.module_toggle import module_toggle
+from .core.update_processor import ChatOrderedUpdateProcessor, IntakeQueue, TimedUpdateProcessor
+from .core.tracing import current_trace_id, close_slow_log
+from .core.recorder import update_recorder, close_update_recorder
+from .core.metrics import InstrumentedRequest, instrument_handlers, instrument_commands, start_metrics_server
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
@@ -62,6 +67,7 @@ async def ignore_edited_commands(update: Update, context: ContextTypes.DEFAULT_T
 
 def discover_and_register_handlers(application: Application):
     manageable_commands = set()
+    load_times = {}
     base_path = os.path.dirname(os.path.abspath(__file__))
     modules_dir = os.path.join(base_path, "modules")
 
@@ -69,14 +75,16 @@ def discover_and_register_handlers(application: Application):
         if filename.endswith(".py") and not filename.startswith("_"):
             module_name = filename[:-3]
             try:
+                started_at = time.perf_counter()
                 module = importlib.import_module(f"ZenthronBot.modules.{module_name}")
+                imported_at = time.perf_counter()
                 
                 if hasattr(module, "load_handlers"):
                     module.load_handlers(application)
                     logger.info(f"Successfully loaded module: {module_name}")
+                load_times[module_name] = (imported_at - started_at, time.perf_counter() - imported_at)
                 
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
+                for attr in vars(module).values():
                     if callable(attr) and hasattr(attr, '_is_manageable'):
                         command_name = getattr(attr, '_command_name')
                         manageable_commands.add(command_name)
@@ -86,11 +94,33 @@ def discover_and_register_handlers(application: Application):
                 traceback.print_exc()
     
     application.bot_data["manageable_commands"] = manageable_commands
+    application.bot_data["module_load_times"] = load_times
+    _log_module_load_report(load_times)
     if manageable_commands:
         logger.info(f"Registered manageable commands: {sorted(list(manageable_commands))}")
     else:
         logger.info("No manageable commands found.")
 
+def _log_module_load_report(load_times: dict[str, tuple[float, float]]) -> None:
+    """
+    Logs where module loading time went. A module's import time includes any
+    shared dependency it was the first to import.
+    """
+    if not load_times:
+        return
+    total_import = sum(import_time for import_time, _ in load_times.values())
+    total_load = sum(load_time for _, load_time in load_times.values())
+    slowest = sorted(load_times.items(), key=lambda item: sum(item[1]), reverse=True)[:5]
+    breakdown = ", ".join(
+        f"{name} {import_time * 1000:.0f}+{load_time * 1000:.0f} ms" for name, (import_time, load_time) in slowest
+    )
+    logger.info(
+        f"Loaded {len(load_times)} modules in {(total_import + total_load) * 1000:.0f} ms "
+        f"(imports {total_import * 1000:.0f} ms, load_handlers {total_load * 1000:.0f} ms). Slowest: {breakdown}."
+    )
+    for name, (import_time, load_time) in sorted(load_times.items()):
+        logger.debug(f"Module {name}: import {import_time * 1000:.1f} ms, load_handlers {load_time * 1000:.1f} ms.")
+
 def _get_available_modules():
     try:
         base_path = os.path.dirname(os.path.abspath(__file__))
@@ -124,7 +154,8 @@ async def disable_module_command(update: Update, context: ContextTypes.DEFAULT_T
         return
 
     module_name = context.args[0]
-    if disable_module(module_name):
+    if await run_write(disable_module, module_name):
+        module_toggle.disable(context.application, module_name)
         await update.message.reply_text(f"✅ Module '<code>{safe_escape(module_name)}</code>' has been disabled.", parse_mode=ParseMode.HTML)
     else:
         await update.message.reply_text(f"Module '<code>{safe_escape(module_name)}</code>' was already disabled or an error occurred.", parse_mode=ParseMode.HTML)
@@ -142,7 +173,8 @@ async def enable_module_command(update: Update, context: ContextTypes.DEFAULT_TY
         return
         
     module_name = context.args[0]
-    if enable_module(module_name):
+    if await run_write(enable_module, module_name):
+        module_toggle.enable(context.application, module_name)
         await update.message.reply_text(f"✅ Module '<code>{safe_escape(module_name)}</code>' has been enabled.", parse_mode=ParseMode.HTML)
     else:
         await update.message.reply_text(f"Module '<code>{safe_escape(module_name)}</code>' was already enabled or an error occurred.", parse_mode=ParseMode.HTML)
@@ -155,7 +187,7 @@ async def list_modules_command(update: Update, context: ContextTypes.DEFAULT_TYP
         logger.warning(f"Unauthorized /listmodules attempt by user {user.id}.")
         return
         
-    disabled_modules = get_disabled_modules()
+    disabled_modules = await run_read(get_disabled_modules)
     available_modules = _get_available_modules()
     
     message = "<b>Module Status:</b>\n\n"
@@ -176,21 +208,44 @@ async def backup_db_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     message = await update.message.reply_text("Performing backup and sending the file...")
 
     try:
-        await context.bot.send_document(
-            chat_id=OWNER_ID,
-            document=open(DB_NAME, 'rb'),
-            filename="zenthron_data_backup.db",
-            caption=f"Here is backuped database."
-        )
+        backup = await run_read(create_backup)
+        with open(backup.path, 'rb') as backup_file:
+            await context.bot.send_document(
+                chat_id=OWNER_ID,
+                document=backup_file,
+                filename=os.path.basename(backup.path),
+                caption=f"Here is backuped database. ({backup.raw_size // 1024} KiB, integrity check passed)"
+            )
         await message.edit_text("✅ Backup has been successfully sent to you in a private message.")
     
-    except FileNotFoundError:
-        logger.error(f"Database file not found at: {DB_NAME}")
-        await message.edit_text("❌ Error: Database file not found.")
     except Exception as e:
         logger.error(f"Failed to send database backup: {e}")
         await message.edit_text(f"❌ An error occurred while sending the backup: {e}")
 
+@custom_handler("enableautovacuum")
+async def enable_auto_vacuum_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user = update.effective_user
+
+    if user.id != OWNER_ID:
+        logger.warning(f"Unauthorized /enableautovacuum attempt by user {user.id}.")
+        return
+
+    message = await update.message.reply_text(
+        "Rewriting the database with a full VACUUM. Database writes wait until it is done, which can take a while on a large database..."
+    )
+    started_at = time.perf_counter()
+    try:
+        switched = await run_write(enable_incremental_auto_vacuum)
+    except sqlite3.Error as e:
+        logger.error(f"Could not enable incremental auto_vacuum: {e}", exc_info=True)
+        await message.edit_text(f"❌ Could not enable incremental auto_vacuum: {e}")
+        return
+
+    if switched:
+        await message.edit_text(f"✅ Incremental auto_vacuum enabled in {time.perf_counter() - started_at:.1f} s. Maintenance now returns free pages to the OS.")
+    else:
+        await message.edit_text("Incremental auto_vacuum is already enabled.")
+
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     logger.error("Exception while handling an update:", exc_info=context.error)
 
@@ -204,6 +259,7 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
         f"An exception was raised while handling an update\n"
         f"--------------------------------------------------\n"
         f"Error: {str(context.error)}\n"
+        f"Trace ID: {current_trace_id() or 'N/A'}\n"
         f"--------------------------------------------------\n"
         f"Full Traceback:\n{tb_string}\n"
         f"--------------------------------------------------\n"
@@ -242,80 +298,152 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
             logger.critical(f"CRITICAL: Could not send error log with file to {target_id}: {e}")
             await send_critical_log(context, short_message)
 
+def build_application(telethon_client, request: BaseRequest | None = None) -> Application:
+    """
+    Builds the application with every handler and job registered, without
+    touching the network. main() and the startup benchmark both use it.
+    """
+    if request is None:
+        request = HTTPXRequest(connect_timeout=20.0, read_timeout=80.0, write_timeout=80.0, pool_timeout=20.0)
+
+    builder = (
+        ApplicationBuilder()
+        .token(BOT_TOKEN)
+        .request(InstrumentedRequest(request))
+        .job_queue(JobQueue())
+        .update_queue(IntakeQueue(UPDATE_QUEUE_SIZE, on_accept=update_recorder.record if update_recorder else None))
+    )
+    if CONCURRENT_UPDATES > 1:
+        builder.concurrent_updates(ChatOrderedUpdateProcessor(CONCURRENT_UPDATES))
+        logger.info(f"Processing updates from different chats concurrently (up to {CONCURRENT_UPDATES} at once).")
+    else:
+        builder.concurrent_updates(TimedUpdateProcessor(1))
+    application = builder.build()
+
+    # --- GLOBAL LAYER: TRACEBACKS - MODULE LOADER ---
+    application.add_error_handler(error_handler)
+    discover_and_register_handlers(application)
+
+    # Imported only now so the module import costs show up in the startup report above.
+    from .modules.chatblacklists import check_blacklisted_chat_on_join
+    from .modules.mutes import handle_bot_permission_changes
+    from .modules.bans import handle_bot_banned
+    from .modules.blacklists import check_blacklist_handler
+    from .modules.userlogger import log_user_from_interaction
+    from .modules.globalbans import check_gban_on_message, check_gban_on_entry
+    from .modules.afk import check_afk_return, afk_reply_handler, afk_brb_handler
+    from .modules.notes import handle_note_trigger
+    from .modules.welcomes import handle_new_group_members, handle_left_group_member
+    from .modules.joinfilters import check_new_member
+    from .modules.filters import check_message_for_filters
+
+    # --- LAYER 0: PRE-DISPATCH - SHARED UPDATE CONTEXT ---
+    application.add_handler(TypeHandler(Update, prepare_update_context), group=-1000)
+
+    # --- LAYER 1: TOP PRIORITY - SECURITY AND IGNORANCE ---
+    application.add_handler(ChatMemberHandler(check_blacklisted_chat_on_join, ChatMemberHandler.MY_CHAT_MEMBER), group=-200)
+    application.add_handler(ChatMemberHandler(handle_bot_permission_changes, ChatMemberHandler.MY_CHAT_MEMBER), group=-100)
+    application.add_handler(ChatMemberHandler(handle_bot_banned, ChatMemberHandler.MY_CHAT_MEMBER), group=-100)
+    application.add_handler(MessageHandler(filters.UpdateType.EDITED_MESSAGE & filters.COMMAND, ignore_edited_commands), group=-50)
+
+    # --- LAYER 2: USER FILTERING - BLACKLISTS - GBANS - JOINFILTER ---
+    application.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, check_gban_on_entry), group=-20)
+    application.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, check_new_member), group=-15)
+    application.add_handler(MessageHandler(filters.COMMAND, check_blacklist_handler), group=-10)
+    application.add_handler(MessageHandler(filters.TEXT | filters.COMMAND | filters.Sticker.ALL | filters.PHOTO | filters.VIDEO | filters.VOICE | filters.ANIMATION & filters.ChatType.GROUPS, check_gban_on_message), group=-10)
+
+    # --- LAYER 3: PASSIVE MECHANISMS - AFK ---
+    application.add_handler(MessageHandler(filters.Regex(r'^(brb|BRB|Brb|bRB|brB|BRb|bRb)'), afk_brb_handler), group=-6)
+    application.add_handler(MessageHandler(filters.TEXT | filters.COMMAND | filters.Sticker.ALL | filters.PHOTO | filters.VIDEO | filters.VOICE | filters.ANIMATION, check_afk_return), group=-5)
+    application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND) & (filters.REPLY | filters.Entity(constants.MessageEntityType.MENTION) | filters.Entity(constants.MessageEntityType.TEXT_MENTION)), afk_reply_handler), group=-4)
+
+    # --- LAYER 4: MAIN LOGIC - COMMANDS AND INTERACTIONS ---
+    application.add_handler(get_custom_command_handler(), group=-1)
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_note_trigger), group=0)
+    application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND) & filters.ChatType.GROUPS, check_message_for_filters), group=3)
+
+    # --- LAYER 5: GROUP MEMBERS SERVICING ---
+    application.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, handle_new_group_members), group=5)
+    application.add_handler(MessageHandler(filters.StatusUpdate.LEFT_CHAT_MEMBER, handle_left_group_member), group=5)
+
+    # --- LAYER 6: LOWEST PRIORITY - PASSIVE LOGIN ---
+    application.add_handler(MessageHandler(filters.ALL & (~filters.UpdateType.EDITED_MESSAGE), log_user_from_interaction), group=10)
+
+    # --- METRICS: TIME EVERY HANDLER AND COMMAND ---
+    wrapped_handlers = instrument_handlers(application)
+    instrument_commands(CUSTOM_COMMANDS, group=-1)
+    logger.info(f"Latency metrics enabled for {wrapped_handlers} handlers and {len(CUSTOM_COMMANDS)} commands.")
+
+    # --- MODULE STATE: DISABLED MODULES HAVE THEIR HANDLERS REMOVED ---
+    module_toggle.snapshot_order(application)
+    for module_name in get_disabled_modules():
+        module_toggle.disable(application, module_name)
+
+    application.bot_data["telethon_client"] = telethon_client
+    logger.info("Telethon client has been injected into bot_data.")
+
+    if application.job_queue:
+        application.job_queue.run_once(send_startup_log, when=1)
+        logger.info("Startup message job scheduled to run in 1 second.")
+        if BACKUP_INTERVAL_HOURS > 0:
+            backup_interval = BACKUP_INTERVAL_HOURS * 3600
+            application.job_queue.run_repeating(backup_job, interval=backup_interval, first=backup_interval, name="database_backup")
+            logger.info(f"Database backups scheduled every {BACKUP_INTERVAL_HOURS} hours.")
+        if MAINTENANCE_INTERVAL_HOURS > 0:
+            application.job_queue.run_repeating(
+                maintenance_job, interval=MAINTENANCE_INTERVAL_HOURS * 3600, first=600, name="database_maintenance"
+            )
+            logger.info(f"Database maintenance scheduled every {MAINTENANCE_INTERVAL_HOURS} hours.")
+        if STATS_RECONCILE_INTERVAL_HOURS > 0:
+            reconcile_interval = STATS_RECONCILE_INTERVAL_HOURS * 3600
+            application.job_queue.run_repeating(reconcile_stats_job, interval=reconcile_interval, first=reconcile_interval, name="reconcile_stats")
+    else:
+        logger.warning("JobQueue not available, cannot schedule startup message.")
+
+    return application
+
 async def main() -> None:
     init_db()
 
     async with TelegramClient(SESSION_NAME, API_ID, API_HASH) as telethon_client:
         logger.info("Telethon client started.")
 
-        custom_request_settings = HTTPXRequest(connect_timeout=20.0, read_timeout=80.0, write_timeout=80.0, pool_timeout=20.0)
-        
-        application = (
-            ApplicationBuilder()
-            .token(BOT_TOKEN)
-            .request(custom_request_settings)
-            .job_queue(JobQueue())
-            .build()
-        )
-
-        # --- GLOBAL LAYER: TRACEBACKS - MODULE LOADER ---
-        application.add_error_handler(error_handler)
-        discover_and_register_handlers(application)
-
-        # --- LAYER 1: TOP PRIORITY - SECURITY AND IGNORANCE ---
-        application.add_handler(ChatMemberHandler(check_blacklisted_chat_on_join, ChatMemberHandler.MY_CHAT_MEMBER), group=-200)
-        application.add_handler(ChatMemberHandler(handle_bot_permission_changes, ChatMemberHandler.MY_CHAT_MEMBER), group=-100)
-        application.add_handler(ChatMemberHandler(handle_bot_banned, ChatMemberHandler.MY_CHAT_MEMBER), group=-100)
-        application.add_handler(MessageHandler(filters.UpdateType.EDITED_MESSAGE & filters.COMMAND, ignore_edited_commands), group=-50)
-
-        # --- LAYER 2: USER FILTERING - BLACKLISTS - GBANS - JOINFILTER ---
-        application.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, check_gban_on_entry), group=-20)
-        application.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, check_new_member), group=-15)
-        application.add_handler(MessageHandler(filters.COMMAND, check_blacklist_handler), group=-10)
-        application.add_handler(MessageHandler(filters.TEXT | filters.COMMAND | filters.Sticker.ALL | filters.PHOTO | filters.VIDEO | filters.VOICE | filters.ANIMATION & filters.ChatType.GROUPS, check_gban_on_message), group=-10)
-
-        # --- LAYER 3: PASSIVE MECHANISMS - AFK ---
-        application.add_handler(MessageHandler(filters.Regex(r'^(brb|BRB|Brb|bRB|brB|BRb|bRb)'), afk_brb_handler), group=-6)
-        application.add_handler(MessageHandler(filters.TEXT | filters.COMMAND | filters.Sticker.ALL | filters.PHOTO | filters.VIDEO | filters.VOICE | filters.ANIMATION, check_afk_return), group=-5)
-        application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND) & (filters.REPLY | filters.Entity(constants.MessageEntityType.MENTION) | filters.Entity(constants.MessageEntityType.TEXT_MENTION)), afk_reply_handler), group=-4)
-
-        # --- LAYER 4: MAIN LOGIC - COMMANDS AND INTERACTIONS ---
-        application.add_handler(get_custom_command_handler(), group=-1)
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_note_trigger), group=0)
-        application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND) & filters.ChatType.GROUPS, check_message_for_filters), group=3)
-
-        # --- LAYER 5: GROUP MEMBERS SERVICING ---
-        application.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, handle_new_group_members), group=5)
-        application.add_handler(MessageHandler(filters.StatusUpdate.LEFT_CHAT_MEMBER, handle_left_group_member), group=5)
-
-        # --- LAYER 6: LOWEST PRIORITY - PASSIVE LOGIN ---
-        application.add_handler(MessageHandler(filters.ALL & (~filters.UpdateType.EDITED_MESSAGE), log_user_from_interaction), group=10)
-
-        # --- LAYER 7: COMMANDS - HANDLERS ---
-        application.add_handler(CommandHandler("disablemodule", disable_module_command))
-        application.add_handler(CommandHandler("enablemodule", enable_module_command))
-        application.add_handler(CommandHandler("listmodules", list_modules_command))
-        application.add_handler(CommandHandler("backupdb", backup_db_command))
-
-        application.bot_data["telethon_client"] = telethon_client
-        logger.info("Telethon client has been injected into bot_data.")
-
-        if application.job_queue:
-            application.job_queue.run_once(send_startup_log, when=1)
-            logger.info("Startup message job scheduled to run in 1 second.")
-        else:
-            logger.warning("JobQueue not available, cannot schedule startup message.")
+        application = build_application(telethon_client)
 
-        logger.info(f"Bot starting polling... Owner ID: {OWNER_ID}")
-        
         await application.initialize()
         await application.start()
-        await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
-        await telethon_client.run_until_disconnected()
-
-        await application.updater.stop()
-        await application.stop()
-        logger.info("Bot shutdown process completed.")
+        metrics_server = await start_metrics_server(METRICS_HOST, METRICS_PORT) if METRICS_PORT > 0 else None
+        if UPDATE_MODE == "webhook":
+            logger.info(f"Bot starting webhook on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH}... Owner ID: {OWNER_ID}")
+            await application.updater.start_webhook(
+                listen=WEBHOOK_LISTEN,
+                port=WEBHOOK_PORT,
+                url_path=WEBHOOK_PATH,
+                webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+                secret_token=WEBHOOK_SECRET,
+                max_connections=WEBHOOK_MAX_CONNECTIONS,
+                allowed_updates=Update.ALL_TYPES
+            )
+        else:
+            logger.info(f"Bot starting polling... Owner ID: {OWNER_ID}")
+            await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+        try:
+            await telethon_client.run_until_disconnected()
+        finally:
+            if metrics_server is not None:
+                metrics_server.close()
+                await metrics_server.wait_closed()
+            if application.updater.running:
+                await application.updater.stop()
+            if application.running:
+                await application.stop()
+            close_update_recorder()
+            close_slow_log()
+            flushed_users = user_write_buffer.flush()
+            logger.info(f"Flushed {flushed_users} buffered users before shutdown.")
+            shutdown_async_db()
+            close_connections()
+            logger.info("Bot shutdown process completed.")
 
 
 if __name__ == "__main__":
@@ -3,20 +3,22 @@ from datetime import datetime, timezone
 from telegram import Update, constants
 from telegram.constants import ChatMemberStatus
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, ApplicationHandlerStop
+from telegram.ext import MessageHandler, filters, ContextTypes, ApplicationHandlerStop
 
-from ..core.database import set_afk, get_afk_status, clear_afk, get_user_from_db_by_username
+from ..core.database import set_afk, is_afk, get_afk_status, clear_afk, get_user_from_db_by_username
 from ..core.utils import send_safe_reply, get_readable_time_delta, create_user_html_link, safe_escape
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
+from ..core.update_context import get_update_context
 
 logger = logging.getLogger(__name__)
 
 
 # --- AFK COMMAND AND HANDLER FUNCTIONS ---
 @check_module_enabled("afk")
-@command_control("afk")
 @custom_handler("afk")
+@command_control("afk")
 async def afk_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user = update.effective_user
     message = update.effective_message
@@ -29,7 +31,7 @@ async def afk_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
     reason = " ".join(context.args) if context.args else "No reason"
     user_display_name = safe_escape(user.full_name or user.first_name)
-    if set_afk(user.id, reason):
+    if await run_write(set_afk, user.id, reason):
         await message.reply_html(f"{user_display_name} is now AFK!\n<b>Reason:</b> {safe_escape(reason)}")
     else:
         await message.reply_text("Could not set AFK status due to a database error.")
@@ -52,7 +54,7 @@ async def afk_brb_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         parts = message.text.split(' ', 1)
         reason = parts[1] if len(parts) > 1 else "No reason"
         user_display_name = safe_escape(user.full_name or user.first_name)
-        if set_afk(user.id, reason):
+        if await run_write(set_afk, user.id, reason):
             await message.reply_html(f"{user_display_name} is now AFK!\n<b>Reason:</b> {safe_escape(reason)}")
             
             raise ApplicationHandlerStop
@@ -67,13 +69,16 @@ async def check_afk_return(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     if not user or not message:
         return
 
-    afk_status = get_afk_status(user.id)
+    update_ctx = await get_update_context(update, context)
+    if not update_ctx.is_afk:
+        return
+
+    afk_status = await run_read(get_afk_status, user.id)
     if afk_status:
-        clear_afk(user.id)
+        await run_write(clear_afk, user.id)
         user_display_name = safe_escape(user.full_name or user.first_name)
-        afk_since_str = afk_status[1]
+        afk_start_time = afk_status[1]
         try:
-            afk_start_time = datetime.fromisoformat(afk_since_str)
             duration = datetime.now(timezone.utc) - afk_start_time
             duration_str = get_readable_time_delta(duration)
             time_info = f"You've been AFK for: <code>{duration_str}</code>"
@@ -101,15 +106,16 @@ async def afk_reply_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 users_to_check.add(entity.user.id)
             elif entity.type == constants.MessageEntityType.MENTION:
                 username = message.text[entity.offset:entity.offset + entity.length]
-                mentioned_user = get_user_from_db_by_username(username)
+                mentioned_user = await run_read(get_user_from_db_by_username, username)
                 if mentioned_user:
                     users_to_check.add(mentioned_user.id)
 
+    users_to_check = {user_id for user_id in users_to_check if is_afk(user_id)}
     if not users_to_check:
         return
 
     for user_id in users_to_check:
-        afk_status = get_afk_status(user_id)
+        afk_status = await run_read(get_afk_status, user_id)
         if afk_status:
             try:
                 member = await chat.get_member(user_id)
@@ -120,9 +126,8 @@ async def afk_reply_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
             try:
                 user = await context.bot.get_chat(user_id)
                 reason = afk_status[0]
-                afk_since_str = afk_status[1]
+                afk_start_time = afk_status[1]
                 
-                afk_start_time = datetime.fromisoformat(afk_since_str)
                 duration = datetime.now(timezone.utc) - afk_start_time
                 duration_str = get_readable_time_delta(duration)
                 user_display_name = safe_escape(user.full_name or user.first_name)
@@ -132,8 +137,3 @@ async def afk_reply_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 )
             except Exception as e:
                 logger.warning(f"Could not send AFK notification for user {user_id}: {e}")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("afk", afk_command))
@@ -3,12 +3,13 @@ import asyncio
 from telegram import Update
 from telegram.constants import ParseMode
 from telegram.error import BadRequest
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..config import GEMINI_API_KEY, OWNER_ID, PUBLIC_AI_ENABLED
-from ..core.utils import is_privileged_user, is_owner_or_dev, markdown_to_html, get_gemini_response
+from ..core.utils import is_owner_or_dev, markdown_to_html, get_gemini_response
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.update_context import get_update_context
 
 logger = logging.getLogger(__name__)
 
@@ -43,13 +44,13 @@ async def set_ai_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     logger.info(f"Owner {OWNER_ID} toggled public AI access to: {status_text}")
 
 @check_module_enabled("ai")
-@command_control("askai")
 @custom_handler("askai")
+@command_control("askai")
 async def ask_ai_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user = update.effective_user
 
     can_use_ai = False
-    if is_privileged_user(user.id):
+    if (await get_update_context(update, context)).is_privileged:
         can_use_ai = True
     elif PUBLIC_AI_ENABLED:
         can_use_ai = True
@@ -105,7 +106,3 @@ async def ask_ai_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         logger.error(f"Failed to process /askai request: {e}", exc_info=True)
         await update.message.reply_text(f"💥 Houston, we have a problem! My AI core malfunctioned: {type(e).__name__}")
         
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("setai", set_ai_command))
-    application.add_handler(CommandHandler("askai", ask_ai_command))
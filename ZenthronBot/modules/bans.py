@@ -3,12 +3,13 @@ from datetime import datetime, timezone
 from telegram import Update, User, Chat
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes, ChatMemberHandler
+from telegram.ext import ContextTypes, ChatMemberHandler
 
 from ..core.database import remove_chat_from_db
 from ..core.utils import _can_user_perform_action, resolve_user_with_telethon, parse_duration_to_timedelta, create_user_html_link, send_safe_reply, safe_escape, is_entity_a_user
 from ..core.decorators import check_module_enabled
 from ..core.handlers import custom_handler
+from ..core.async_database import run_write
 
 logger = logging.getLogger(__name__)
 
@@ -334,12 +335,4 @@ async def handle_bot_banned(update: Update, context: ContextTypes.DEFAULT_TYPE)
         
         chat = update_data.chat
         logger.warning(f"Bot was banned from chat {chat.title} [{chat.id}]. Removing from DB.")
-        remove_chat_from_db(chat.id)
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("ban", ban_command))
-    application.add_handler(CommandHandler("dban", dban_command))
-    application.add_handler(CommandHandler("tban", tban_command))
-    application.add_handler(CommandHandler("unban", unban_command))
+        await run_write(remove_chat_from_db, chat.id)
@@ -3,13 +3,15 @@ import logging
 from datetime import datetime, timezone, timedelta
 from telegram import Update, User, Chat
 from telegram.constants import ParseMode, ChatType
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, ApplicationHandlerStop
+from telegram.ext import MessageHandler, filters, ContextTypes, ApplicationHandlerStop
 
 from ..config import OWNER_ID, APPEAL_CHAT_ID
 from ..core.database import add_to_blacklist, remove_from_blacklist, get_blacklist_reason, is_user_blacklisted, is_whitelisted, is_sudo_user 
 from ..core.utils import is_privileged_user, is_owner_or_dev, resolve_user_with_telethon, create_user_html_link, safe_escape, send_operational_log, is_entity_a_user
 from ..core.decorators import check_module_enabled
 from ..core.handlers import custom_handler
+from ..core.update_context import get_update_context
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +72,7 @@ async def blacklist_user_command(update: Update, context: ContextTypes.DEFAULT_T
 
     user_display = create_user_html_link(target_entity)
 
-    existing_blist_reason = get_blacklist_reason(target_entity.id)
+    existing_blist_reason = await run_read(get_blacklist_reason, target_entity.id)
     if existing_blist_reason:
         await message.reply_html(
             f"ℹ️ User {user_display} [<code>{target_entity.id}</code>] is already <b>blacklisted</b>.\n"
@@ -82,7 +84,7 @@ async def blacklist_user_command(update: Update, context: ContextTypes.DEFAULT_T
     await message.reply_html(prepare_message)
     await asyncio.sleep(1.0)
 
-    if add_to_blacklist(target_entity.id, user.id, reason):
+    if await run_write(add_to_blacklist, target_entity.id, user.id, reason):
         success_message = f"✅ Done! {user_display} [<code>{target_entity.id}</code>] has been <b>blacklisted</b>.\n<b>Reason:</b> {safe_escape(reason)}"
         await message.reply_html(success_message)
         
@@ -149,7 +151,7 @@ async def unblacklist_user_command(update: Update, context: ContextTypes.DEFAULT
     await message.reply_html(prepare_message)
     await asyncio.sleep(1.0)
 
-    if remove_from_blacklist(target_entity.id):
+    if await run_write(remove_from_blacklist, target_entity.id):
         success_message = f"✅ Done! {user_display} [<code>{target_entity.id}</code>] has been <b>unblacklisted</b>."
         await message.reply_html(success_message)
         
@@ -178,11 +180,9 @@ async def check_blacklist_handler(update: Update, context: ContextTypes.DEFAULT_
 
     user = update.effective_user
     chat = update.effective_chat
+    update_ctx = await get_update_context(update, context)
 
-    if user.id == OWNER_ID:
-        return
-        
-    if not is_user_blacklisted(user.id):
+    if update_ctx.is_owner or not update_ctx.is_blacklisted:
         return
 
     always_allowed_commands = ['/start', '/help', '/info', '/rules', '/warns', '/warnings']
@@ -205,9 +205,3 @@ async def check_blacklist_handler(update: Update, context: ContextTypes.DEFAULT_
     logger.info(f"User {user.id} ({user_mention_log}) is blacklisted. Blocking command: '{message_text_preview}'")
     
     raise ApplicationHandlerStop
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler(["blacklist", "blist"],  blacklist_user_command))
-    application.add_handler(CommandHandler(["unblacklist", "unblist"], unblacklist_user_command))
@@ -4,7 +4,7 @@ import re
 from telegram import Update
 from telegram.constants import ChatType
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.utils import safe_escape
 from ..core.decorators import check_module_enabled, command_control
@@ -15,8 +15,8 @@ logger = logging.getLogger(__name__)
 
 # --- LIST ADMINS COMMAND FUNCTION ---
 @check_module_enabled("chatadmins")
+@custom_handler(["chatadmins", "admins", "listadmins"])
 @command_control("chatadmins")
-@custom_handler("chatadmins")
 async def list_admins_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat = update.effective_chat
 
@@ -95,8 +95,3 @@ async def list_admins_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             await update.message.reply_text("Error: The admin list is too long to display, and I couldn't send it as a file.")
     else:
         await update.message.reply_html(message_text, disable_web_page_preview=True)
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler(["listadmins", "admins"], list_admins_command))
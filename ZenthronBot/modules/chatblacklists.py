@@ -1,7 +1,6 @@
 import logging
-from datetime import datetime, timezone
 from telegram import Update
-from telegram.ext import Application, CommandHandler, ChatMemberHandler, ContextTypes
+from telegram.ext import ChatMemberHandler, ContextTypes
 from telegram.constants import ParseMode, ChatType
 from telegram.error import TelegramError
 
@@ -9,6 +8,7 @@ from ..core.database import blacklist_chat, unblacklist_chat, get_blacklisted_ch
 from ..core.utils import is_owner_or_dev, safe_escape
 from ..core.decorators import check_module_enabled
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +22,11 @@ async def check_blacklisted_chat_on_join(update: Update, context: ContextTypes.D
     
     was_added = new_member_status.status in ["member", "administrator"]
 
-    if was_added and is_chat_blacklisted(chat.id):
+    if was_added and await run_read(is_chat_blacklisted, chat.id):
         logger.warning(f"Bot was added to a blacklisted chat: {chat.title} ({chat.id}). Leaving immediately.")
         try:
             await context.bot.leave_chat(chat.id)
-            remove_chat_from_db(chat.id)
+            await run_write(remove_chat_from_db, chat.id)
         except Exception as e:
             logger.error(f"Failed to leave blacklisted chat {chat.id}: {e}")
 
@@ -60,7 +60,7 @@ async def blacklist_chat_command(update: Update, context: ContextTypes.DEFAULT_T
     chat_id = chat_to_bl.id
     chat_name = chat_to_bl.title or chat_to_bl.first_name or f"Unknown Chat"
 
-    if blacklist_chat(chat_id, chat_name):
+    if await run_write(blacklist_chat, chat_id, chat_name):
         await update.message.reply_html(f"✅ Done! Chat <code>{chat_id}</code> has been blacklisted.")
         try:
             await context.bot.leave_chat(chat_id)
@@ -86,7 +86,7 @@ async def unblacklist_chat_command(update: Update, context: ContextTypes.DEFAULT
             await update.message.reply_text("Invalid chat ID.")
             return
 
-    if unblacklist_chat(chat_id_to_unbl):
+    if await run_write(unblacklist_chat, chat_id_to_unbl):
         await update.message.reply_html(f"✅ Done! Chat <code>{chat_id_to_unbl}</code> has been unblacklisted.")
     else:
         await update.message.reply_html("This chat was not on the blacklist.")
@@ -99,14 +99,14 @@ async def list_blacklisted_chats_command(update: Update, context: ContextTypes.D
       logger.warning(f"Unauthorized /blchats attempt by user {user.id}.")
       return
 
-    blacklisted = get_blacklisted_chats()
+    blacklisted = await run_read(get_blacklisted_chats)
     if not blacklisted:
         await update.message.reply_text("No chats are currently blacklisted.")
         return
         
     message = "<b>Blacklisted Chats:</b>\n\n"
-    for chat_id, chat_name, timestamp in blacklisted:
-        date_added = datetime.fromisoformat(timestamp).strftime('%Y-%m-%d %H:%M')
+    for chat_id, chat_name, added_at in blacklisted:
+        date_added = added_at.strftime('%Y-%m-%d %H:%M')
         message += f"• <b>{safe_escape(chat_name)}</b> [<code>{chat_id}</code>]\n"
         message += f"Added: <code>{date_added}</code>\n\n"
 
@@ -117,9 +117,3 @@ async def list_blacklisted_chats_command(update: Update, context: ContextTypes.D
             await update.message.reply_document(document=file)
     else:
         await update.message.reply_html(message)
-
-
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("blchat", blacklist_chat_command))
-    application.add_handler(CommandHandler("unblchat", unblacklist_chat_command))
-    application.add_handler(CommandHandler("blchats", list_blacklisted_chats_command))
@@ -13,9 +13,9 @@ from telegram import __version__ as ptb_version
 from telethon import __version__ as telethon_version
 from telegram.constants import ParseMode, ChatType, ChatMemberStatus
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
-from ..config import BOT_START_TIME, DB_NAME, OWNER_ID, ADMIN_LOG_CHAT_ID
+from ..config import BOT_START_TIME, OWNER_ID, ADMIN_LOG_CHAT_ID
 from ..core.database import (
     get_all_bot_chats_from_db, remove_chat_from_db_by_id,
     get_all_dev_users_from_db, add_dev_user, remove_dev_user,
@@ -24,7 +24,7 @@ from ..core.database import (
     get_all_whitelist_users_from_db, add_to_whitelist, remove_from_whitelist,
     is_dev_user, is_sudo_user, is_support_user,
     is_whitelisted, get_gban_reason, get_blacklist_reason,
-    get_user_from_db_by_username, delete_user_from_db
+    get_user_from_db_by_username, delete_user_from_db, get_table_counts
 )
 from ..core.utils import (
     is_owner_or_dev, get_readable_time_delta, safe_escape, resolve_user_with_telethon,
@@ -33,6 +33,13 @@ from ..core.utils import (
 from ..core.constants import LEAVE_TEXTS
 from ..core.decorators import check_module_enabled
 from ..core.handlers import custom_handler
+from ..core.async_database import get_async_db_stats, run_read, run_write
+from ..core.update_context import get_update_context
+from ..core.user_buffer import user_write_buffer
+from ..core.query_stats import query_stats
+from ..core.connection import get_backend
+from ..core.update_processor import ChatOrderedUpdateProcessor, IntakeQueue
+from ..core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +104,18 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         f"<b>• SQLite:</b> <code>{sqlite_version}</code>",
     ]
 
+    db_stats = get_async_db_stats()
+    status_lines += [
+        "",
+        "<b>Database Load:</b>",
+        f"<b>• Backend:</b> <code>{safe_escape(get_backend().describe())}</code>",
+        f"<b>• Write Queue:</b> <code>{db_stats['write_queue_depth']}</code>",
+        f"<b>• Reads In Flight:</b> <code>{db_stats['reads_in_flight']}</code>",
+        f"<b>• Reads:</b> <code>{db_stats['reads']['count']} (avg {db_stats['reads']['avg_ms']:.1f}ms, max {db_stats['reads']['max_ms']:.1f}ms)</code>",
+        f"<b>• Writes:</b> <code>{db_stats['writes']['count']} (avg {db_stats['writes']['avg_ms']:.1f}ms, max {db_stats['writes']['max_ms']:.1f}ms)</code>",
+        f"<b>• Write Queue Wait:</b> <code>avg {db_stats['write_wait']['avg_ms']:.1f}ms, max {db_stats['write_wait']['max_ms']:.1f}ms</code>",
+    ]
+
     status_msg = "\n".join(status_lines)
     await update.message.reply_html(status_msg)
 
@@ -108,51 +127,20 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         logger.warning(f"Unauthorized /stats attempt by user {user.id}.")
         return
 
-    known_users_count = "N/A"
-    blacklisted_count = "N/A"
-    developer_users_count = "N/A"
-    sudo_users_count = "N/A"
-    support_users_count = "N/A"
-    whitelist_users_count = "N/A"
-    blacklisted_chats_count = "N/A"
-    gban_count = "N/A"
-    chat_count = "N/A"
-
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM users")
-            known_users_count = str(cursor.fetchone()[0])
-
-            cursor.execute("SELECT COUNT(*) FROM blacklist")
-            blacklisted_count = str(cursor.fetchone()[0])
-
-            cursor.execute("SELECT COUNT(*) FROM dev_users")
-            developer_users_count = str(cursor.fetchone()[0])
-                
-            cursor.execute("SELECT COUNT(*) FROM sudo_users")
-            sudo_users_count = str(cursor.fetchone()[0])
+    counts = await run_read(get_table_counts)
 
-            cursor.execute("SELECT COUNT(*) FROM support_users")
-            support_users_count = str(cursor.fetchone()[0])
+    def count_of(table: str) -> str:
+        return str(counts[table]) if table in counts else "DB Error"
 
-            cursor.execute("SELECT COUNT(*) FROM whitelist_users")
-            whitelist_users_count = str(cursor.fetchone()[0])
-
-            cursor.execute("SELECT COUNT(*) FROM chat_blacklist")
-            blacklisted_chats_count = str(cursor.fetchone()[0])
-
-            cursor.execute("SELECT COUNT(*) FROM global_bans")
-            gban_count = str(cursor.fetchone()[0])
-                
-            cursor.execute("SELECT COUNT(*) FROM bot_chats")
-            chat_count = str(cursor.fetchone()[0])
-            
-    except sqlite3.Error as e:
-        logger.error(f"SQLite error fetching counts for /stats: {e}", exc_info=True)
-        (known_users_count, blacklisted_count, developer_users_count, sudo_users_count, 
-         support_users_count, whitelist_users_count, blacklisted_chats_count, gban_count, chat_count) = ("DB Error",) * 7
+    known_users_count = count_of("users")
+    blacklisted_count = count_of("blacklist")
+    developer_users_count = count_of("dev_users")
+    sudo_users_count = count_of("sudo_users")
+    support_users_count = count_of("support_users")
+    whitelist_users_count = count_of("whitelist_users")
+    blacklisted_chats_count = count_of("chat_blacklist")
+    gban_count = count_of("global_bans")
+    chat_count = count_of("bot_chats")
 
     stats_lines = [
         "<b>📊 Bot Database Stats:</b>\n",
@@ -170,11 +158,125 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     stats_msg = "\n".join(stats_lines)
     await update.message.reply_html(stats_msg)
 
+@check_module_enabled("core")
+@custom_handler("dbstats")
+async def dbstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user = update.effective_user
+    if user.id != OWNER_ID:
+        logger.warning(f"Unauthorized /dbstats attempt by user {user.id}.")
+        return
+
+    order_by = context.args[0].lower() if context.args else "total"
+    if order_by == "reset":
+        query_stats.reset()
+        await update.message.reply_text("Query statistics have been reset.")
+        return
+    if order_by not in ("total", "calls", "avg", "p95"):
+        await update.message.reply_text("Usage: /dbstats [total/calls/avg/p95/reset]")
+        return
+
+    top = query_stats.top(limit=10, order_by=order_by)
+    if not top:
+        await update.message.reply_text("No queries have been recorded yet.")
+        return
+
+    since = datetime.fromtimestamp(query_stats.started_at, timezone.utc).strftime('%Y-%m-%d %H:%M')
+    lines = [f"<b>🗄 Top queries by {order_by}</b> <i>(since {since} UTC)</i>\n"]
+    for i, item in enumerate(top, start=1):
+        sql = item["sql"] if len(item["sql"]) <= 200 else item["sql"][:200] + "..."
+        lines.append(
+            f"<b>{i}.</b> <code>{html.escape(sql)}</code>\n"
+            f"calls <code>{item['calls']}</code> · rows returned <code>{item['rows']}</code> · affected <code>{item['affected']}</code> · "
+            f"errors <code>{item['errors']}</code>\n"
+            f"total <code>{item['total_ms']:.1f} ms</code> · avg <code>{item['avg_ms']:.2f}</code> · "
+            f"p50 <code>{item['p50_ms']:.2f}</code> · p95 <code>{item['p95_ms']:.2f}</code> · "
+            f"p99 <code>{item['p99_ms']:.2f}</code> · max <code>{item['max_ms']:.2f} ms</code>\n"
+        )
+
+    await update.message.reply_html("\n".join(lines)[:4096])
+
+@check_module_enabled("core")
+@custom_handler("queues")
+async def queues_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user = update.effective_user
+    if user.id != OWNER_ID:
+        logger.warning(f"Unauthorized /queues attempt by user {user.id}.")
+        return
+
+    lines = ["<b>📥 Update queues</b>\n"]
+    intake = context.application.update_queue
+    if isinstance(intake, IntakeQueue):
+        lines.append(f"<b>• Intake:</b> <code>{intake.pending}/{intake.limit}</code>")
+
+    processor = context.application.update_processor
+    if not isinstance(processor, ChatOrderedUpdateProcessor):
+        lines.append("<i>Updates are processed sequentially (CONCURRENT_UPDATES is 1).</i>")
+        await update.message.reply_html("\n".join(lines))
+        return
+
+    load = processor.snapshot(limit=10)
+    lines += [
+        f"<b>• Running:</b> <code>{load['running']}/{load['max_workers']}</code>",
+        f"<b>• Queued:</b> <code>{load['queued']}</code>",
+        f"<b>• Active chats:</b> <code>{load['active_chats']}</code>",
+    ]
+    if load["chats"]:
+        lines.append("\n<b>Busiest chats:</b>")
+        for item in load["chats"]:
+            lines.append(
+                f"• <code>{item['chat_id']}</code>: in flight <code>{item['in_flight']}</code> · queued <code>{item['queued']}</code>"
+            )
+
+    await update.message.reply_html("\n".join(lines))
+
+@check_module_enabled("core")
+@custom_handler("metrics")
+async def metrics_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user = update.effective_user
+    if user.id != OWNER_ID:
+        logger.warning(f"Unauthorized /metrics attempt by user {user.id}.")
+        return
+
+    order_by = context.args[0].lower() if context.args else "p95"
+    if order_by == "reset":
+        metrics.reset()
+        await update.message.reply_text("Handler metrics have been reset.")
+        return
+    if order_by not in ("p95", "p99", "total", "calls", "errors"):
+        await update.message.reply_text("Usage: /metrics [p95/p99/total/calls/errors/reset]")
+        return
+
+    updates = metrics.update_summary()
+    since = datetime.fromtimestamp(metrics.started_at, timezone.utc).strftime('%Y-%m-%d %H:%M')
+    lines = [
+        f"<b>⏱ Handler latency by {order_by}</b> <i>(since {since} UTC)</i>\n",
+        f"<b>Updates:</b> <code>{updates['calls']}</code> · p50 <code>{updates['p50_ms']:.1f}</code> · "
+        f"p95 <code>{updates['p95_ms']:.1f}</code> · p99 <code>{updates['p99_ms']:.1f}</code> · max <code>{updates['max_ms']:.1f} ms</code>\n",
+    ]
+    for i, item in enumerate(metrics.top_handlers(limit=10, order_by=order_by), start=1):
+        lines.append(
+            f"<b>{i}.</b> <code>{html.escape(item['handler'])}</code> (group <code>{item['group']}</code>)\n"
+            f"calls <code>{item['calls']}</code> · errors <code>{item['errors']}</code> · "
+            f"p50 <code>{item['p50_ms']:.1f}</code> · p95 <code>{item['p95_ms']:.1f}</code> · p99 <code>{item['p99_ms']:.1f} ms</code>\n"
+            f"total <code>{item['total_ms']:.0f}</code> · in API <code>{item['api_ms']:.0f}</code> · in DB <code>{item['db_ms']:.0f} ms</code>\n"
+        )
+
+    api_methods = metrics.top_api_methods(limit=5)
+    if api_methods:
+        lines.append("<b>Bot API:</b>")
+        for item in api_methods:
+            lines.append(
+                f"• <code>{item['method']}</code>: <code>{item['calls']}</code> calls · errors <code>{item['errors']}</code> · "
+                f"p50 <code>{item['p50_ms']:.0f}</code> · p95 <code>{item['p95_ms']:.0f} ms</code>"
+            )
+
+    await update.message.reply_html("\n".join(lines)[:4096])
+
 @check_module_enabled("core")
 @custom_handler("ping")
 async def ping_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user = update.effective_user
-    if not is_privileged_user(user.id):
+    if not (await get_update_context(update, context)).is_privileged:
         logger.warning(f"Unauthorized /ping attempt by user {user.id}.")
         return
     
@@ -539,7 +641,7 @@ async def list_sudo_users_command(update: Update, context: ContextTypes.DEFAULT_
         logger.warning(f"Unauthorized /listsudo attempt by user {user.id}.")
         return
 
-    sudo_user_tuples = get_all_sudo_users_from_db()
+    sudo_user_tuples = await run_read(get_all_sudo_users_from_db)
 
     if not sudo_user_tuples:
         await update.message.reply_text("There are currently no users with sudo privileges.")
@@ -547,7 +649,7 @@ async def list_sudo_users_command(update: Update, context: ContextTypes.DEFAULT_
 
     response_lines = ["<b>🛡️ Sudo Users List:</b>\n"]
     
-    for user_id, timestamp_str in sudo_user_tuples:
+    for user_id, added_at in sudo_user_tuples:
         user_display_name = f"<code>{user_id}</code>"
 
         try:
@@ -560,7 +662,7 @@ async def list_sudo_users_command(update: Update, context: ContextTypes.DEFAULT_
             if name_parts:
                 user_display_name = " ".join(name_parts) + f" [<code>{user_id}</code>]"
         except Exception:
-            user_obj_from_db = get_user_from_db_by_username(str(user_id))
+            user_obj_from_db = await run_read(get_user_from_db_by_username, str(user_id))
             if user_obj_from_db:
                 display_name_parts = []
                 if user_obj_from_db.first_name: display_name_parts.append(safe_escape(user_obj_from_db.first_name))
@@ -569,12 +671,7 @@ async def list_sudo_users_command(update: Update, context: ContextTypes.DEFAULT_
                 if display_name_parts:
                     user_display_name = " ".join(display_name_parts) + f" [<code>{user_id}</code>]"
 
-        formatted_added_time = timestamp_str
-        try:
-            dt_obj = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            formatted_added_time = dt_obj.strftime('%Y-%m-%d %H:%M')
-        except (ValueError, TypeError):
-            logger.warning(f"Could not parse timestamp '{timestamp_str}' for sudo user {user_id}")
+        formatted_added_time = added_at.strftime('%Y-%m-%d %H:%M') if added_at else "N/A"
 
         response_lines.append(f"• {user_display_name}\n<b>Added:</b> <code>{formatted_added_time}</code>\n")
 
@@ -594,7 +691,7 @@ async def listsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         logger.warning(f"Unauthorized /listsupport attempt by user {user.id}.")
         return
 
-    support_user_tuples = get_all_support_users_from_db()
+    support_user_tuples = await run_read(get_all_support_users_from_db)
 
     if not support_user_tuples:
         await update.message.reply_text("There are currently no users in the Support team.")
@@ -602,7 +699,7 @@ async def listsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     response_lines = [f"<b>👷‍♂️ Support Users List:</b>\n"]
     
-    for user_id, timestamp_str in support_user_tuples:
+    for user_id, added_at in support_user_tuples:
         user_display_name = f"<code>{user_id}</code>"
 
         try:
@@ -615,7 +712,7 @@ async def listsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             if name_parts:
                 user_display_name = " ".join(name_parts) + f" [<code>{user_id}</code>]"
         except Exception:
-            user_obj_from_db = get_user_from_db_by_username(str(user_id))
+            user_obj_from_db = await run_read(get_user_from_db_by_username, str(user_id))
             if user_obj_from_db:
                 display_name_parts = []
                 if user_obj_from_db.first_name: display_name_parts.append(safe_escape(user_obj_from_db.first_name))
@@ -624,12 +721,7 @@ async def listsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE
                 if display_name_parts:
                     user_display_name = " ".join(display_name_parts) + f" [<code>{user_id}</code>]"
 
-        formatted_added_time = timestamp_str
-        try:
-            dt_obj = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            formatted_added_time = dt_obj.strftime('%Y-%m-%d %H:%M')
-        except (ValueError, TypeError):
-            logger.warning(f"Could not parse timestamp '{timestamp_str}' for support user {user_id}")
+        formatted_added_time = added_at.strftime('%Y-%m-%d %H:%M') if added_at else "N/A"
 
         response_lines.append(f"• {user_display_name}\n<b>Added:</b> <code>{formatted_added_time}</code>\n")
 
@@ -644,7 +736,7 @@ async def listwhitelist_command(update: Update, context: ContextTypes.DEFAULT_TY
         logger.warning(f"Unauthorized /listwhitelist attempt by user {user.id}.")
         return
 
-    whitelist_user_tuples = get_all_whitelist_users_from_db()
+    whitelist_user_tuples = await run_read(get_all_whitelist_users_from_db)
 
     if not whitelist_user_tuples:
         await update.message.reply_text("There are currently no users in the Whitelist.")
@@ -652,7 +744,7 @@ async def listwhitelist_command(update: Update, context: ContextTypes.DEFAULT_TY
 
     response_lines = [f"<b>🔰 Whitelist Users List:</b>\n"]
     
-    for user_id, timestamp_str in whitelist_user_tuples:
+    for user_id, added_at in whitelist_user_tuples:
         user_display_name = f"<code>{user_id}</code>"
 
         try:
@@ -665,7 +757,7 @@ async def listwhitelist_command(update: Update, context: ContextTypes.DEFAULT_TY
             if name_parts:
                 user_display_name = " ".join(name_parts) + f" [<code>{user_id}</code>]"
         except Exception:
-            user_obj_from_db = get_user_from_db_by_username(str(user_id))
+            user_obj_from_db = await run_read(get_user_from_db_by_username, str(user_id))
             if user_obj_from_db:
                 display_name_parts = []
                 if user_obj_from_db.first_name: display_name_parts.append(safe_escape(user_obj_from_db.first_name))
@@ -674,12 +766,7 @@ async def listwhitelist_command(update: Update, context: ContextTypes.DEFAULT_TY
                 if display_name_parts:
                     user_display_name = " ".join(display_name_parts) + f" [<code>{user_id}</code>]"
 
-        formatted_added_time = timestamp_str
-        try:
-            dt_obj = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            formatted_added_time = dt_obj.strftime('%Y-%m-%d %H:%M')
-        except (ValueError, TypeError):
-            logger.warning(f"Could not parse timestamp '{timestamp_str}' for support user {user_id}")
+        formatted_added_time = added_at.strftime('%Y-%m-%d %H:%M') if added_at else "N/A"
 
         response_lines.append(f"• {user_display_name}\n<b>Added:</b> <code>{formatted_added_time}</code>\n")
 
@@ -693,7 +780,7 @@ async def listdevs_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     if not is_owner_or_dev(user.id):
         return
 
-    dev_user_tuples = get_all_dev_users_from_db()
+    dev_user_tuples = await run_read(get_all_dev_users_from_db)
 
     if not dev_user_tuples:
         await update.message.reply_text("There are currently no users with Developer role.")
@@ -701,7 +788,7 @@ async def listdevs_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
     response_lines = [f"<b>🛃 Developer Users List:</b>\n"]
     
-    for user_id, timestamp_str in dev_user_tuples:
+    for user_id, added_at in dev_user_tuples:
         user_display_name = f"<code>{user_id}</code>"
 
         try:
@@ -714,7 +801,7 @@ async def listdevs_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             if name_parts:
                 user_display_name = " ".join(name_parts) + f" [<code>{user_id}</code>]"
         except Exception:
-            user_obj_from_db = get_user_from_db_by_username(str(user_id))
+            user_obj_from_db = await run_read(get_user_from_db_by_username, str(user_id))
             if user_obj_from_db:
                 display_name_parts = []
                 if user_obj_from_db.first_name: display_name_parts.append(safe_escape(user_obj_from_db.first_name))
@@ -723,12 +810,7 @@ async def listdevs_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
                 if display_name_parts:
                     user_display_name = " ".join(display_name_parts) + f" [<code>{user_id}</code>]"
 
-        formatted_added_time = timestamp_str
-        try:
-            dt_obj = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            formatted_added_time = dt_obj.strftime('%Y-%m-%d %H:%M')
-        except (ValueError, TypeError):
-            logger.warning(f"Could not parse timestamp '{timestamp_str}' for dev user {user_id}")
+        formatted_added_time = added_at.strftime('%Y-%m-%d %H:%M') if added_at else "N/A"
 
         response_lines.append(f"• {user_display_name}\n<b>Added:</b> <code>{formatted_added_time}</code>\n")
 
@@ -743,7 +825,7 @@ async def list_groups_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         logger.warning(f"Unauthorized /listgroups attempt by user {user.id}.")
         return
 
-    bot_chats = get_all_bot_chats_from_db()
+    bot_chats = await run_read(get_all_bot_chats_from_db)
 
     if not bot_chats:
         await update.message.reply_text("The bot is not currently in any known groups.")
@@ -751,14 +833,9 @@ async def list_groups_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     response_lines = [f"<b>📊 List of all known groups; <code>{len(bot_chats)}</code> total:</b>\n\n"]
     
-    for chat_id, chat_title, added_at_str in bot_chats:
+    for chat_id, chat_title, added_at in bot_chats:
         display_title = safe_escape(chat_title or "Untitled Group")
-        
-        try:
-            dt_obj = datetime.fromisoformat(added_at_str.replace("Z", "+00:00"))
-            formatted_added_time = dt_obj.strftime('%Y-%m-%d %H:%M')
-        except (ValueError, TypeError):
-            formatted_added_time = added_at_str[:16] if added_at_str else "N/A"
+        formatted_added_time = added_at.strftime('%Y-%m-%d %H:%M') if added_at else "N/A"
 
         response_lines.append(
             f"• <b>{display_title}</b> [<code>{chat_id}</code>]\n"
@@ -793,7 +870,7 @@ async def del_groups_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     for chat_id_str in context.args:
         try:
             chat_id_to_delete = int(chat_id_str)
-            if remove_chat_from_db_by_id(chat_id_to_delete):
+            if await run_write(remove_chat_from_db_by_id, chat_id_to_delete):
                 deleted_chats.append(f"<code>{chat_id_to_delete}</code>")
             else:
                 failed_chats.append(f"<code>{chat_id_to_delete}</code> (not found)")
@@ -826,7 +903,7 @@ async def clean_groups_command(update: Update, context: ContextTypes.DEFAULT_TYP
 
     status_message = await update.message.reply_html("🧹 Starting group cache cleanup... This may take a while. Please wait.")
 
-    all_chat_ids_from_db = [chat[0] for chat in get_all_bot_chats_from_db()]
+    all_chat_ids_from_db = [chat[0] for chat in await run_read(get_all_bot_chats_from_db)]
     
     if not all_chat_ids_from_db:
         await status_message.edit_text("✅ Chat cache is already empty. Nothing to do.")
@@ -856,7 +933,7 @@ async def clean_groups_command(update: Update, context: ContextTypes.DEFAULT_TYP
             except TelegramError as e:
                 if "not found" in str(e).lower() or "forbidden" in str(e).lower() or "chat not found" in str(e).lower():
                     logger.info(f"Chat {chat_id} not found or access is forbidden. Removing from cache.")
-                    if remove_chat_from_db_by_id(chat_id):
+                    if await run_write(remove_chat_from_db_by_id, chat_id):
                         removed_chats_count += 1
                 else:
                     logger.warning(f"Unexpected API error while checking chat {chat_id}: {e}")
@@ -892,7 +969,7 @@ async def broadcast_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     text_to_broadcast = " ".join(context.args)
 
-    all_chats = get_all_bot_chats_from_db()
+    all_chats = await run_read(get_all_bot_chats_from_db)
     if not all_chats:
         await message.reply_text("I'm not in any chats to broadcast to.")
         return
@@ -1043,8 +1120,8 @@ async def addsudo_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.reply_text("This user cannot be a sudo.")
         return
     
-    gban_reason = get_gban_reason(target_user.id)
-    blist_reason = get_blacklist_reason(target_user.id)
+    gban_reason = await run_read(get_gban_reason, target_user.id)
+    blist_reason = await run_read(get_blacklist_reason, target_user.id)
 
     if gban_reason:
         error_message = (
@@ -1068,7 +1145,7 @@ async def addsudo_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.reply_html(error_message)
         return
 
-    if add_sudo_user(target_user.id, user.id):
+    if await run_write(add_sudo_user, target_user.id, user.id):
         await message.reply_html(f"✅ Done! {user_display} [<code>{target_user.id}</code>] has been granted <b>Sudo</b> powers.")
         
         try:
@@ -1143,7 +1220,7 @@ async def delsudo_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.reply_html(f"ℹ️ User {user_display} [<code>{target_user.id}</code>] does not have <b>Sudo</b> powers.")
         return
 
-    if remove_sudo_user(target_user.id):
+    if await run_write(remove_sudo_user, target_user.id):
         await message.reply_html(f"✅ Done! <b>Sudo</b> powers for user {user_display} [<code>{target_user.id}</code>] have been revoked.")
         
         try:
@@ -1249,17 +1326,17 @@ async def setrank_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.reply_text(f"User is already a {new_role_full_name}. No changes made.")
         return
 
-    remove_support_user(target_user.id)
-    remove_sudo_user(target_user.id)
-    remove_dev_user(target_user.id)
+    await run_write(remove_support_user, target_user.id)
+    await run_write(remove_sudo_user, target_user.id)
+    await run_write(remove_dev_user, target_user.id)
 
     success = False
     if new_role_shortcut == "support":
-        success = add_support_user(target_user.id, user.id)
+        success = await run_write(add_support_user, target_user.id, user.id)
     elif new_role_shortcut == "sudo":
-        success = add_sudo_user(target_user.id, user.id)
+        success = await run_write(add_sudo_user, target_user.id, user.id)
     elif new_role_shortcut == "dev":
-        success = add_dev_user(target_user.id, user.id)
+        success = await run_write(add_dev_user, target_user.id, user.id)
 
     if success:
         user_display = create_user_html_link(target_user)
@@ -1332,7 +1409,7 @@ async def addsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await message.reply_text("This user cannot be a Support.")
         return
     
-    gban_reason = get_gban_reason(target_user.id)
+    gban_reason = await run_read(get_gban_reason, target_user.id)
     if gban_reason:
         await message.reply_html(
             f"❌ <b>Promotion Failed!</b>\n\n"
@@ -1342,7 +1419,7 @@ async def addsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             f"Please remove global ban first using /ungban if you wish to proceed.</i>"
         )
         return
-    blist_reason = get_blacklist_reason(target_user.id)
+    blist_reason = await run_read(get_blacklist_reason, target_user.id)
     if blist_reason:
         await message.reply_html(
             f"❌ <b>Promotion Failed!</b>\n\n"
@@ -1353,7 +1430,7 @@ async def addsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
 
-    if add_support_user(target_user.id, user.id):
+    if await run_write(add_support_user, target_user.id, user.id):
         await message.reply_html(f"✅ Done! {user_display} [<code>{target_user.id}</code>] has been granted <b>Support</b> powers.")
         
         try:
@@ -1421,7 +1498,7 @@ async def delsupport_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await message.reply_html(f"ℹ️ User {user_display} [<code>{target_user.id}</code>] is not in Support.")
         return
 
-    if remove_support_user(target_user.id):
+    if await run_write(remove_support_user, target_user.id):
         await message.reply_html(f"✅ Done! <b>Support</b> role for user {user_display} [<code>{target_user.id}</code>] has been revoked.")
         
         try:
@@ -1496,7 +1573,7 @@ async def adddev_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.reply_text("This user cannot be a Developer.")
         return
     
-    gban_reason = get_gban_reason(target_user.id)
+    gban_reason = await run_read(get_gban_reason, target_user.id)
     if gban_reason:
         await message.reply_html(
             f"❌ <b>Promotion Failed!</b>\n\n"
@@ -1506,7 +1583,7 @@ async def adddev_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             f"Please remove global ban first using /ungban if you wish to proceed.</i>"
         )
         return
-    blist_reason = get_blacklist_reason(target_user.id)
+    blist_reason = await run_read(get_blacklist_reason, target_user.id)
     if blist_reason:
         await message.reply_html(
             f"❌ <b>Promotion Failed!</b>\n\n"
@@ -1517,7 +1594,7 @@ async def adddev_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         return
 
-    if add_dev_user(target_user.id, user.id):
+    if await run_write(add_dev_user, target_user.id, user.id):
         await message.reply_html(f"✅ Done! {user_display} [<code>{target_user.id}</code>] has been granted <b>Developer</b> powers.")
         
         try:
@@ -1582,7 +1659,7 @@ async def deldev_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.reply_html(f"ℹ️ User {user_display} [<code>{target_user.id}</code>] is not a Developer.")
         return
 
-    if remove_dev_user(target_user.id):
+    if await run_write(remove_dev_user, target_user.id):
         await message.reply_html(f"✅ Done! <b>Developer</b> role for user {user_display} [<code>{target_user.id}</code>] has been revoked.")
         
         try:
@@ -1646,7 +1723,7 @@ async def whitelist_user_command(update: Update, context: ContextTypes.DEFAULT_T
         await message.reply_html(f"User {user_display} already has a privileged or protected role and cannot be whitelisted.")
         return
 
-    gban_reason = get_gban_reason(target_user.id)
+    gban_reason = await run_read(get_gban_reason, target_user.id)
     if gban_reason:
         await message.reply_html(
             f"❌ <b>Promotion Failed!</b>\n\n"
@@ -1656,7 +1733,7 @@ async def whitelist_user_command(update: Update, context: ContextTypes.DEFAULT_T
             f"Please remove global ban first using /ungban if you wish to proceed.</i>"
         )
         return
-    blist_reason = get_blacklist_reason(target_user.id)
+    blist_reason = await run_read(get_blacklist_reason, target_user.id)
     if blist_reason:
         await message.reply_html(
             f"❌ <b>Promotion Failed!</b>\n\n"
@@ -1675,7 +1752,7 @@ async def whitelist_user_command(update: Update, context: ContextTypes.DEFAULT_T
     await message.reply_html(prepare_message)
     await asyncio.sleep(1.0)
 
-    if add_to_whitelist(target_user.id, user.id):
+    if await run_write(add_to_whitelist, target_user.id, user.id):
         await message.reply_html(f"✅ Done! {user_display} [<code>{target_user.id}</code>] has been <b>whitelisted</b>.")
         
         try:
@@ -1739,7 +1816,7 @@ async def unwhitelist_user_command(update: Update, context: ContextTypes.DEFAULT
     await asyncio.sleep(1.0)
 
     user_display = create_user_html_link(target_user)
-    if remove_from_whitelist(target_user.id):
+    if await run_write(remove_from_whitelist, target_user.id):
         await update.message.reply_html(f"✅ Done! {user_display} [<code>{target_user.id}</code>] has been <b>unwhitelisted</b>.")
 
         try:
@@ -1777,7 +1854,9 @@ async def remove_cached_user_command(update: Update, context: ContextTypes.DEFAU
         await update.message.reply_text("Please provide a valid user ID.")
         return
 
-    if delete_user_from_db(user_id_to_delete):
+    deleted = await run_write(delete_user_from_db, user_id_to_delete)
+    user_write_buffer.forget(user_id_to_delete)
+    if deleted:
         await update.message.reply_html(
             f"✅ User <b>{user_id_to_delete}</b> has been cleared from the local database cache.\n"
             "The next command used on this user will fetch fresh data from Telegram."
@@ -1786,34 +1865,3 @@ async def remove_cached_user_command(update: Update, context: ContextTypes.DEFAU
         await update.message.reply_html(
             f"ℹ️ User <b>{user_id_to_delete}</b> was not found in the local database cache, so no action was taken."
         )
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("status", status_command))
-    application.add_handler(CommandHandler("stats", stats_command))
-    application.add_handler(CommandHandler("ping", ping_command))
-    application.add_handler(CommandHandler(["permissions", "perms"], permissions_command))
-    application.add_handler(CommandHandler("echo", echo))
-    application.add_handler(CommandHandler("leave", leave_chat))
-    application.add_handler(CommandHandler("speedtest", speedtest_command))
-    application.add_handler(CommandHandler("listsudo", list_sudo_users_command))
-    application.add_handler(CommandHandler("listgroups", list_groups_command))
-    application.add_handler(CommandHandler("delgroup", del_groups_command))
-    application.add_handler(CommandHandler("cleangroups", clean_groups_command))
-    application.add_handler(CommandHandler("addsudo", addsudo_command))
-    application.add_handler(CommandHandler("delsudo", delsudo_command))
-    application.add_handler(CommandHandler("adddev", adddev_command))
-    application.add_handler(CommandHandler("deldev", deldev_command))
-    application.add_handler(CommandHandler("listdevs", listdevs_command)) 
-    application.add_handler(CommandHandler(["whitelist", "wlist"], whitelist_user_command))
-    application.add_handler(CommandHandler(["unwhitelist", "unwlist"], unwhitelist_user_command))
-    application.add_handler(CommandHandler("addsupport", addsupport_command))
-    application.add_handler(CommandHandler("delsupport", delsupport_command))
-    application.add_handler(CommandHandler("setrank", setrank_command))
-    application.add_handler(CommandHandler("listsupport", listsupport_command))
-    application.add_handler(CommandHandler("listwhitelist", listwhitelist_command))
-    application.add_handler(CommandHandler("broadcast", broadcast_command))
-    application.add_handler(CommandHandler(["shell", "sh"], shell_command))
-    application.add_handler(CommandHandler(["execute", "exe"], execute_script_command))
-    application.add_handler(CommandHandler("rmcacheduser", remove_cached_user_command))
@@ -3,7 +3,7 @@ import traceback
 import html
 from telegram import Update, User, Chat
 from telegram.constants import ChatType, ParseMode
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.utils import is_owner_or_dev, resolve_user_with_telethon, is_entity_a_user
 from ..core.decorators import check_module_enabled
@@ -83,7 +83,3 @@ async def test_error_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 # --- Handler Loader ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("testresolve", test_resolve_command))
-    application.add_handler(CommandHandler("getupdate", get_update_command))
-    application.add_handler(CommandHandler("testerror", test_error_command))
@@ -1,7 +1,7 @@
 import logging
 from telegram import Update
 from telegram.constants import ParseMode, ChatType
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 from collections import defaultdict
 
 from ..core.constants import DISABLES_HELP_TEXT
@@ -9,6 +9,7 @@ from ..core.database import disable_command_in_chat, enable_command_in_chat, get
 from ..core.utils import safe_escape, _can_user_perform_action, send_safe_reply
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +37,7 @@ async def disable_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         disabled_count = 0
         for command_name in manageable_commands:
-            if disable_command_in_chat(chat.id, command_name):
+            if await run_write(disable_command_in_chat, chat.id, command_name):
                 disabled_count += 1
         
         await update.message.reply_html(
@@ -52,7 +53,7 @@ async def disable_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         return
 
-    if disable_command_in_chat(update.effective_chat.id, command_to_disable):
+    if await run_write(disable_command_in_chat, update.effective_chat.id, command_to_disable):
         await update.message.reply_text(
             f"✅ <code>{safe_escape(command_to_disable)}</code> is now disabled for non-admins in this chat.",
             parse_mode=ParseMode.HTML
@@ -77,14 +78,14 @@ async def enable_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     command_to_enable = context.args[0].lower().lstrip('') if context.args else ""
     if command_to_enable == 'all':
-        disabled_in_chat = get_disabled_commands_in_chat(chat.id)
+        disabled_in_chat = await run_read(get_disabled_commands_in_chat, chat.id)
         if not disabled_in_chat:
             await update.message.reply_text("All manageable commands are already enabled.")
             return
 
         enabled_count = 0
         for command_name in disabled_in_chat:
-            if enable_command_in_chat(chat.id, command_name):
+            if await run_write(enable_command_in_chat, chat.id, command_name):
                 enabled_count += 1
         
         await update.message.reply_html(
@@ -97,7 +98,7 @@ async def enable_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_html("Usage: /enable &lt;command name&gt;\nThat command doesn't exist or isn't managed.")
         return
         
-    if enable_command_in_chat(update.effective_chat.id, command_to_enable):
+    if await run_write(enable_command_in_chat, update.effective_chat.id, command_to_enable):
         await update.message.reply_text(
             f"✅ <code>{safe_escape(command_to_enable)}</code> is now enabled for everyone in this chat.",
             parse_mode=ParseMode.HTML
@@ -121,7 +122,7 @@ async def settings_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return
 
     manageable_commands = context.bot_data.get("manageable_commands", set())
-    disabled_commands = get_disabled_commands_in_chat(update.effective_chat.id)
+    disabled_commands = await run_read(get_disabled_commands_in_chat, update.effective_chat.id)
     
     message = f"<b>Settings for {safe_escape(update.effective_chat.title)}:</b>\n\n"
     
@@ -135,14 +136,7 @@ async def settings_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     await update.message.reply_html(message)
 
 @check_module_enabled("disables")
-@command_control("disableshelp")
 @custom_handler("disableshelp")
+@command_control("disableshelp")
 async def disables_help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await update.message.reply_html(DISABLES_HELP_TEXT)
-
-
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("disable", disable_command))
-    application.add_handler(CommandHandler("enable", enable_command))
-    application.add_handler(CommandHandler("settings", settings_command))
-    application.add_handler(CommandHandler("disableshelp", disables_help_command))
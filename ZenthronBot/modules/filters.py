@@ -3,7 +3,7 @@ import re
 import json
 import time
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, User, Chat
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.ext import MessageHandler, filters, ContextTypes
 from telegram.constants import ParseMode, ChatType
 
 from ..core.database import add_or_update_filter, remove_filter, get_all_filters_for_chat
@@ -11,6 +11,8 @@ from ..core.utils import _can_user_perform_action, safe_escape
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
 from ..core.constants import FILTERS_HELP_TEXT
+from ..core.async_database import run_read, run_write
+from ..core.update_context import get_update_context
 
 logger = logging.getLogger(__name__)
 
@@ -81,11 +83,14 @@ async def check_message_for_filters(update: Update, context: ContextTypes.DEFAUL
     chat = update.effective_chat
     message = update.effective_message
 
-    if not chat or not message or not message.text or chat.type == ChatType.PRIVATE:
+    if not message or not message.text:
+        return
+    update_ctx = await get_update_context(update, context)
+    if not update_ctx.is_group:
         return
     current_time = time.time()
     if 'filters_cache' not in context.chat_data or context.chat_data.get('filters_last_update', 0) < (current_time - 60):
-        context.chat_data['filters_cache'] = get_all_filters_for_chat(chat.id)
+        context.chat_data['filters_cache'] = await run_read(get_all_filters_for_chat, chat.id)
         context.chat_data['filters_last_update'] = current_time
     
     all_filters = context.chat_data.get('filters_cache', [])
@@ -205,7 +210,7 @@ async def add_filter_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         filter_data['reply_type'] = 'text'
         filter_data['reply_text'] = reply_text
 
-    if add_or_update_filter(msg.chat_id, keyword, filter_data):
+    if await run_write(add_or_update_filter, msg.chat_id, keyword, filter_data):
         context.chat_data.pop('filters_cache', None)
         await msg.reply_text(f"✅ Filter for '<code>{safe_escape(keyword)}</code>' has been saved with type <code>{filter_type}</code>.", parse_mode=ParseMode.HTML)
     else:
@@ -232,7 +237,7 @@ async def remove_filter_command(update: Update, context: ContextTypes.DEFAULT_TY
         await update.message.reply_html("Usage: /delfilter 'keyword'")
         return
         
-    if remove_filter(update.effective_chat.id, keyword_to_remove):
+    if await run_write(remove_filter, update.effective_chat.id, keyword_to_remove):
         context.chat_data.pop('filters_cache', None)
         await update.message.reply_text(f"✅ Filter for '<code>{safe_escape(keyword_to_remove)}</code>' has been removed.", parse_mode=ParseMode.HTML)
     else:
@@ -253,7 +258,7 @@ async def list_filters_command(update: Update, context: ContextTypes.DEFAULT_TYP
     if not can_see:
         return
     
-    all_filters = get_all_filters_for_chat(update.effective_chat.id)
+    all_filters = await run_read(get_all_filters_for_chat, update.effective_chat.id)
     if not all_filters:
         await update.message.reply_text("There are no active filters in this chat.")
         return
@@ -273,14 +278,7 @@ async def list_filters_command(update: Update, context: ContextTypes.DEFAULT_TYP
     await update.message.reply_html(message)
 
 @check_module_enabled("filters")
-@command_control("filters")
 @custom_handler("filterhelp")
+@command_control("filters")
 async def filter_help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await update.message.reply_html(FILTERS_HELP_TEXT)
-
-
-def load_handlers(application: Application):  
-    application.add_handler(CommandHandler(["addfilter", "filter"], add_filter_command))
-    application.add_handler(CommandHandler(["delfilter", "stop"], remove_filter_command))
-    application.add_handler(CommandHandler("filters", list_filters_command))
-    application.add_handler(CommandHandler("filterhelp", filter_help_command))
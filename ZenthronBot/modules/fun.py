@@ -5,7 +5,7 @@ import random
 from pyfiglet import figlet_format
 from telegram import Update, Dice
 from telegram.constants import ParseMode
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..config import OWNER_ID
 from ..core.utils import get_themed_gif, check_target_protection, check_username_protection, send_safe_reply, safe_escape
@@ -42,33 +42,33 @@ async def _handle_action_command(update, context, texts, gifs, name, req_target=
     except Exception as e: logger.error(f"Error sending {name} action: {e}"); await update.message.reply_html(text)
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("kill")
+@command_control("fun")
 async def kill(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None: await _handle_action_command(update, context, KILL_TEXTS, ["gun", "gun shoting", "anime gun"], "kill", True, "Who to 'kill'?")
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("punch")
+@command_control("fun")
 async def punch(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None: await _handle_action_command(update, context, PUNCH_TEXTS, ["punch", "hit", "anime punch"], "punch", True, "Who to 'punch'?")
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("slap")
+@command_control("fun")
 async def slap(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None: await _handle_action_command(update, context, SLAP_TEXTS, ["huge slap", "smack", "anime slap"], "slap", True, "Who to slap?")
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("pat")
+@command_control("fun")
 async def pat(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None: await _handle_action_command(update, context, PAT_TEXTS, ["pat", "pat anime", "anime pat"], "pat", True, "Who to pat?")
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("bonk")
+@command_control("fun")
 async def bonk(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None: await _handle_action_command(update, context, BONK_TEXTS, ["bonk", "anime bonk"], "bonk", True, "Who to bonk?")
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("touch")
+@command_control("fun")
 async def damnbroski(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     special_message = "💀Bro..."
     
@@ -83,8 +83,8 @@ async def damnbroski(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     )
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("cowsay")
+@command_control("fun")
 async def cowsay_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not context.args:
         text_to_say = "Mooooo!"
@@ -104,8 +104,8 @@ async def cowsay_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("ascii")
+@command_control("fun")
 async def ascii_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not context.args:
         await send_safe_reply(update, context, text="Usage: /ascii <your text>")
@@ -146,14 +146,14 @@ SKULL_ASCII = """
 """
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("skull")
+@command_control("fun")
 async def skull_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await send_safe_reply(update, context, text=SKULL_ASCII, parse_mode=ParseMode.HTML)
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("gamble")
+@command_control("fun")
 async def gamble_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     
@@ -175,8 +175,8 @@ async def gamble_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.reply_text("Oops, the dice seem to be broken!")
 
 @check_module_enabled("fun")
-@command_control("fun")
 @custom_handler("decide")
+@command_control("fun")
 async def decide_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     answers = [
@@ -205,18 +205,3 @@ async def decide_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_to_message.reply_text(f"🤔... <b>{decision}</b>", parse_mode=ParseMode.HTML)
     else:
         await update.message.reply_text(f"🤔... <b>{decision}</b>", parse_mode=ParseMode.HTML)
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("kill", kill))
-    application.add_handler(CommandHandler("punch", punch))
-    application.add_handler(CommandHandler("slap", slap))
-    application.add_handler(CommandHandler("pat", pat))
-    application.add_handler(CommandHandler("bonk", bonk))
-    application.add_handler(CommandHandler("touch", damnbroski))
-    application.add_handler(CommandHandler("cowsay", cowsay_command))
-    application.add_handler(CommandHandler("ascii", ascii_command))
-    application.add_handler(CommandHandler("skull", skull_command))
-    application.add_handler(CommandHandler("gamble", gamble_command))
-    application.add_handler(CommandHandler("decide", decide_command))
@@ -1,16 +1,17 @@
 import logging
 import asyncio
-import sqlite3
 from datetime import datetime, timezone, timedelta
 from telegram import Update, User, Chat
 from telegram.constants import ParseMode, ChatType, ChatMemberStatus
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, ApplicationHandlerStop
+from telegram.ext import MessageHandler, filters, ContextTypes, ApplicationHandlerStop
 
-from ..config import APPEAL_CHAT_USERNAME, DB_NAME
-from ..core.database import is_gban_enforced, get_gban_reason, add_to_gban, remove_from_gban, is_whitelisted, add_chat_to_db
+from ..config import APPEAL_CHAT_USERNAME
+from ..core.database import is_gban_enforced, is_gbanned, get_gban_reason, get_gban_reasons, add_to_gban, remove_from_gban, is_whitelisted, set_gban_enforcement
 from ..core.utils import is_privileged_user, resolve_user_with_telethon, create_user_html_link, safe_escape, send_operational_log, propagate_unban, is_entity_a_user
 from ..core.decorators import check_module_enabled
+from ..core.async_database import run_read, run_write
 from ..core.handlers import custom_handler
+from ..core.update_context import get_update_context
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +22,19 @@ async def check_gban_on_entry(update: Update, context: ContextTypes.DEFAULT_TYPE
     new_members = update.message.new_chat_members if update.message else []
     chat = update.effective_chat
 
-    if not new_members or not chat or not is_gban_enforced(chat.id):
+    if not new_members or not chat:
+        return
+    update_ctx = await get_update_context(update, context)
+    if not update_ctx.chat_settings or not update_ctx.chat_settings.enforce_gban:
         return
     
+    gbanned_ids = [member.id for member in new_members if is_gbanned(member.id)]
+    if not gbanned_ids:
+        return
+    gban_reasons = await run_read(get_gban_reasons, gbanned_ids)
+
     for member in new_members:
-        gban_reason = get_gban_reason(member.id)
+        gban_reason = gban_reasons.get(member.id)
         if gban_reason and not is_privileged_user(member.id):
             logger.info(f"Gbanned user {member.id} detected in {chat.id}. Enforcing ban.")
             try:
@@ -48,15 +57,16 @@ async def check_gban_on_message(update: Update, context: ContextTypes.DEFAULT_TY
         return
     
     chat = update.effective_chat
-    
-    if not is_gban_enforced(chat.id):
+    update_ctx = await get_update_context(update, context)
+
+    if not update_ctx.chat_settings or not update_ctx.chat_settings.enforce_gban:
         return
 
     user = update.effective_user
-    if not user or is_privileged_user(user.id):
+    if not user or not update_ctx.is_gbanned or update_ctx.is_privileged:
         return
         
-    gban_reason = get_gban_reason(user.id)
+    gban_reason = await run_read(get_gban_reason, user.id)
     if gban_reason:
         message = update.effective_message
         
@@ -95,7 +105,7 @@ async def gban_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     message = update.message
     if not message: return
 
-    if not is_privileged_user(user_who_gbans.id):
+    if not (await get_update_context(update, context)).is_privileged:
         logger.warning(f"Unauthorized /gban attempt by user {user_who_gbans.id}.")
         return
 
@@ -142,7 +152,7 @@ async def gban_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         return
 
     user_display = create_user_html_link(target_entity)
-    existing_gban_reason = get_gban_reason(target_entity.id)
+    existing_gban_reason = await run_read(get_gban_reason, target_entity.id)
     if existing_gban_reason:
         await message.reply_html(
             f"ℹ️ User {user_display} [<code>{target_entity.id}</code>] is already <b>globally banned</b>.\n"
@@ -154,8 +164,8 @@ async def gban_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     await message.reply_html(prepare_message)
     await asyncio.sleep(1.0)
 
-    if add_to_gban(target_entity.id, user_who_gbans.id, reason):
-        if chat.type != ChatType.PRIVATE and is_gban_enforced(chat.id):
+    if await run_write(add_to_gban, target_entity.id, user_who_gbans.id, reason):
+        if chat.type != ChatType.PRIVATE and await run_read(is_gban_enforced, chat.id):
             try:
                 await context.bot.ban_chat_member(chat.id, target_entity.id)
             except Exception as e:
@@ -197,7 +207,7 @@ async def ungban_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     message = update.message
     if not message: return
 
-    if not is_privileged_user(user_who_ungbans.id):
+    if not (await get_update_context(update, context)).is_privileged:
         logger.warning(f"Unauthorized /ungban attempt by user {user_who_ungbans.id}.")
         return
 
@@ -231,11 +241,11 @@ async def ungban_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     user_display = create_user_html_link(target_entity)
 
-    if not get_gban_reason(target_entity.id):
+    if not await run_read(get_gban_reason, target_entity.id):
         await message.reply_html(f"ℹ️ User {user_display} [<code>{target_entity.id}</code>] is not <b>globally banned</b>.")
         return
 
-    if remove_from_gban(target_entity.id):
+    if await run_write(remove_from_gban, target_entity.id):
         prepare_message = f"Let’s give him next chance!"
         await message.reply_html(prepare_message)
     
@@ -291,7 +301,7 @@ async def enforce_gban_command(update: Update, context: ContextTypes.DEFAULT_TYP
         return
     
     choice = context.args[0].lower()
-    current_status_bool = is_gban_enforced(chat.id)
+    current_status_bool = await run_read(is_gban_enforced, chat.id)
 
     if choice == 'yes' or choice == 'on':
         permission_notice = ""
@@ -312,17 +322,7 @@ async def enforce_gban_command(update: Update, context: ContextTypes.DEFAULT_TYP
             )
             return
         
-        setting = 1
-        try:
-            with sqlite3.connect(DB_NAME) as conn:
-                cursor = conn.cursor()
-                cursor.execute("UPDATE bot_chats SET enforce_gban = ? WHERE chat_id = ?", (setting, chat.id))
-                if cursor.rowcount == 0:
-                    add_chat_to_db(chat.id, chat.title or f"Chat {chat.id}")
-                    cursor.execute("UPDATE bot_chats SET enforce_gban = ? WHERE chat_id = ?", (setting, chat.id))
-                conn.commit()
-        except sqlite3.Error as e:
-            logger.error(f"Failed to update gban enforcement for chat {chat.id}: {e}")
+        if not await run_write(set_gban_enforcement, chat.id, True, chat.title):
             await update.message.reply_text("An error occurred while updating the setting.")
             return
 
@@ -338,14 +338,7 @@ async def enforce_gban_command(update: Update, context: ContextTypes.DEFAULT_TYP
             await update.message.reply_html("ℹ️ Global Ban enforcement is already <b>DISABLED</b> for this chat.")
             return
         
-        setting = 0
-        try:
-            with sqlite3.connect(DB_NAME) as conn:
-                cursor = conn.cursor()
-                cursor.execute("UPDATE bot_chats SET enforce_gban = ? WHERE chat_id = ?", (setting, chat.id))
-                conn.commit()
-        except sqlite3.Error as e:
-            logger.error(f"Failed to update gban enforcement for chat {chat.id}: {e}")
+        if not await run_write(set_gban_enforcement, chat.id, False, chat.title):
             await update.message.reply_text("An error occurred while updating the setting.")
             return
         
@@ -354,10 +347,3 @@ async def enforce_gban_command(update: Update, context: ContextTypes.DEFAULT_TYP
             "<b>Notice:</b> This means globally banned users will be able to join and participate here. "
             "This may expose your community to users banned for severe offenses like spam, harassment, or illegal activities."
         )
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("gban", gban_command))
-    application.add_handler(CommandHandler("ungban", ungban_command))
-    application.add_handler(CommandHandler(["enforcegban", "gbanstat"], enforce_gban_command))
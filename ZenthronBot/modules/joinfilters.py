@@ -1,13 +1,14 @@
 import logging
 from datetime import datetime, timezone, timedelta
 from telegram import Update, ChatPermissions
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.ext import MessageHandler, filters, ContextTypes
 from telegram.constants import ParseMode, ChatType
 
 from ..core.database import get_chat_join_settings, update_chat_join_settings
 from ..core.utils import _can_user_perform_action, safe_escape, create_user_html_link, send_safe_reply
 from ..core.decorators import check_module_enabled
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,7 @@ async def check_new_member(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     if not chat or not update.message.new_chat_members:
         return
 
-    join_filters, action_to_take = get_chat_join_settings(chat.id)
+    join_filters, action_to_take = await run_read(get_chat_join_settings, chat.id)
     if not join_filters:
         return
 
@@ -83,12 +84,12 @@ async def add_filter_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if not context.args: await update.message.reply_html("Usage: /addjoinfilter &lt;filter&gt;"); return
     
     chat_id = update.effective_chat.id
-    filters, _ = get_chat_join_settings(chat_id)
+    filters, _ = await run_read(get_chat_join_settings, chat_id)
     filter_text = " ".join(context.args).lower()
     
     if filter_text not in filters:
         filters.append(filter_text)
-        if update_chat_join_settings(chat_id, filters=filters):
+        if await run_write(update_chat_join_settings, chat_id, filters=filters):
             await update.message.reply_text(f"✅ Filter '<code>{safe_escape(filter_text)}</code>' added.", parse_mode=ParseMode.HTML)
         else:
             await update.message.reply_text("An error occurred while saving the filter.")
@@ -108,12 +109,12 @@ async def remove_filter_command(update: Update, context: ContextTypes.DEFAULT_TY
     if not context.args: await update.message.reply_html("Usage: /deljoinfilter &lt;filter&gt;"); return
 
     chat_id = update.effective_chat.id
-    filters, _ = get_chat_join_settings(chat_id)
+    filters, _ = await run_read(get_chat_join_settings, chat_id)
     filter_text = " ".join(context.args).lower()
 
     if filter_text in filters:
         filters.remove(filter_text)
-        if update_chat_join_settings(chat_id, filters=filters):
+        if await run_write(update_chat_join_settings, chat_id, filters=filters):
             await update.message.reply_text(f"✅ Filter '<code>{safe_escape(filter_text)}</code>' removed.", parse_mode=ParseMode.HTML)
         else:
             await update.message.reply_text("An error occurred while saving the filter.")
@@ -131,7 +132,7 @@ async def list_filters_command(update: Update, context: ContextTypes.DEFAULT_TYP
   
     if not await _can_user_perform_action(update, context, 'can_manage_chat', "Why should I listen to a person with no privileges for this? You need 'can_manage_chat' permission.", allow_bot_privileged_override=True): return
     
-    filters, action = get_chat_join_settings(update.effective_chat.id)
+    filters, action = await run_read(get_chat_join_settings, update.effective_chat.id)
     
     message = "<b>Join Filter Settings</b>\n\n"
     message += "This feature automatically takes action on users who join with a name or username containing specific keywords.\n\n"
@@ -163,14 +164,7 @@ async def set_action_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if action_to_set not in actions:
         await update.message.reply_html("Usage: /setjoinaction &lt;ban/mute/kick&gt;"); return
         
-    if update_chat_join_settings(update.effective_chat.id, action=action_to_set):
+    if await run_write(update_chat_join_settings, update.effective_chat.id, action=action_to_set):
         await update.message.reply_text(f"✅ Join filter action has been set to <b>{action_to_set.upper()}</b>.", parse_mode=ParseMode.HTML)
     else:
         await update.message.reply_text("An error occurred while setting the action.")
-
-
-def load_handlers(application: Application):    
-    application.add_handler(CommandHandler("addjoinfilter", add_filter_command))
-    application.add_handler(CommandHandler("deljoinfilter", remove_filter_command))
-    application.add_handler(CommandHandler("joinfilters", list_filters_command))
-    application.add_handler(CommandHandler("setjoinaction", set_action_command))
@@ -2,7 +2,7 @@ import logging
 from telegram import Update, User
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.utils import _can_user_perform_action, resolve_user_with_telethon, create_user_html_link, send_safe_reply, safe_escape, is_entity_a_user
 from ..core.decorators import check_module_enabled, command_control
@@ -150,8 +150,8 @@ async def dkick_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         await send_safe_reply(update, context, text=f"❌ Failed to kick user (but their message was deleted). Error: {safe_escape(str(e))}")
 
 @check_module_enabled("kicks")
-@command_control("kickme")
 @custom_handler("kickme")
+@command_control("kickme")
 async def kickme_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat = update.effective_chat
     message = update.effective_message
@@ -215,10 +215,3 @@ async def kickme_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     except Exception as e:
         logger.error(f"Unexpected error in /kickme for user {user_to_kick.id}: {e}", exc_info=True)
         await update.message.reply_text("Error: An unexpected error occurred while trying to process your /kickme request.")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("kick", kick_command))
-    application.add_handler(CommandHandler("dkick", dkick_command))
-    application.add_handler(CommandHandler("kickme", kickme_command))
@@ -4,14 +4,16 @@ import telegram
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Chat, User
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler
+from telegram.ext import Application, ContextTypes, CallbackQueryHandler
 
 from ..config import OWNER_ID, APPEAL_CHAT_USERNAME, LOG_CHAT_USERNAME
 from ..core.database import get_rules, is_dev_user, is_sudo_user, is_support_user, is_whitelisted, get_blacklist_reason, get_gban_reason, is_gban_enforced, update_user_in_db
-from ..core.utils import is_privileged_user, safe_escape, resolve_user_with_telethon, create_user_html_link, send_safe_reply, is_owner_or_dev
+from ..core.utils import safe_escape, resolve_user_with_telethon, create_user_html_link, send_safe_reply, is_owner_or_dev
 from ..core.constants import START_TEXT, HELP_MAIN_TEXT, GENERAL_COMMANDS, USER_CHAT_INFO, MODERATION_COMMANDS, ADMIN_TOOLS, NOTES, CHAT_SETTINGS, CHAT_SECURITY, AI_COMMANDS, FUN_COMMANDS, ADMIN_NOTE_TEXT, SUPPORT_COMMANDS_TEXT, SUDO_COMMANDS_TEXT, DEVELOPER_COMMANDS_TEXT, OWNER_COMMANDS_TEXT, FILTERS
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.update_context import get_update_context
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
@@ -78,7 +80,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         elif arg.startswith('rules_'):
             try:
                 chat_id = int(arg.split('_')[1])
-                rules_text = get_rules(chat_id)
+                rules_text = await run_read(get_rules, chat_id)
                 if rules_text:
                     await message.reply_html(rules_text, disable_web_page_preview=True)
                 else:
@@ -88,7 +90,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             return
 
         elif arg == 'sudocmds':
-            if not is_privileged_user(update.effective_user.id):
+            if not (await get_update_context(update, context)).is_privileged:
                 return
             
             help_parts = []
@@ -164,15 +166,15 @@ async def menu_button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
 
 @check_module_enabled("misc")
-@command_control("misc")
 @custom_handler("github")
+@command_control("misc")
 async def github(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     github_link = "https://github.com/R0Xofficial/ZenthronBot"
     await update.message.reply_text(f"This bot is open source. You can find the code here: {github_link}", disable_web_page_preview=True)
 
 @check_module_enabled("misc")
-@command_control("misc")
 @custom_handler("owner")
+@command_control("misc")
 async def owner_info(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if OWNER_ID:
         owner_mention = f"<code>{OWNER_ID}</code>"; owner_name = "Bot Owner"
@@ -321,8 +323,8 @@ def format_entity_info(entity: Chat | User,
     return "\n".join(info_lines)
 
 @check_module_enabled("misc")
-@command_control("info")
 @custom_handler("info")
+@command_control("info")
 async def entity_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     target_entity: Chat | User | None = None
@@ -348,7 +350,7 @@ async def entity_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
 
     if isinstance(target_entity, User):
-        update_user_in_db(target_entity)
+        await run_write(update_user_in_db, target_entity)
 
     is_target_bot_flag = (target_entity.id == context.bot.id)
     is_target_owner_flag = (target_entity.id == OWNER_ID)
@@ -356,8 +358,8 @@ async def entity_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     is_target_sudo_flag = is_sudo_user(target_entity.id)
     is_target_support_flag = is_support_user(target_entity.id)
     is_target_whitelist_flag = is_whitelisted(target_entity.id)
-    blacklist_reason_str = get_blacklist_reason(target_entity.id)
-    gban_reason_str = get_gban_reason(target_entity.id)
+    blacklist_reason_str = await run_read(get_blacklist_reason, target_entity.id)
+    gban_reason_str = await run_read(get_gban_reason, target_entity.id)
     chat_member_obj: telegram.ChatMember | None = None
     
     if isinstance(target_entity, User) and update.effective_chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
@@ -383,8 +385,8 @@ async def entity_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     await update.message.reply_html(info_message, disable_web_page_preview=True)
 
 @check_module_enabled("misc")
-@command_control("id")
 @custom_handler("id")
+@command_control("id")
 async def id_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.message
     chat = update.effective_chat
@@ -423,8 +425,8 @@ async def id_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
         await message.reply_html(f"<b>This chat's ID is:</b> <code>{chat.id}</code>")
 
 @check_module_enabled("misc")
-@command_control("chatinfo")
 @custom_handler(["chatinfo", "cinfo"])
+@command_control("chatinfo")
 async def chat_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Displays basic statistics about the current chat."""
     chat = update.effective_chat
@@ -483,7 +485,7 @@ async def chat_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
         status_line = "<b>• Gban Enforcement:</b> "
         
-        if not is_gban_enforced(chat.id):
+        if not await run_read(is_gban_enforced, chat.id):
             status_line += "<code>Disabled</code>"
         else:
             try:
@@ -704,12 +706,4 @@ async def global_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 # --- HANDLER LOADER ---
 def load_handlers(application: Application):
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CallbackQueryHandler(menu_button_handler, pattern=r"^menu_"))
-    application.add_handler(CommandHandler("github", github))
-    application.add_handler(CommandHandler("owner", owner_info))
-    application.add_handler(CommandHandler("info", entity_info_command))
-    application.add_handler(CommandHandler("id", id_command))
-    application.add_handler(CommandHandler(["chatinfo", "cinfo"], chat_info_command))
-    application.add_handler(CommandHandler("ginfo", global_info_command))
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from telegram import Update, User, ChatPermissions
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes, ChatMemberHandler
+from telegram.ext import ContextTypes, ChatMemberHandler
 
 from ..core.utils import _can_user_perform_action, resolve_user_with_telethon, parse_duration_to_timedelta, create_user_html_link, send_safe_reply, safe_escape, send_critical_log, is_entity_a_user
 from ..core.decorators import check_module_enabled
@@ -335,11 +335,3 @@ async def handle_bot_permission_changes(update: Update, context: ContextTypes.DE
             await context.bot.leave_chat(chat.id)
         except Exception as e:
             logger.error(f"Error during automatic leave from chat {chat.id}: {e}")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("mute", mute_command))
-    application.add_handler(CommandHandler("dmute", dmute_command))
-    application.add_handler(CommandHandler("tmute", tmute_command))
-    application.add_handler(CommandHandler("unmute", unmute_command))
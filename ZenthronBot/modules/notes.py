@@ -1,12 +1,14 @@
 import logging
 from telegram import Update
 from telegram.constants import ChatType
-from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
+from telegram.ext import ContextTypes, MessageHandler, filters
 
 from ..core.database import add_note, get_all_notes, remove_note, get_note
 from ..core.utils import _can_user_perform_action, send_safe_reply, safe_escape
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
+from ..core.update_context import get_update_context
 
 logger = logging.getLogger(__name__)
 
@@ -63,14 +65,14 @@ async def save_note_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             await message.reply_text("You need to provide some content for the note.")
             return
 
-    if add_note(chat.id, note_name, content, user.id):
+    if await run_write(add_note, chat.id, note_name, content, user.id):
         await message.reply_html(f"✅ Note <code>{note_name.lower()}</code> has been saved.")
     else:
         await message.reply_text("Failed to save the note due to a database error.")
 
 @check_module_enabled("notes")
-@command_control("notes")
 @custom_handler(["notes", "saved"])
+@command_control("notes")
 async def list_notes_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat = update.effective_chat
 
@@ -78,7 +80,7 @@ async def list_notes_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await send_safe_reply(update, context, text="Huh? You can't list notes in private chat...")
         return
 
-    notes = get_all_notes(update.effective_chat.id)
+    notes = await run_read(get_all_notes, update.effective_chat.id)
     
     if not notes:
         await update.message.reply_text("There are no notes in this chat.")
@@ -105,14 +107,14 @@ async def remove_note_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
 
     note_name = context.args[0]
-    if remove_note(chat.id, note_name):
+    if await run_write(remove_note, chat.id, note_name):
         await update.message.reply_html(f"✅ Note <code>{note_name.lower()}</code> has been removed.")
     else:
         await update.message.reply_html(f"Note <code>{note_name.lower()}</code> not found.")
 
 @check_module_enabled("notes")
-@command_control("notes")
 @custom_handler("get")
+@command_control("notes")
 async def get_note_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat = update.effective_chat
 
@@ -127,7 +129,7 @@ async def get_note_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     note_name = context.args[0].lower()
     chat_id = update.effective_chat.id
 
-    content = get_note(chat_id, note_name)
+    content = await run_read(get_note, chat_id, note_name)
     if content:
         await update.message.reply_html(content, disable_web_page_preview=True)
     else:
@@ -146,16 +148,8 @@ async def handle_note_trigger(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
 
     note_name = text.split()[0][1:].lower()
-    chat_id = update.effective_chat.id
+    update_ctx = await get_update_context(update, context)
 
-    content = get_note(chat_id, note_name)
+    content = await run_read(get_note, update_ctx.chat_id, note_name)
     if content:
         await update.message.reply_html(content, disable_web_page_preview=True)
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler(["addnote", "savenote", "save"], save_note_command))
-    application.add_handler(CommandHandler(["notes", "saved"], list_notes_command))
-    application.add_handler(CommandHandler(["delnote", "rmnote", "clear"], remove_note_command))
-    application.add_handler(CommandHandler("get", get_note_command))
@@ -2,7 +2,7 @@ import logging
 from telegram import Update
 from telegram.constants import ChatType, ChatMemberStatus
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.utils import _can_user_perform_action, send_safe_reply, safe_escape
 from ..core.decorators import check_module_enabled
@@ -118,9 +118,3 @@ async def unpin_message_command(update: Update, context: ContextTypes.DEFAULT_TY
     except Exception as e:
         logger.error(f"Unexpected error in /unpin: {e}", exc_info=True)
         await update.message.reply_text("An unexpected error occurred while trying to unpin the message.")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("pin", pin_message_command))
-    application.add_handler(CommandHandler("unpin", unpin_message_command))
@@ -2,7 +2,7 @@ import logging
 from telegram import Update, User
 from telegram.constants import ChatType, ChatMemberStatus
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.utils import _can_user_perform_action, resolve_user_with_telethon, create_user_html_link, safe_escape, is_entity_a_user
 from ..core.decorators import check_module_enabled
@@ -172,9 +172,3 @@ async def demote_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         else:
             logger.error(f"Error during demotion: {e}")
             await message.reply_text(f"Error: Failed to demote user. Reason: {safe_escape(str(e))}. Check if the user has not been promoted by another Admin or if I have permissions to perform this action.")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("promote", promote_command))
-    application.add_handler(CommandHandler("demote", demote_command))
@@ -4,7 +4,7 @@ from datetime import datetime
 from telegram import Update
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.utils import _can_user_perform_action, safe_escape
 from ..core.decorators import check_module_enabled
@@ -98,8 +98,3 @@ async def purge_messages_command(update: Update, context: ContextTypes.DEFAULT_T
             logger.error(f"Purge: Failed to send final purge status message: {e_send_final}")
     else:
         logger.info(f"Silent purge completed in chat {chat.id}. Duration: {duration_secs:.2f}s. Errors occurred: {errors_occurred}")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("purge", purge_messages_command))
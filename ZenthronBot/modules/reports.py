@@ -2,7 +2,7 @@ import logging
 from telegram import Update, Chat, User
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.utils import resolve_user_with_telethon, create_user_html_link, safe_escape
 from ..core.decorators import check_module_enabled, command_control
@@ -13,8 +13,8 @@ logger = logging.getLogger(__name__)
 
 # --- REPORT COMMAND FUNCTION ---
 @check_module_enabled("reports")
-@command_control("reports")
 @custom_handler("report")
+@command_control("reports")
 async def report_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat = update.effective_chat
     reporter = update.effective_user
@@ -75,8 +75,3 @@ async def report_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await message.delete()
     except Exception:
         logger.warning(f"Could not delete report command message in chat {chat.id}.")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("report", report_command))
@@ -1,12 +1,13 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ChatType
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..core.database import set_rules, get_rules, clear_rules
 from ..core.utils import _can_user_perform_action
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,7 @@ async def set_rules_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await message.reply_text("The rules text cannot be empty.")
         return
 
-    if set_rules(chat.id, rules_text):
+    if await run_write(set_rules, chat.id, rules_text):
         await message.reply_html("✅ The rules for this group have been set successfully.")
     else:
         await message.reply_text("A database error occurred while setting the rules.")
@@ -58,14 +59,14 @@ async def clear_rules_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     if not await _can_user_perform_action(update, context, 'can_change_info', "Why should I listen to a person with no privileges for this? You need 'can_change_members' permission."):
         return
 
-    if clear_rules(chat.id):
+    if await run_write(clear_rules, chat.id):
         await message.reply_html("✅ The rules for this group have been cleared.")
     else:
         await message.reply_text("A database error occurred while clearing the rules.")
 
 @check_module_enabled("rules")
-@command_control("rules")
 @custom_handler("rules")
+@command_control("rules")
 async def rules_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat = update.effective_chat
     message = update.effective_message
@@ -76,7 +77,7 @@ async def rules_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         return
 
     if chat.type != ChatType.PRIVATE:
-        rules_text = get_rules(chat.id)
+        rules_text = await run_read(get_rules, chat.id)
         if rules_text:
             bot_username = context.bot.username
             deep_link_url = f"https://t.me/{bot_username}?start=rules_{chat.id}"
@@ -86,10 +87,3 @@ async def rules_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             await message.reply_text("Click the button below to see the group rules in a private message.", reply_markup=keyboard)
         else:
             await message.reply_text("The rules for this group have not been set yet. An admin can set them using /setrules.")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("rules", rules_command))
-    application.add_handler(CommandHandler("setrules", set_rules_command))
-    application.add_handler(CommandHandler("clearrules", clear_rules_command))
@@ -1,14 +1,15 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ChatType
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 
 from ..config import OWNER_ID
-from ..core.utils import is_privileged_user, send_safe_reply
+from ..core.utils import send_safe_reply
 from ..core.database import is_dev_user, is_sudo_user, is_support_user
 from ..core.constants import ADMIN_NOTE_TEXT, SUPPORT_COMMANDS_TEXT, SUDO_COMMANDS_TEXT, DEVELOPER_COMMANDS_TEXT, OWNER_COMMANDS_TEXT
 from ..core.decorators import check_module_enabled
 from ..core.handlers import custom_handler
+from ..core.update_context import get_update_context
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ async def sudo_commands_command(update: Update, context: ContextTypes.DEFAULT_TY
     user = update.effective_user
     chat = update.effective_chat
     
-    if not is_privileged_user(user.id):
+    if not (await get_update_context(update, context)).is_privileged:
         return
 
     help_parts = []
@@ -52,8 +53,3 @@ async def sudo_commands_command(update: Update, context: ContextTypes.DEFAULT_TY
             [[InlineKeyboardButton(text="🛡️ Get Privileged Commands", url=deep_link_url)]]
         )
         await send_safe_reply(update, context, text="The list of privileged commands has been sent to your private chat.", reply_markup=keyboard)
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("sudocmds", sudo_commands_command))
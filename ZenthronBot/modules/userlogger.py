@@ -1,44 +1,68 @@
+import asyncio
 import logging
 import sqlite3
 from telegram import Update
 from telegram.constants import ChatType
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
 
-from ..config import DB_NAME
-from ..core.database import update_user_in_db, add_chat_to_db
+from ..config import USER_BUFFER_FLUSH_INTERVAL
+from ..core.database import add_chat_to_db, get_all_chat_ids
+from ..core.user_buffer import user_write_buffer
 from ..core.decorators import check_module_enabled
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
+# Concurrent updates must not see a half-loaded known_chats set and re-add chats the table already has.
+_known_chats_lock = asyncio.Lock()
+
+
+async def _get_known_chats(context: ContextTypes.DEFAULT_TYPE) -> set[int]:
+    known_chats = context.bot_data.get('known_chats')
+    if known_chats is not None:
+        return known_chats
+
+    async with _known_chats_lock:
+        if 'known_chats' not in context.bot_data:
+            try:
+                known_ids = set(await run_read(get_all_chat_ids))
+                logger.info(f"Loaded {len(known_ids)} known chats into cache.")
+            except sqlite3.Error as e:
+                logger.error(f"Could not preload known chats into cache: {e}")
+                known_ids = set()
+            context.bot_data['known_chats'] = known_ids
+    return context.bot_data['known_chats']
+
 
 # --- PASSIVE USER AND CHAT LOGGING FUNCTION ---
 @check_module_enabled("userlogger")
 async def log_user_from_interaction(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if update.effective_user:
-        update_user_in_db(update.effective_user)
+    should_flush = user_write_buffer.add(update.effective_user)
     
     if update.message and update.message.reply_to_message and update.message.reply_to_message.from_user:
-        update_user_in_db(update.message.reply_to_message.from_user)
+        should_flush = user_write_buffer.add(update.message.reply_to_message.from_user) or should_flush
+
+    if should_flush:
+        await run_write(user_write_buffer.flush)
 
     chat = update.effective_chat
     if chat and chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
-        if 'known_chats' not in context.bot_data:
-            context.bot_data['known_chats'] = set()
-            try:
-                with sqlite3.connect(DB_NAME) as conn:
-                    cursor = conn.cursor()
-                    known_ids = {row[0] for row in cursor.execute("SELECT chat_id FROM bot_chats")}
-                    context.bot_data['known_chats'] = known_ids
-                    logger.info(f"Loaded {len(known_ids)} known chats into cache.")
-            except sqlite3.Error as e:
-                logger.error(f"Could not preload known chats into cache: {e}")
-
-        if chat.id not in context.bot_data['known_chats']:
+        known_chats = await _get_known_chats(context)
+        if chat.id not in known_chats:
             logger.info(f"Passively discovered and adding new chat to DB: {chat.title} ({chat.id})")
-            add_chat_to_db(chat.id, chat.title or f"Untitled Chat {chat.id}")
-            context.bot_data['known_chats'].add(chat.id)
+            await run_write(add_chat_to_db, chat.id, chat.title or f"Untitled Chat {chat.id}")
+            known_chats.add(chat.id)
+
+
+async def flush_user_buffer_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    await run_write(user_write_buffer.flush)
 
 
 # --- HANDLER LOADER ---
 def load_handlers(application: Application):
-    pass
+    if application.job_queue:
+        application.job_queue.run_repeating(
+            flush_user_buffer_job, interval=USER_BUFFER_FLUSH_INTERVAL, first=USER_BUFFER_FLUSH_INTERVAL, name="flush_user_buffer"
+        )
+    else:
+        logger.warning("JobQueue not available, buffered users will only be written when the buffer fills up.")
@@ -2,12 +2,13 @@ import logging
 from telegram import Update, User, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler
+from telegram.ext import Application, ContextTypes, CallbackQueryHandler
 
 from ..core.database import add_warning, remove_warning_by_id, get_warnings, reset_warnings, set_warn_limit, get_warn_limit
 from ..core.utils import _can_user_perform_action, resolve_user_with_telethon, create_user_html_link, send_safe_reply, safe_escape, is_entity_a_user
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
 
 logger = logging.getLogger(__name__)
 
@@ -74,14 +75,14 @@ async def warn_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         if "user not found" not in str(e).lower():
             logger.warning(f"Could not get chat member status for warn target {target_user.id}: {e}")
 
-    new_warn_id, warn_count = add_warning(chat.id, target_user.id, reason, warner.id)
+    new_warn_id, warn_count = await run_write(add_warning, chat.id, target_user.id, reason, warner.id)
     user_display = create_user_html_link(target_user)
 
     if new_warn_id == -1:
         await message.reply_text("A database error occurred while adding the warning.")
         return
 
-    limit = get_warn_limit(chat.id)
+    limit = await run_read(get_warn_limit, chat.id)
 
 
     keyboard = InlineKeyboardMarkup(
@@ -102,7 +103,7 @@ async def warn_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             await message.reply_html(
                 f"🚨 User {user_display} has reached {warn_count}/{limit} warnings and has been banned."
             )
-            reset_warnings(chat.id, target_user.id)
+            await run_write(reset_warnings, chat.id, target_user.id)
         except Exception as e:
             await message.reply_text(f"Failed to ban user after reaching max warnings: {e}")
 
@@ -152,14 +153,14 @@ async def dwarn_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     except TelegramError as e:
         logger.warning(f"Could not delete message in dwarn: {e}")
 
-    new_warn_id, warn_count = add_warning(chat.id, target_user.id, reason, warner.id)
+    new_warn_id, warn_count = await run_write(add_warning, chat.id, target_user.id, reason, warner.id)
     user_display = create_user_html_link(target_user)
 
     if new_warn_id == -1:
         await message.reply_text("A database error occurred while adding the warning.")
         return
 
-    limit = get_warn_limit(chat.id)
+    limit = await run_read(get_warn_limit, chat.id)
 
     keyboard = InlineKeyboardMarkup(
         [[InlineKeyboardButton("Delete Warn [Admin Only]", callback_data=f"undo_warn_{new_warn_id}")]]
@@ -178,7 +179,7 @@ async def dwarn_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             await message.reply_html(
                 f"🚨 User {user_display} has reached {warn_count}/{limit} warnings and has been banned."
             )
-            reset_warnings(chat.id, target_user.id)
+            await run_write(reset_warnings, chat.id, target_user.id)
         except Exception as e:
             await message.reply_text(f"Failed to ban user after reaching max warnings: {e}")
 
@@ -204,15 +205,15 @@ async def undo_warn_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await query.edit_message_text("Error: Invalid callback data.")
         return
 
-    if remove_warning_by_id(warn_id_to_remove):
+    if await run_write(remove_warning_by_id, warn_id_to_remove):
         new_text = query.message.text_html + "\n\n<i>(Warn deleted by " + user_who_clicked.mention_html() + ")</i>"
         await query.edit_message_text(new_text, parse_mode=ParseMode.HTML, reply_markup=None)
     else:
         await query.edit_message_text(query.message.text_html + "\n\n<i>(This warn was already deleted or could not be found.)</i>", parse_mode=ParseMode.HTML, reply_markup=None)
 
 @check_module_enabled("warns")
-@command_control("warns")
 @custom_handler(["warnings", "warns"])
+@command_control("warns")
 async def warnings_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat = update.effective_chat
 
@@ -243,9 +244,9 @@ async def warnings_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         await update.message.reply_text("Could not find that user. Please provide a valid User ID, @username, or reply to a message.")
         return
         
-    user_warnings = get_warnings(update.effective_chat.id, target_user.id)
+    user_warnings = await run_read(get_warnings, update.effective_chat.id, target_user.id)
     user_display = create_user_html_link(target_user)
-    limit = get_warn_limit(update.effective_chat.id)
+    limit = await run_read(get_warn_limit, update.effective_chat.id)
 
     if not user_warnings:
         await update.message.reply_html(f"User {user_display} has no warnings in this chat.")
@@ -281,7 +282,7 @@ async def reset_warnings_command(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("Usage: /resetwarns <ID/@username/reply>")
         return
         
-    if reset_warnings(update.effective_chat.id, target_user.id):
+    if await run_write(reset_warnings, update.effective_chat.id, target_user.id):
         user_display = create_user_html_link(target_user)
         await update.message.reply_html(f"✅ Warnings for {user_display} have been reset.")
     else:
@@ -300,7 +301,7 @@ async def set_warn_limit_command(update: Update, context: ContextTypes.DEFAULT_T
         return
 
     if not context.args:
-        limit = get_warn_limit(chat.id)
+        limit = await run_read(get_warn_limit, chat.id)
         await update.message.reply_html(f"The current warning limit in this chat is <b>{limit}</b>.")
         return
 
@@ -310,7 +311,7 @@ async def set_warn_limit_command(update: Update, context: ContextTypes.DEFAULT_T
             await update.message.reply_text("The warning limit must be at least 1.")
             return
             
-        if set_warn_limit(chat.id, limit):
+        if await run_write(set_warn_limit, chat.id, limit):
             await update.message.reply_html(f"✅ The warning limit for this chat has been set to <b>{limit}</b>.")
         else:
             await update.message.reply_text("Failed to set the warning limit.")
@@ -321,8 +322,4 @@ async def set_warn_limit_command(update: Update, context: ContextTypes.DEFAULT_T
 
 # --- HANDLER LOADER ---
 def load_handlers(application: Application):
-    application.add_handler(CommandHandler("warn", warn_command))
     application.add_handler(CallbackQueryHandler(undo_warn_callback, pattern=r"^undo_warn_"))
-    application.add_handler(CommandHandler(["warnings", "warns"], warnings_command))
-    application.add_handler(CommandHandler("resetwarns", reset_warnings_command))
-    application.add_handler(CommandHandler("setwarnlimit", set_warn_limit_command))
@@ -1,21 +1,21 @@
 import logging
 import random
-import sqlite3
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ChatType, ParseMode
-from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
+from telegram.ext import ContextTypes, MessageHandler, filters
 
-from ..config import OWNER_ID, DB_NAME, APPEAL_CHAT_USERNAME
+from ..config import OWNER_ID, APPEAL_CHAT_USERNAME
 from ..core.database import (
     set_welcome_setting, get_welcome_settings, set_goodbye_setting, get_goodbye_settings,
     set_clean_service, should_clean_service, add_chat_to_db, remove_chat_from_db,
-    is_dev_user, is_sudo_user, is_support_user, is_chat_blacklisted, update_user_in_db,
-    is_gban_enforced, get_gban_reason
+    update_user_in_db, upsert_users, get_ranks, is_gbanned, set_welcome_enabled
 )
 from ..core.utils import _can_user_perform_action, send_safe_reply, safe_escape, format_message_text, send_critical_log
 from ..core.constants import OWNER_WELCOME_TEXTS, DEV_WELCOME_TEXTS, SUDO_WELCOME_TEXTS, SUPPORT_WELCOME_TEXTS, GENERIC_WELCOME_TEXTS, GENERIC_GOODBYE_TEXTS
 from ..core.decorators import check_module_enabled, command_control
 from ..core.handlers import custom_handler
+from ..core.async_database import run_read, run_write
+from ..core.update_context import get_update_context
 
 logger = logging.getLogger(__name__)
 
@@ -35,25 +35,22 @@ async def welcome_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     if context.args and context.args[0].lower() in ['yes', 'on', 'off', 'no']:
         is_on = context.args[0].lower() == 'on' or context.args[0].lower() == 'yes'
-        try:
-            with sqlite3.connect(DB_NAME) as conn:
-                 conn.execute("UPDATE bot_chats SET welcome_enabled = ? WHERE chat_id = ?", (1 if is_on else 0, chat.id))
+        if await run_write(set_welcome_enabled, chat.id, is_on):
             status_text = "ENABLED" if is_on else "DISABLED"
             await update.message.reply_html(f"✅ Welcome messages have been <b>{status_text}</b>.")
-        except sqlite3.Error as e:
-            logger.error(f"Error toggling welcome for chat {chat.id}: {e}")
+        else:
             await update.message.reply_text("An error occurred while updating the setting.")
         return
 
     if context.args and context.args[0].lower() == 'noformat':
-        _, custom_text = get_welcome_settings(chat.id)
+        _, custom_text = await run_read(get_welcome_settings, chat.id)
         if custom_text:
             await update.message.reply_text(custom_text)
         else:
             await update.message.reply_text("No custom welcome message is set for this chat.")
         return
 
-    enabled, custom_text = get_welcome_settings(chat.id)
+    enabled, custom_text = await run_read(get_welcome_settings, chat.id)
     status = "enabled" if enabled else "disabled"
     
     if custom_text:
@@ -85,7 +82,7 @@ async def set_welcome_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
         
     custom_text = update.message.text.split(' ', 1)[1]
-    if set_welcome_setting(chat.id, enabled=True, text=custom_text):
+    if await run_write(set_welcome_setting, chat.id, enabled=True, text=custom_text):
         await update.message.reply_html("✅ Custom welcome message has been set!")
     else:
         await update.message.reply_text("Failed to set welcome message.")
@@ -102,7 +99,7 @@ async def reset_welcome_command(update: Update, context: ContextTypes.DEFAULT_TY
     if not await _can_user_perform_action(update, context, 'can_change_info', "Why should I listen to a person with no privileges for this? You need 'can_change_info' permission.", allow_bot_privileged_override=False):
         return
 
-    if set_welcome_setting(chat.id, enabled=True, text=None):
+    if await run_write(set_welcome_setting, chat.id, enabled=True, text=None):
         await update.message.reply_text("✅ Welcome message has been reset to default.")
     else:
         await update.message.reply_text("Failed to reset welcome message.")
@@ -121,20 +118,20 @@ async def goodbye_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     if context.args and context.args[0].lower() in ['yes', 'on', 'off', 'no']:
         is_on = context.args[0].lower() == 'on' or context.args[0].lower() == 'yes'
-        set_goodbye_setting(chat.id, enabled=is_on)
+        await run_write(set_goodbye_setting, chat.id, enabled=is_on)
         status_text = "ENABLED" if is_on else "DISABLED"
         await update.message.reply_html(f"✅ Goodbye messages have been <b>{status_text}</b>.")
         return
 
     if context.args and context.args[0].lower() == 'noformat':
-        _, custom_text = get_goodbye_settings(chat.id)
+        _, custom_text = await run_read(get_goodbye_settings, chat.id)
         if custom_text:
             await update.message.reply_text(custom_text)
         else:
             await update.message.reply_text("No custom goodbye message is set for this chat.")
         return
 
-    enabled, custom_text = get_goodbye_settings(chat.id)
+    enabled, custom_text = await run_read(get_goodbye_settings, chat.id)
     status = "enabled" if enabled else "disabled"
     
     if custom_text:
@@ -166,7 +163,7 @@ async def set_goodbye_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
         
     custom_text = update.message.text.split(' ', 1)[1]
-    if set_goodbye_setting(chat.id, enabled=True, text=custom_text):
+    if await run_write(set_goodbye_setting, chat.id, enabled=True, text=custom_text):
         await update.message.reply_html("✅ Custom goodbye message has been set!")
     else:
         await update.message.reply_text("Failed to set goodbye message.")
@@ -183,14 +180,14 @@ async def reset_goodbye_command(update: Update, context: ContextTypes.DEFAULT_TY
     if not await _can_user_perform_action(update, context, 'can_change_info', "Why should I listen to a person with no privileges for this? You need 'can_change_info' permission.", allow_bot_privileged_override=False):
         return
         
-    if set_goodbye_setting(chat.id, enabled=True, text=None):
+    if await run_write(set_goodbye_setting, chat.id, enabled=True, text=None):
         await update.message.reply_text("✅ Goodbye message has been reset to default.")
     else:
         await update.message.reply_text("Failed to reset goodbye message.")
 
 @check_module_enabled("welcomes")
-@command_control("welcomehelp")
 @custom_handler("welcomehelp")
+@command_control("welcomehelp")
 async def welcome_help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     help_text = """
 <b>Welcome Message Help</b>
@@ -226,7 +223,7 @@ async def set_clean_service_command(update: Update, context: ContextTypes.DEFAUL
         return
 
     if not context.args:
-        is_enabled = should_clean_service(chat.id)
+        is_enabled = await run_read(should_clean_service, chat.id)
         status = "ENABLED" if is_enabled else "DISABLED"
         await update.message.reply_html(f"Automatic cleaning of service messages is currently <b>{status}</b>.")
         return
@@ -248,7 +245,7 @@ async def set_clean_service_command(update: Update, context: ContextTypes.DEFAUL
             await update.message.reply_text("Could not verify my permissions to enable this feature.")
             return
             
-    if set_clean_service(chat.id, enabled=is_on):
+    if await run_write(set_clean_service, chat.id, enabled=is_on):
         status_text = "ENABLED" if is_on else "DISABLED"
         await update.message.reply_html(f"✅ Automatic cleaning of service messages has been <b>{status_text}</b>.")
     else:
@@ -259,13 +256,14 @@ async def handle_new_group_members(update: Update, context: ContextTypes.DEFAULT
     if not update.message or not update.message.new_chat_members:
         return
     chat = update.effective_chat
+    settings = (await get_update_context(update, context)).chat_settings
 
-    if is_chat_blacklisted(chat.id):
+    if settings.is_blacklisted:
         return
     
     if any(member.id == context.bot.id for member in update.message.new_chat_members):
         logger.info(f"Bot joined chat: {chat.title} ({chat.id})")
-        add_chat_to_db(chat.id, chat.title or f"Untitled Chat {chat.id}")
+        await run_write(add_chat_to_db, chat.id, chat.title or f"Untitled Chat {chat.id}")
         if OWNER_ID:
             safe_chat_title = safe_escape(chat.title or f"Chat ID {chat.id}")
             link_line = f"\n<b>Link:</b> @{chat.username}" if chat.username else ""
@@ -297,32 +295,33 @@ async def handle_new_group_members(update: Update, context: ContextTypes.DEFAULT
             logger.error(f"Failed to send introduction message to new group {chat.id}: {e}")
         return
 
-    if should_clean_service(chat.id):
+    if settings.clean_service:
         try:
             await update.message.delete()
         except Exception:
             pass
 
-    welcome_enabled, custom_text = get_welcome_settings(chat.id)
-
-    for member in update.message.new_chat_members:
-        update_user_in_db(member)
-        if is_gban_enforced(chat.id) and get_gban_reason(member.id):
+    welcome_enabled, custom_text = settings.welcome_enabled, settings.custom_welcome
+    new_members = update.message.new_chat_members
+    await run_write(upsert_users, new_members)
+    ranks = get_ranks(member.id for member in new_members)
+    rank_texts = {
+        "owner": OWNER_WELCOME_TEXTS,
+        "dev": DEV_WELCOME_TEXTS,
+        "sudo": SUDO_WELCOME_TEXTS,
+        "support": SUPPORT_WELCOME_TEXTS,
+    }
+
+    for member in new_members:
+        if is_gbanned(member.id) and settings.enforce_gban:
             continue
 
         base_text = ""
-        is_privileged_join = True
-
-        if member.id == OWNER_ID and OWNER_WELCOME_TEXTS:
-            base_text = random.choice(OWNER_WELCOME_TEXTS)
-        elif is_dev_user(member.id) and DEV_WELCOME_TEXTS:
-            base_text = random.choice(DEV_WELCOME_TEXTS)
-        elif is_sudo_user(member.id) and SUDO_WELCOME_TEXTS:
-            base_text = random.choice(SUDO_WELCOME_TEXTS)
-        elif is_support_user(member.id) and SUPPORT_WELCOME_TEXTS:
-            base_text = random.choice(SUPPORT_WELCOME_TEXTS)
-        else:
-            is_privileged_join = False
+        privileged_texts = rank_texts.get(ranks.get(member.id))
+        is_privileged_join = bool(privileged_texts)
+
+        if is_privileged_join:
+            base_text = random.choice(privileged_texts)
 
         if not is_privileged_join:
             if not welcome_enabled:
@@ -381,23 +380,24 @@ async def handle_left_group_member(update: Update, context: ContextTypes.DEFAULT
     
     chat = update.effective_chat
     left_member = update.message.left_chat_member
-    update_user_in_db(left_member)
+    await run_write(update_user_in_db, left_member)
 
     if left_member.id == context.bot.id:
         logger.info(f"Bot removed from group cache {chat.id}.")
-        remove_chat_from_db(chat.id)
+        await run_write(remove_chat_from_db, chat.id)
         return
 
-    if should_clean_service(chat.id):
+    settings = (await get_update_context(update, context)).chat_settings
+    if settings.clean_service:
         try:
             await update.message.delete()
         except Exception:
             pass
 
-    if is_gban_enforced(chat.id) and get_gban_reason(left_member.id):
+    if is_gbanned(left_member.id) and settings.enforce_gban:
         return
 
-    is_enabled, custom_text = get_goodbye_settings(chat.id)
+    is_enabled, custom_text = settings.goodbye_enabled, settings.custom_goodbye
     if not is_enabled:
         return
 
@@ -415,15 +415,3 @@ async def handle_left_group_member(update: Update, context: ContextTypes.DEFAULT
                 await context.bot.send_message(chat.id, final_message, parse_mode=ParseMode.HTML, disable_web_page_preview=True)
             except Exception as e:
                 logger.error(f"Failed to send goodbye message in chat {chat.id}: {e}")
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("welcome", welcome_command))
-    application.add_handler(CommandHandler("setwelcome", set_welcome_command))
-    application.add_handler(CommandHandler("resetwelcome", reset_welcome_command))
-    application.add_handler(CommandHandler("goodbye", goodbye_command))
-    application.add_handler(CommandHandler("setgoodbye", set_goodbye_command))
-    application.add_handler(CommandHandler("resetgoodbye", reset_goodbye_command))
-    application.add_handler(CommandHandler("welcomehelp", welcome_help_command))
-    application.add_handler(CommandHandler("cleanservice", set_clean_service_command))
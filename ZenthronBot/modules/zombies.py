@@ -2,7 +2,7 @@ import asyncio
 import logging
 from telegram import Update
 from telegram.constants import ChatType, ChatMemberStatus, ParseMode
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import ContextTypes
 from telethon import TelegramClient
 
 from ..core.utils import _can_user_perform_action, send_safe_reply, safe_escape
@@ -95,8 +95,3 @@ async def zombies_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await _find_and_process_zombies(update, context, dry_run=False)
     else:
         await _find_and_process_zombies(update, context, dry_run=True)
-
-
-# --- HANDLER LOADER ---
-def load_handlers(application: Application):
-    application.add_handler(CommandHandler("zombies", zombies_command))